@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark chunked and full encode of RouterStatic by list length.
+
+usage: chunked_benchmark.py [-h] [-c CHUNK_SIZE] [-n] [-o OUTPUT]
+                            [entries [entries ...]]
+
+positional arguments:
+  entries               numbers of static routes (default: 1000 10000
+                        100000 1000000)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -c CHUNK_SIZE, --chunk-size CHUNK_SIZE
+                        list entries encoded at a time
+  -n, --no-full         skip full encode (it needs several GiB for 1M
+                        entries)
+  -o OUTPUT, --output OUTPUT
+                        write results to CSV file
+
+Each size is encoded by chunked_encode.py in a new process, chunk by
+chunk and (unless --no-full) with all entries at once, so the peak RSS
+of each run is measured on its own.
+"""
+
+from argparse import ArgumentParser
+import csv
+import os
+import re
+import subprocess
+import sys
+
+CHUNKED_ENCODE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "chunked_encode.py")
+RESULT = re.compile(r"payload: (\d+) bytes, ([\d.]+)s, peak RSS: ([\d.]+) MiB")
+
+
+def run(entries, chunk_size, full):
+    """Return (payload bytes, seconds, peak RSS MiB) of one encode."""
+    args = [sys.executable, CHUNKED_ENCODE, "-c", str(chunk_size),
+            str(entries)]
+    if full:
+        args.insert(2, "--full")
+    output = subprocess.check_output(args, universal_newlines=True)
+    match = RESULT.search(output)
+    if match is None:
+        raise ValueError("unexpected output: {}".format(output.strip()))
+    return int(match.group(1)), float(match.group(2)), float(match.group(3))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-c", "--chunk-size", type=int, default=1000,
+                        help="list entries encoded at a time")
+    parser.add_argument("-n", "--no-full", action="store_true",
+                        help="skip full encode (it needs several GiB for 1M "
+                             "entries)")
+    parser.add_argument("-o", "--output",
+                        help="write results to CSV file")
+    parser.add_argument("entries", type=int, nargs="*",
+                        default=[1000, 10000, 100000, 1000000],
+                        help="numbers of static routes (default: 1000 10000 "
+                             "100000 1000000)")
+    args = parser.parse_args()
+
+    modes = ["chunked"] if args.no_full else ["chunked", "full"]
+    results = []
+    row = "{:>9} {:>8} {:>12} {:>9} {:>10}"
+    print(row.format("Entries", "Mode", "Payload(B)", "Time(s)", "RSS(MiB)"))
+    for entries in args.entries:
+        for mode in modes:
+            try:
+                size, elapsed, rss = run(entries, args.chunk_size,
+                                         mode == "full")
+            except (subprocess.CalledProcessError, ValueError) as error:
+                print("{:>9} {:>8} failed: {}".format(entries, mode, error))
+                continue
+            results.append((entries, mode, size, elapsed, rss))
+            print(row.format(entries, mode, size, "{:.3f}".format(elapsed),
+                             "{:.1f}".format(rss)))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            writer = csv.writer(output)
+            writer.writerow(("entries", "mode", "payload", "seconds",
+                             "rss_mib"))
+            writer.writerows(results)
+    exit()
+# End of script
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode a YDK object with a large list in chunks of bounded size.
+
+usage: chunked_encode.py [-h] [-c CHUNK_SIZE] [-f] [-o OUTPUT] entries
+
+positional arguments:
+  entries               number of static routes
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -c CHUNK_SIZE, --chunk-size CHUNK_SIZE
+                        list entries encoded at a time
+  -f, --full            build all entries and encode them at once
+  -o OUTPUT, --output OUTPUT
+                        write payload to file (default: discard)
+
+ChunkedEncoder.encode(entity, list_path, entries) yields the payload of
+entity with the entries of an iterable added to the list at list_path
+(e.g. default_vrf.address_family.vrfipv4.vrf_unicast.vrf_prefixes.
+vrf_prefix).  Entries are put in the list CHUNK_SIZE at a time, encoded
+with CodecService and removed again, so neither the object tree nor the
+payload ever holds more than one chunk of entries.  The text around the
+list comes from encoding the first entry alone.
+
+The main program encodes a RouterStatic object with ENTRIES static
+routes (the structure of nc-create-xr-ip-static-cfg-20-ydk.py) and
+prints elapsed time and peak RSS of the process.
+"""
+
+from argparse import ArgumentParser
+import ipaddress
+import itertools
+import os
+import resource
+import sys
+import time
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+import json_codec
+from template_encoder import parse_nodes, walk
+
+
+def entry_path(entity, list_path):
+    """Return (YDK list, element path of its entries) for attribute path."""
+    names = [json_codec.top_name(entity)]
+    node = entity
+    for attribute in list_path.split("."):
+        yang_names = dict((member[0], member[1])
+                          for member in json_codec.members(node))
+        names.append(yang_names.get(attribute,
+                                    json_codec.yang_name(attribute)))
+        node = getattr(node, attribute)
+    return node, "/".join(names)
+
+
+class ChunkedEncoder(object):
+    """Encode a list of a YDK object chunk by chunk."""
+
+    def __init__(self, codec=None, provider=None, chunk_size=1000):
+        self.codec = codec or CodecService()
+        self.provider = provider or CodecServiceProvider(type="xml")
+        self.chunk_size = chunk_size
+
+    def encode(self, entity, list_path, entries):
+        """Yield payload of entity with entries added to list_path.
+
+        Entries already in the list come first.  The list holds its
+        original entries again when the payload is complete.
+        """
+        ylist, path = entry_path(entity, list_path)
+        original = list(ylist)
+        entries = iter(itertools.chain(original, entries))
+        try:
+            first = next(entries, None)
+            if first is None:
+                yield self.codec.encode(self.provider, entity)
+                return
+            head, tail, indent = self._skeleton(entity, ylist, path, first)
+            yield head
+            yield self._fragment(entity, ylist, [first], head, tail)
+            while True:
+                chunk = list(itertools.islice(entries, self.chunk_size))
+                if not chunk:
+                    break
+                yield indent
+                yield self._fragment(entity, ylist, chunk, head, tail)
+            yield tail
+        finally:
+            self._fill(ylist, original)
+
+    def write(self, entity, list_path, entries, stream):
+        """Write payload to stream and return its length."""
+        size = 0
+        for chunk in self.encode(entity, list_path, entries):
+            stream.write(chunk)
+            size += len(chunk)
+        return size
+
+    def _fill(self, ylist, entries):
+        del ylist[:]
+        for entry in entries:
+            ylist.append(entry)
+
+    def _skeleton(self, entity, ylist, path, entry):
+        """Return (text before entries, text after, entry separator)."""
+        self._fill(ylist, [entry])
+        payload = self.codec.encode(self.provider, entity)
+        document = payload.encode("utf-8")
+        for node in walk(parse_nodes(document)):
+            if node.path == path:
+                break
+        else:
+            raise ValueError("no {} element in payload".format(path))
+        line_start = document.rfind(b"\n", 0, node.start) + 1
+        return (document[:node.start].decode("utf-8"),
+                document[node.end:].decode("utf-8"),
+                "\n" + document[line_start:node.start].decode("utf-8"))
+
+    def _fragment(self, entity, ylist, chunk, head, tail):
+        """Return encoded entries of chunk."""
+        self._fill(ylist, chunk)
+        payload = self.codec.encode(self.provider, entity)
+        del ylist[:]
+        if not payload.startswith(head) or not payload.endswith(tail):
+            raise ValueError("payload of chunk differs around the list")
+        return payload[len(head):len(payload) - len(tail)]
+
+
+def static_routes(router_static, count):
+    """Yield count VrfPrefix entries (10.0.0.0/32, 10.0.0.1/32, ...)."""
+    vrf_prefixes = router_static.default_vrf.address_family.vrfipv4. \
+        vrf_unicast.vrf_prefixes
+    first = int(ipaddress.IPv4Address("10.0.0.0"))
+    for index in range(count):
+        vrf_prefix = vrf_prefixes.VrfPrefix()
+        vrf_prefix.prefix = str(ipaddress.IPv4Address(first + index))
+        vrf_prefix.prefix_length = 32
+        vrf_next_hop_next_hop_address = vrf_prefix.vrf_route. \
+            vrf_next_hop_table.VrfNextHopNextHopAddress()
+        vrf_next_hop_next_hop_address.next_hop_address = "172.16.1.3"
+        vrf_prefix.vrf_route.vrf_next_hop_table. \
+            vrf_next_hop_next_hop_address.append(
+                vrf_next_hop_next_hop_address)
+        yield vrf_prefix
+
+
+def peak_rss():
+    """Return peak resident set size of process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+VRF_PREFIX_PATH = \
+    "default_vrf.address_family.vrfipv4.vrf_unicast.vrf_prefixes.vrf_prefix"
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-c", "--chunk-size", type=int, default=1000,
+                        help="list entries encoded at a time")
+    parser.add_argument("-f", "--full", action="store_true",
+                        help="build all entries and encode them at once")
+    parser.add_argument("-o", "--output", default=os.devnull,
+                        help="write payload to file (default: discard)")
+    parser.add_argument("entries", type=int,
+                        help="number of static routes")
+    args = parser.parse_args()
+
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_ip_static_cfg \
+        as xr_ip_static_cfg
+
+    router_static = xr_ip_static_cfg.RouterStatic()  # create object
+    start = time.time()
+    with open(args.output, "w") as output:
+        if args.full:
+            vrf_prefix = entry_path(router_static, VRF_PREFIX_PATH)[0]
+            for entry in static_routes(router_static, args.entries):
+                vrf_prefix.append(entry)
+            payload = CodecService().encode(
+                CodecServiceProvider(type="xml"), router_static)
+            output.write(payload)
+            size = len(payload)
+        else:
+            encoder = ChunkedEncoder(chunk_size=args.chunk_size)
+            size = encoder.write(router_static, VRF_PREFIX_PATH,
+                                 static_routes(router_static, args.entries),
+                                 output)
+    elapsed = time.time() - start
+    print("Entries: {}, payload: {} bytes, {:.3f}s, peak RSS: {:.1f} MiB"
+          .format(args.entries, size, elapsed, peak_rss() / 1024.0 ** 2))
+    exit()
+# End of script
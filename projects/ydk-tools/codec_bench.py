@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Time object construction, validation and serialization of codec apps.
+
+usage: codec_bench.py [-h] [-r RUNS] [-t TOP] [-n] [-o OUTPUT] [pattern]
+
+positional arguments:
+  pattern               sample app file pattern (default:
+                        cd-encode-*-ydk.py)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -r RUNS, --runs RUNS  runs per sample app and phase
+  -t TOP, --top TOP     hot spots reported per model
+  -n, --no-profile      skip cProfile hot spots
+  -o OUTPUT, --output OUTPUT
+                        write results to JSON file
+
+For each codec sample app the object is built with the config_*
+function of the app (construct), validated against the model (validate)
+and encoded with CodecService (serialize).  Each phase is timed RUNS
+times (median), and run once more under tracemalloc for the number and
+size of memory blocks it leaves allocated and its peak.  With cProfile,
+the functions with the most own time are reported per model directory.
+
+Validation is timed separately when YDK-Py exposes validate_entity;
+otherwise it is part of serialize.  The JSON results hold the YDK-Py and
+Python versions so runs can be compared across releases.
+"""
+
+from argparse import ArgumentParser
+import collections
+import cProfile
+import importlib
+import json
+import os
+import platform
+import pstats
+import time
+import tracemalloc
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from encode_cache import sample_objects
+from format_benchmark import model_name
+from samplelib import percentile
+
+PHASES = ("construct", "validate", "serialize")
+
+
+def find_validator():
+    """Return validate(entity) of installed YDK-Py or None."""
+    for name in ("ydk.providers._validator", "ydk.services._validator"):
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        validate_entity = getattr(module, "validate_entity", None)
+        if validate_entity is not None:
+            return lambda entity: validate_entity(entity, None)
+    return None
+
+
+def ydk_version():
+    """Return version of installed YDK-Py."""
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution("ydk").version
+    except Exception:
+        import ydk
+        return getattr(ydk, "__version__", "unknown")
+
+
+class Phases(object):
+    """Construct, validate and serialize the object of one sample app."""
+
+    def __init__(self, entity_class, config, codec, provider, validate):
+        self.entity_class = entity_class
+        self.config = config
+        self.codec = codec
+        self.provider = provider
+        self.validate = validate
+
+    def construct(self):
+        entity = self.entity_class()
+        self.config(entity)
+        return entity
+
+    def run(self, phase, entity):
+        """Run phase for entity built by construct (None for construct)."""
+        if phase == "construct":
+            return self.construct()
+        if phase == "validate":
+            if self.validate is not None:
+                self.validate(entity)
+            return entity
+        return self.codec.encode(self.provider, entity)
+
+
+def time_phases(phases, runs):
+    """Return ({phase: median seconds}, payload)."""
+    latencies = dict((phase, []) for phase in PHASES)
+    payload = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        entity = phases.construct()
+        latencies["construct"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        phases.run("validate", entity)
+        latencies["validate"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        payload = phases.run("serialize", entity)
+        latencies["serialize"].append(time.perf_counter() - start)
+    return dict((phase, percentile(values, 50))
+                for phase, values in latencies.items()), payload
+
+
+def trace_phases(phases):
+    """Return {phase: {blocks, size, peak}} of one run under tracemalloc.
+
+    blocks and size count memory allocated by the phase and still in
+    use when it ends (e.g. the object tree for construct).
+    """
+    allocations = dict()
+    entity = None
+    for phase in PHASES:
+        tracemalloc.start()
+        result = phases.run(phase, entity)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        statistics = snapshot.statistics("filename")
+        allocations[phase] = dict(
+            blocks=sum(stat.count for stat in statistics),
+            size=sum(stat.size for stat in statistics), peak=peak)
+        if phase == "construct":
+            entity = result
+    return allocations
+
+
+def hot_spots(profile, top):
+    """Return functions with the most own time in cProfile profile."""
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in \
+            stats.stats.items():
+        rows.append(dict(function="{}:{}({})".format(
+            os.path.join(*filename.split(os.sep)[-2:]), line, function),
+            calls=calls,
+            own=own, cumulative=cumulative))
+    rows.sort(key=lambda row: row["own"], reverse=True)
+    return rows[:top]
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-r", "--runs", type=int, default=50,
+                        help="runs per sample app and phase")
+    parser.add_argument("-t", "--top", type=int, default=10,
+                        help="hot spots reported per model")
+    parser.add_argument("-n", "--no-profile", action="store_true",
+                        help="skip cProfile hot spots")
+    parser.add_argument("-o", "--output",
+                        help="write results to JSON file")
+    parser.add_argument("pattern", nargs="?", default="cd-encode-*-ydk.py",
+                        help="sample app file pattern (default: "
+                             "cd-encode-*-ydk.py)")
+    args = parser.parse_args()
+
+    codec = CodecService()
+    provider = CodecServiceProvider(type="xml")
+    validate = find_validator()
+    results = collections.OrderedDict(
+        ydk=ydk_version(), python=platform.python_version(),
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        runs=args.runs, validation=validate is not None,
+        models=collections.OrderedDict())
+
+    models = results["models"]
+    row = "{:<44} {:>10} {:>10} {:>10} {:>8} {:>10}"
+    print(row.format("Sample", "Build(us)", "Valid(us)", "Encode(us)",
+                     "Blocks", "Peak(B)"))
+    profiles = dict()
+    for name, entity_class, config in sample_objects(args.pattern):
+        phases = Phases(entity_class, config, codec, provider, validate)
+        model = models.setdefault(model_name(name), collections.OrderedDict(
+            samples=collections.OrderedDict(), hot_spots=[]))
+        try:
+            medians, payload = time_phases(phases, args.runs)
+            allocations = trace_phases(phases)
+            if not args.no_profile:
+                profile = profiles.setdefault(model_name(name),
+                                              cProfile.Profile())
+                profile.enable()
+                for _ in range(args.runs):
+                    phases.run("serialize", phases.run("validate",
+                                                       phases.construct()))
+                profile.disable()
+        except Exception as error:
+            print("{:<44} failed: {}: {}".format(name, type(error).__name__,
+                                                 error))
+            continue
+        model["samples"][name] = collections.OrderedDict(
+            (phase, dict(seconds=medians[phase], **allocations[phase]))
+            for phase in PHASES)
+        model["samples"][name]["payload"] = len(payload)
+        print(row.format(name, *["{:.1f}".format(medians[phase] * 1e6)
+                                 for phase in PHASES] +
+                         [allocations["construct"]["blocks"],
+                          max(allocations[phase]["peak"]
+                              for phase in PHASES)]))
+
+    for name, profile in profiles.items():
+        models[name]["hot_spots"] = hot_spots(profile, args.top)
+        print("\nHot spots of {} (own time of {} runs per sample app):"
+              .format(name, args.runs))
+        for spot in models[name]["hot_spots"]:
+            print("  {:>9.6f}s {:>9} calls  {}".format(
+                spot["own"], spot["calls"], spot["function"]))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+    exit()
+# End of script
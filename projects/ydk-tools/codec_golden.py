@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Verify codec sample apps against their .xml files and time their encode.
+
+usage: codec_golden.py [-h] [-w WORKERS] [-r RUNS] [-o OUTPUT] [-b BASELINE]
+                       [-t PERCENT] [-q]
+                       [pattern]
+
+positional arguments:
+  pattern               sample app file pattern (default:
+                        cd-encode-*-ydk.py)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -w WORKERS, --workers WORKERS
+                        number of worker processes
+  -r RUNS, --runs RUNS  encodes per sample app
+  -o OUTPUT, --output OUTPUT
+                        write per-sample results to CSV file
+  -b BASELINE, --baseline BASELINE
+                        compare latency with CSV file of a previous run
+  -t PERCENT, --threshold PERCENT
+                        latency increase reported as regression
+                        (default: 25)
+  -q, --quiet           print failures and summary only
+
+Each sample app with a .xml file is imported in a worker process, its
+config_* function is applied to a new object, and the object is encoded
+with CodecService and CodecServiceProvider(type="xml").  The payload is
+compared with the .xml file after canonicalization (whitespace between
+elements, namespace prefixes and attribute order are ignored).  Exits
+with status 1 if any payload differs or latency regressed.
+"""
+
+from argparse import ArgumentParser
+from concurrent import futures
+import collections
+import csv
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from samplelib import (SAMPLES_DIR, find_samples, load_sample, percentile,
+                       sample_class, sample_function)
+
+CODEC_DIR = os.path.join(SAMPLES_DIR, "codec")
+
+Result = collections.namedtuple("Result",
+                                "sample passed latency size error")
+
+_codec = CodecService()
+_codec_provider = CodecServiceProvider(type="xml")
+
+
+def canonicalize(payload):
+    """Return canonical form of XML payload.
+
+    Tags are expanded to {namespace}name, attributes are sorted and
+    whitespace-only text between elements is dropped.
+    """
+    def walk(element, lines, depth):
+        attributes = " ".join("{}={!r}".format(name, value) for name, value
+                              in sorted(element.attrib.items()))
+        lines.append("{}{} {} {}".format("  " * depth, element.tag,
+                                         attributes,
+                                         (element.text or "").strip()))
+        for child in element:
+            walk(child, lines, depth + 1)
+
+    lines = []
+    walk(ET.fromstring(payload.strip()), lines, 0)
+    return "\n".join(lines)
+
+
+def golden_path(sample):
+    """Return path of expected payload for sample app."""
+    return sample[:-3] + ".xml"
+
+
+def encode_sample(sample, runs=1):
+    """Encode object of sample app and return Result."""
+    start = time.time()
+    try:
+        module = load_sample(sample)
+        entity_class = sample_class(module)
+        config = sample_function(module, "config_")
+        latencies = []
+        for _ in range(runs):
+            run_start = time.time()
+            entity = entity_class()
+            config(entity)
+            payload = _codec.encode(_codec_provider, entity)
+            latencies.append(time.time() - run_start)
+        with open(golden_path(sample)) as golden:
+            expected = golden.read()
+        passed = canonicalize(payload) == canonicalize(expected)
+        return Result(sample, passed, percentile(latencies, 50),
+                      len(payload), None if passed else "payload differs")
+    except Exception as error:
+        return Result(sample, False, time.time() - start, 0,
+                      "{}: {}".format(type(error).__name__, error))
+
+
+def run(samples, workers, runs):
+    """Encode samples across a process pool and yield Results in order."""
+    with futures.ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(encode_sample, samples,
+                                   [runs] * len(samples), chunksize=4):
+            yield result
+
+
+def read_baseline(path):
+    """Return {sample name: latency} of CSV results file."""
+    with open(path) as baseline:
+        return dict((row["sample"], float(row["latency"]))
+                    for row in csv.DictReader(baseline))
+
+
+def write_results(path, results):
+    with open(path, "w") as output:
+        writer = csv.writer(output)
+        writer.writerow(("sample", "passed", "latency", "size", "error"))
+        for result in results:
+            writer.writerow((os.path.basename(result.sample),
+                             int(result.passed),
+                             "{:.6f}".format(result.latency), result.size,
+                             result.error or ""))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("-r", "--runs", type=int, default=10,
+                        help="encodes per sample app")
+    parser.add_argument("-o", "--output",
+                        help="write per-sample results to CSV file")
+    parser.add_argument("-b", "--baseline",
+                        help="compare latency with CSV file of a previous "
+                             "run")
+    parser.add_argument("-t", "--threshold", type=float, default=25,
+                        metavar="PERCENT",
+                        help="latency increase reported as regression "
+                             "(default: 25)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print failures and summary only")
+    parser.add_argument("pattern", nargs="?", default="cd-encode-*-ydk.py",
+                        help="sample app file pattern (default: "
+                             "cd-encode-*-ydk.py)")
+    args = parser.parse_args()
+
+    samples = [sample for sample in find_samples(args.pattern, CODEC_DIR)
+               if os.path.exists(golden_path(sample))]
+    baseline = read_baseline(args.baseline) if args.baseline else {}
+
+    results = []
+    regressions = 0
+    start = time.time()
+    for result in run(samples, args.workers, args.runs):
+        results.append(result)
+        name = os.path.basename(result.sample)
+        status = "ok" if result.passed else "FAIL"
+        if name in baseline and baseline[name] > 0:
+            change = (result.latency / baseline[name] - 1) * 100
+            if change > args.threshold:
+                regressions += 1
+                status += " SLOWER {:+.0f}%".format(change)
+        if args.quiet and status == "ok":
+            continue
+        print("{:<48} {:>9.1f}us {:>7}B {}".format(
+            name, result.latency * 1e6, result.size, status))
+        if result.error:
+            print("    {}".format(result.error))
+    elapsed = time.time() - start
+
+    if args.output:
+        write_results(args.output, results)
+    latencies = [result.latency for result in results if result.passed]
+    failed = len([result for result in results if not result.passed])
+    print("Samples: {}, failed: {}, latency regressions: {}".format(
+        len(results), failed, regressions))
+    if latencies:
+        print("Encode latency p50: {:.1f}us, p99: {:.1f}us".format(
+            percentile(latencies, 50) * 1e6,
+            percentile(latencies, 99) * 1e6))
+    encode_time = sum(latencies)
+    print("Elapsed: {:.3f}s ({:.1f} encodes/s, {:.1f} KiB/s per worker)"
+          .format(elapsed, len(results) * args.runs / elapsed,
+                  sum(result.size for result in results if result.passed) /
+                  1024.0 / encode_time if encode_time else 0.0))
+    if failed or regressions:
+        sys.exit(1)
+    exit()
+# End of script
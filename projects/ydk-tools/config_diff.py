@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare XML configurations independent of order and formatting.
+
+usage: config_diff.py [-h] [-c] [-s] [-q] old [new]
+
+positional arguments:
+  old             XML file (codec .xml file, saved <get-config> reply or
+                  snapshot)
+  new             XML file compared with old
+
+optional arguments:
+  -h, --help      show this help message and exit
+  -c, --canonical print canonical form of old and exit
+  -s, --subset    ignore elements only in new (e.g. compare a fixture
+                  with a full device configuration)
+  -q, --quiet     print summary only
+
+Both files are reduced to a canonical tree: <rpc-reply>, <data> and
+<config> wrappers are dropped, tags carry their namespace instead of a
+prefix, identity values are resolved to their namespace, whitespace
+and empty leaves (<a/>, <a></a>) are normalized, and children are
+sorted by tag and list entries by their leading leaves (keys).  Every
+node holds a hash of its subtree, so unchanged subtrees are skipped
+with one comparison.  Differences are printed as
+
+  - path      element only in old
+  + path      element only in new
+  ~ path: old -> new
+              leaf value changed
+
+and the exit status is 1 if any difference was found.
+"""
+
+from argparse import ArgumentParser
+import collections
+import hashlib
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+BASE_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+WRAPPERS = frozenset("{{{}}}{}".format(BASE_NS, name)
+                     for name in ("rpc-reply", "data", "config"))
+
+PREFIXED_VALUE = re.compile(r"^([A-Za-z_][\w.-]*):([^:\s]+)$")
+
+
+class Node(object):
+    """Canonical element with the hash of its subtree."""
+
+    __slots__ = ("tag", "attributes", "text", "children", "key", "digest")
+
+    def __init__(self, tag, attributes, text, children):
+        self.tag = tag
+        self.attributes = attributes
+        self.text = text
+        # list entry keys come first (RFC 6020)
+        key = []
+        for child in children:
+            if child.children:
+                break
+            key.append((child.tag, child.text))
+        self.key = tuple(key)
+        if len(children) > 1:
+            children.sort(key=_order)
+        self.children = children
+        header = "{}\0{}\0{}\0".format(tag, attributes or "", text)
+        self.digest = hashlib.sha1(header.encode("utf-8") + b"".join(
+            child.digest for child in children)).digest()
+
+
+def _order(node):
+    return node.tag, node.key, node.text
+
+
+def resolve(text, scope):
+    """Return text with a declared namespace prefix resolved."""
+    match = PREFIXED_VALUE.match(text)
+    if match is not None and match.group(1) in scope:
+        return "{{{}}}{}".format(scope[match.group(1)], match.group(2))
+    return text
+
+
+def parse(source):
+    """Return canonical root Node of XML file name or file object.
+
+    The root has the top-level elements of the configuration as its
+    children.
+    """
+    scopes = [dict()]
+    declared = dict()
+    elements = []
+    children = [[]]
+    count = 0
+    for event, item in ET.iterparse(source, ("start-ns", "start", "end")):
+        if event == "start-ns":
+            prefix, uri = item
+            declared[prefix] = uri
+        elif event == "start":
+            scope = scopes[-1]
+            if declared:
+                scope = dict(scope)
+                scope.update(declared)
+                declared = dict()
+            scopes.append(scope)
+            elements.append(item)
+            children.append([])
+        else:
+            scope = scopes.pop()
+            elements.pop()
+            nodes = children.pop()
+            if item.tag in WRAPPERS:
+                children[-1].extend(nodes)
+            else:
+                text = "" if nodes else resolve((item.text or "").strip(),
+                                                scope)
+                children[-1].append(Node(item.tag,
+                                         sorted(item.attrib.items()),
+                                         text, nodes))
+                count += 1
+            # release parsed subtree
+            item.clear()
+            if elements:
+                elements[-1].remove(item)
+    root = Node("", [], "", children[0])
+    return root, count
+
+
+def split_tag(tag):
+    """Return (namespace, local name) of element tag."""
+    if tag.startswith("{"):
+        namespace, name = tag[1:].split("}", 1)
+        return namespace, name
+    return None, tag
+
+
+def local_name(tag):
+    return split_tag(tag)[1]
+
+
+def is_list(parent_tag, tag):
+    """Return True if tag looks like a list entry of parent_tag."""
+    name = local_name(tag)
+    return local_name(parent_tag) in (name + "s", name + "es",
+                                      name[:-1] + "ies")
+
+
+def match_keys(old_nodes, new_nodes):
+    """Return ({key: node} of old_nodes, {key: node} of new_nodes).
+
+    The nodes have the same tag.  Leaves (leaf-list values) match by
+    value.  List entries match by the shortest prefix of their leading
+    leaves that is unique on both sides.
+    """
+    nodes = old_nodes + new_nodes
+    if all(not node.children for node in nodes):
+        return [collections.OrderedDict((node.text, node) for node in side)
+                for side in (old_nodes, new_nodes)]
+    length = max(len(node.key) for node in nodes)
+    size = 1
+    while size < length and any(
+            len(set(node.key[:size] for node in side)) < len(side)
+            for side in (old_nodes, new_nodes)):
+        size += 1
+    sides = []
+    for side in (old_nodes, new_nodes):
+        keyed = collections.OrderedDict()
+        for node in side:
+            key = node.key[:size]
+            while key in keyed:
+                # entries without unique keys are matched in order
+                key += (("", ""),)
+            keyed[key] = node
+        sides.append(keyed)
+    return sides
+
+
+def entry_path(path, node, key):
+    """Return path of node with its match key."""
+    name = local_name(node.tag)
+    if key is None:
+        return "{}/{}".format(path, name)
+    if isinstance(key, str):
+        return "{}/{}[.={}]".format(path, name, quoteattr(key))
+    return "{}/{}[{}]".format(path, name, ",".join(
+        "{}={}".format(local_name(tag), value) for tag, value in key if tag))
+
+
+class TreeDiff(object):
+    """Differences of two canonical trees.
+
+    Subtrees with equal hashes are skipped with one comparison and
+    counted in skipped.
+    """
+
+    def __init__(self, subset=False):
+        self.subset = subset
+        self.skipped = 0
+
+    def diff(self, old, new, path=""):
+        """Yield (sign, path, old value, new value) of differences.
+
+        Sign is -, + or ~.
+        """
+        if old.digest == new.digest:
+            self.skipped += 1
+            return
+        if not old.children and not new.children:
+            yield "~", path, old.text, new.text
+            return
+        old_groups = collections.OrderedDict()
+        new_groups = collections.OrderedDict()
+        for child in old.children:
+            old_groups.setdefault(child.tag, []).append(child)
+        for child in new.children:
+            new_groups.setdefault(child.tag, []).append(child)
+        for tag in list(old_groups) + [tag for tag in new_groups
+                                       if tag not in old_groups]:
+            old_nodes = old_groups.get(tag, [])
+            new_nodes = new_groups.get(tag, [])
+            if (len(old_nodes) <= 1 and len(new_nodes) <= 1 and
+                    not is_list(old.tag, tag)):
+                old_keyed = dict((None, node) for node in old_nodes)
+                new_keyed = dict((None, node) for node in new_nodes)
+            else:
+                old_keyed, new_keyed = match_keys(old_nodes, new_nodes)
+            for key, node in old_keyed.items():
+                child_path = entry_path(path, node, key)
+                if key not in new_keyed:
+                    yield "-", child_path, None, None
+                    continue
+                for difference in self.diff(node, new_keyed[key],
+                                            child_path):
+                    yield difference
+            if self.subset:
+                continue
+            for key, node in new_keyed.items():
+                if key not in old_keyed:
+                    yield "+", entry_path(path, node, key), None, None
+
+
+def write_canonical(node, stream, depth=0, namespace=None):
+    """Write canonical XML of node and its subtree to stream."""
+    indent = "  " * depth
+    node_namespace, name = split_tag(node.tag)
+    attributes = "".join(" {}={}".format(local_name(key), quoteattr(value))
+                         for key, value in node.attributes)
+    if node_namespace != namespace:
+        attributes = " xmlns={}{}".format(quoteattr(node_namespace or ""),
+                                          attributes)
+    if node.children:
+        stream.write("{}<{}{}>\n".format(indent, name, attributes))
+        for child in node.children:
+            write_canonical(child, stream, depth + 1, node_namespace)
+        stream.write("{}</{}>\n".format(indent, name))
+    elif node.text:
+        text = node.text
+        if text.startswith("{"):
+            # resolved identity value
+            value_namespace, value = split_tag(text)
+            attributes += " xmlns:ns0={}".format(quoteattr(value_namespace))
+            text = "ns0:" + value
+        stream.write("{}<{}{}>{}</{}>\n".format(indent, name, attributes,
+                                                escape(text), name))
+    else:
+        stream.write("{}<{}{}/>\n".format(indent, name, attributes))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-c", "--canonical", action="store_true",
+                        help="print canonical form of old and exit")
+    parser.add_argument("-s", "--subset", action="store_true",
+                        help="ignore elements only in new (e.g. compare a "
+                             "fixture with a full device configuration)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print summary only")
+    parser.add_argument("old",
+                        help="XML file (codec .xml file, saved <get-config> "
+                             "reply or snapshot)")
+    parser.add_argument("new", nargs="?",
+                        help="XML file compared with old")
+    args = parser.parse_args()
+
+    start = time.time()
+    old, old_count = parse(args.old)
+    if args.canonical or not args.new:
+        for child in old.children:
+            write_canonical(child, sys.stdout)
+        exit()
+    new, new_count = parse(args.new)
+    parsed = time.time()
+
+    tree_diff = TreeDiff(args.subset)
+    differences = 0
+    for sign, path, old_value, new_value in tree_diff.diff(old, new):
+        differences += 1
+        if args.quiet:
+            continue
+        if sign == "~":
+            print("~ {}: {} -> {}".format(path, old_value, new_value))
+        else:
+            print("{} {}".format(sign, path))
+    elapsed = time.time() - start
+    print("Elements: old {}, new {}, unchanged subtrees skipped: {}, "
+          "differences: {}".format(old_count, new_count, tree_diff.skipped,
+                                   differences))
+    print("Elapsed: {:.3f}s (parse {:.3f}s, diff {:.3f}s)".format(
+        elapsed, parsed - start, elapsed - (parsed - start)))
+    if differences:
+        sys.exit(1)
+    exit()
+# End of script
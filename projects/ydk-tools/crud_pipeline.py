@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Drive CRUD operations of the sample apps on many devices from one event loop.
+
+usage: crud_pipeline.py [-h] [-v] [-c CONCURRENCY] [-d PER_DEVICE]
+                        {create,read,update,delete} inventory sample
+                        [sample ...]
+
+positional arguments:
+  {create,read,update,delete}
+                        CRUD operation
+  inventory             file with one NETCONF device URL per line
+  sample                sample app with a config_* function
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -c CONCURRENCY, --concurrency CONCURRENCY
+                        maximum number of operations in flight
+  -d PER_DEVICE, --per-device PER_DEVICE
+                        maximum number of operations in flight per device
+
+create, update and delete send the object built by the config_*
+function of each sample app; read uses an empty object of its class as
+filter.  Latency is measured from the start of each operation, without
+the time it waited for the semaphores.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import collections
+import time
+
+from ydk.services import CRUDService
+from ydk.providers import NetconfServiceProvider
+
+from fanout_read import read_inventory
+from samplelib import (device_key, enable_logging, load_sample, percentile,
+                       provider_args, sample_class, sample_function)
+
+Result = collections.namedtuple("Result",
+                                "device sample elapsed value error")
+
+
+class CrudPipeline(object):
+    """Run blocking CRUDService operations from an asyncio event loop.
+
+    Operations hold a per-device semaphore and a global semaphore, so
+    one loop can keep hundreds of operations in flight without
+    overloading any single device.  Idle NETCONF sessions are kept per
+    device and reused by later operations.
+    """
+
+    def __init__(self, concurrency=64, per_device=1, loop=None):
+        self.loop = loop or asyncio.get_event_loop()
+        self._global = asyncio.Semaphore(concurrency)
+        self._devices = collections.defaultdict(
+            lambda: asyncio.Semaphore(per_device))
+        self._executor = ThreadPoolExecutor(concurrency)
+        self._providers = collections.defaultdict(list)
+        self._crud = CRUDService()
+
+    def _call(self, operation, device, entity):
+        """Run CRUD operation on idle or new session (worker thread)."""
+        providers = self._providers[device_key(device)]
+        try:
+            provider = providers.pop()
+        except IndexError:
+            provider = NetconfServiceProvider(**provider_args(device))
+        try:
+            value = getattr(self._crud, operation)(provider, entity)
+        except Exception:
+            provider.close()
+            raise
+        providers.append(provider)
+        return value
+
+    async def run(self, operation, device, entity):
+        """Run CRUD operation on device and return its value."""
+        value, _ = await self.run_timed(operation, device, entity)
+        return value
+
+    async def run_timed(self, operation, device, entity):
+        """Run CRUD operation on device, return (value, seconds).
+
+        The time spent waiting for the semaphores is not counted.
+        """
+        async with self._devices[device_key(device)]:
+            async with self._global:
+                start = time.time()
+                value = await self.loop.run_in_executor(
+                    self._executor, self._call, operation, device, entity)
+                return value, time.time() - start
+
+    def create(self, device, entity):
+        return self.run("create", device, entity)
+
+    def read(self, device, read_filter):
+        return self.run("read", device, read_filter)
+
+    def update(self, device, entity):
+        return self.run("update", device, entity)
+
+    def delete(self, device, entity):
+        return self.run("delete", device, entity)
+
+    def close(self):
+        """Close all sessions and worker threads."""
+        for providers in self._providers.values():
+            while providers:
+                providers.pop().close()
+        self._executor.shutdown()
+
+
+async def run_sample(pipeline, operation, device, sample):
+    """Build object with config_* function of sample and run operation.
+
+    Read uses an empty object of the sample class as filter.  Failed
+    operations have no elapsed time.
+    """
+    module = load_sample(sample)
+    entity = sample_class(module)()
+    if operation != "read":
+        sample_function(module, "config_")(entity)
+    try:
+        value, elapsed = await pipeline.run_timed(operation, device, entity)
+        error = None
+    except Exception as exc:
+        value, elapsed = None, None
+        error = "{}: {}".format(type(exc).__name__, exc)
+    return Result(device, sample, elapsed, value, error)
+
+
+def run_pipeline(operation, devices, samples, concurrency=64, per_device=1):
+    """Run operation for every sample on every device, return Results."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    pipeline = CrudPipeline(concurrency, per_device, loop)
+    tasks = [run_sample(pipeline, operation, device, sample)
+             for device in devices for sample in samples]
+    try:
+        return loop.run_until_complete(asyncio.gather(*tasks))
+    finally:
+        pipeline.close()
+        loop.close()
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-c", "--concurrency", type=int, default=64,
+                        help="maximum number of operations in flight")
+    parser.add_argument("-d", "--per-device", type=int, default=1,
+                        help="maximum number of operations in flight per "
+                             "device")
+    parser.add_argument("operation",
+                        choices=["create", "read", "update", "delete"],
+                        help="CRUD operation")
+    parser.add_argument("inventory",
+                        help="file with one NETCONF device URL per line")
+    parser.add_argument("sample", nargs="+",
+                        help="sample app with a config_* function")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    devices = read_inventory(args.inventory)
+    start = time.time()
+    results = run_pipeline(args.operation, devices, args.sample,
+                           args.concurrency, args.per_device)
+    elapsed = time.time() - start
+
+    errors = 0
+    for result in results:
+        if result.error:
+            errors += 1
+            print("{} {}: {}".format(device_key(result.device), result.sample,
+                                     result.error))
+    latencies = [result.elapsed for result in results if not result.error]
+    print("Operations: {} ({} errors)".format(len(results), errors))
+    print("Latency: p50 {:.3f}s, p99 {:.3f}s".format(
+        percentile(latencies, 50), percentile(latencies, 99)))
+    print("Elapsed: {:.3f}s ({:.1f} operations/s)".format(
+        elapsed, len(results) / elapsed if elapsed else 0.0))
+    exit()
+# End of script
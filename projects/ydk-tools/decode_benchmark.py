@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark streaming decode against whole-document decode.
+
+usage: decode_benchmark.py [-h] [-s SCALE] [-n] [fixture [fixture ...]]
+
+positional arguments:
+  fixture               sample .xml file (default: largest Bgp, Isis and
+                        Ipv4AclAndPrefixList codec files)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -s SCALE, --scale SCALE
+                        times the first list of each file is repeated
+                        (default: 1000)
+  -n, --no-parity       skip the parity check
+
+Each file is scaled up by repeating the entries of its first list
+(entries keep their keys) and decoded in three ways: the whole document
+is parsed before objects are built (dom), objects are built while the
+document is parsed (stream), and list entries are also released as they
+complete (release).  Time and peak memory of each are reported.
+
+Before the benchmark, a parity check decodes each file and the
+openconfig-bgp codec files, whose afi-safi-name leaves are identityrefs,
+with CodecService and with the streaming decoder and compares the
+structural hashes (encode_cache) of both objects.  No codec file sets a
+decimal64 or bits leaf, so for each of these leaf types the check also
+decodes a payload holding the first such leaf (outside lists) of the
+models of the checked files, found from the model meta information.
+"""
+
+from argparse import ArgumentParser
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from encode_cache import structural_hash
+from samplelib import SAMPLES_DIR, find_samples
+from streaming_decode import (REFERENCE_BITS, REFERENCE_CLASS,
+                              StreamingDecoder, member_class, model_class,
+                              split_tag)
+
+CODEC_MODELS = os.path.join(SAMPLES_DIR, "codec", "models", "cisco-ios-xr")
+DEFAULT_MODELS = ("Cisco-IOS-XR-ipv4-bgp-cfg", "Cisco-IOS-XR-clns-isis-cfg",
+                  "Cisco-IOS-XR-ipv4-acl-cfg")
+
+# codec files with identityref leaves
+IDENTITY_FIXTURES = os.path.join(SAMPLES_DIR, "codec", "models",
+                                 "openconfig", "openconfig-bgp")
+
+MARKER = "@@entries@@"
+
+# leaf types set by no codec file, checked with generated payloads
+LEAF_TYPES = (("Decimal64", lambda member: member.ptype == "Decimal64"),
+              ("Bits", lambda member: member.mtype == REFERENCE_BITS))
+
+
+def largest_fixture(model):
+    directory = os.path.join(CODEC_MODELS, model)
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.endswith(".xml")]
+    return max(paths, key=os.path.getsize)
+
+
+def first_list(root):
+    """Return shallowest element whose children are list entries."""
+    level = [root]
+    while level:
+        for element in level:
+            name = split_tag(element.tag)[1]
+            if len(element) and all(
+                    name in (split_tag(child.tag)[1] + suffix
+                             for suffix in ("s", "es"))
+                    for child in element):
+                return element
+        level = [child for element in level for child in element]
+    return None
+
+
+def scale_fixture(path, scale, output):
+    """Write path to output file with its first list repeated scale times.
+
+    Return number of repeated entries.
+    """
+    tree = ET.parse(path)
+    entries_parent = first_list(tree.getroot())
+    if entries_parent is None:
+        raise ValueError("no list in {}".format(path))
+    entries = "".join(ET.tostring(entry, encoding="unicode")
+                      for entry in entries_parent)
+    count = len(entries_parent)
+    for entry in list(entries_parent):
+        entries_parent.remove(entry)
+    entries_parent.text = MARKER
+    head, tail = ET.tostring(tree.getroot(), encoding="unicode").split(
+        MARKER)
+    output.write(head)
+    for _ in range(scale):
+        output.write(entries)
+    output.write(tail)
+    return count * scale
+
+
+def tree_events(element):
+    """Yield start/end events of an element tree already in memory."""
+    yield "start", element
+    for child in list(element):
+        for event in tree_events(child):
+            yield event
+    yield "end", element
+
+
+def dom_decode(path):
+    root = ET.parse(path).getroot()
+    return StreamingDecoder().decode_events(tree_events(root))
+
+
+def stream_decode(path):
+    return StreamingDecoder().decode(path)
+
+
+def release_decode(path):
+    # process each entry and drop it
+    return StreamingDecoder(lambda path, entry: True).decode(path)
+
+
+def parity(path, codec, provider):
+    """Return True if CodecService and streaming decode give equal objects."""
+    with open(path) as payload:
+        return payload_parity(payload.read(), codec, provider)
+
+
+def payload_parity(payload, codec, provider):
+    """Return True if both decoders give equal objects for XML payload."""
+    expected = codec.decode(provider, payload)
+    decoded = StreamingDecoder().decode(io.BytesIO(payload.encode()))
+    return structural_hash(decoded) == structural_hash(expected)
+
+
+def leaf_sample(member):
+    """Return valid text of Decimal64 or bits meta member."""
+    if member.mtype == REFERENCE_BITS:
+        return sorted(member_class(member)()._dictionary)[0]
+    # lower bound of the range, if any
+    return member.prange[0][0] if member.prange else "1.5"
+
+
+def leaf_payload(path, match):
+    """Return (leaf path, XML payload) of the shallowest leaf matching.
+
+    Only containers of the model of XML file path are searched, so the
+    payload needs no list keys.  Return None if no leaf matches.
+    """
+    namespace, name = split_tag(ET.parse(path).getroot().tag)
+    top_class = model_class(namespace, name)
+    module = getattr(top_class._meta_info(), "module_name", None)
+    level = [(top_class, [name])]
+    while level:
+        next_level = []
+        for entity_class, names in level:
+            for member in entity_class._meta_info().meta_info_class_members:
+                if getattr(member, "module_name", module) != module:
+                    # augmented node in another namespace
+                    continue
+                if match(member):
+                    root = ET.Element("{{{}}}{}".format(namespace, names[0]))
+                    parent = root
+                    for child in names[1:] + [member.name]:
+                        parent = ET.SubElement(parent, "{{{}}}{}".format(
+                            namespace, child))
+                    parent.text = leaf_sample(member)
+                    return ("/".join(names + [member.name]),
+                            ET.tostring(root, encoding="unicode"))
+                if member.mtype == REFERENCE_CLASS:
+                    next_level.append((member_class(member),
+                                       names + [member.name]))
+        level = next_level
+    return None
+
+
+def measure(function, *args):
+    """Return (seconds, peak bytes) of function call."""
+    tracemalloc.start()
+    start = time.time()
+    function(*args)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-s", "--scale", type=int, default=1000,
+                        help="times the first list of each file is repeated "
+                             "(default: 1000)")
+    parser.add_argument("-n", "--no-parity", action="store_true",
+                        help="skip the parity check")
+    parser.add_argument("fixture", nargs="*",
+                        help="sample .xml file (default: largest Bgp, Isis "
+                             "and Ipv4AclAndPrefixList codec files)")
+    args = parser.parse_args()
+
+    fixtures = args.fixture or [largest_fixture(model)
+                                for model in DEFAULT_MODELS]
+    if not args.no_parity:
+        codec = CodecService()
+        provider = CodecServiceProvider(type="xml")
+        for fixture in fixtures + find_samples("cd-encode-*.xml",
+                                               IDENTITY_FIXTURES):
+            try:
+                result = "ok" if parity(fixture, codec, provider) \
+                    else "differs"
+            except Exception as error:
+                result = "failed: {}: {}".format(type(error).__name__, error)
+            print("Parity {:<32} {}".format(
+                os.path.basename(fixture)[:-4], result))
+        for leaf_type, match in LEAF_TYPES:
+            result = "no leaf outside lists in the checked models"
+            for fixture in fixtures + find_samples("cd-encode-*.xml",
+                                                   IDENTITY_FIXTURES):
+                try:
+                    found = leaf_payload(fixture, match)
+                    if found is None:
+                        continue
+                    leaf, payload = found
+                    result = "{} {}".format(leaf, "ok" if payload_parity(
+                        payload, codec, provider) else "differs")
+                except Exception as error:
+                    result = "failed: {}: {}".format(type(error).__name__,
+                                                     error)
+                break
+            print("Parity {:<32} {}".format(leaf_type, result))
+        provider.close()
+    row = "{:<32} {:>8} {:>7} {:>7} {:>8} {:>9}"
+    print(row.format("Fixture", "Entries", "MiB", "Mode", "Time(s)",
+                     "Peak(MiB)"))
+    for fixture in fixtures:
+        with tempfile.NamedTemporaryFile("w", suffix=".xml") as scaled:
+            entries = scale_fixture(fixture, args.scale, scaled)
+            scaled.flush()
+            size = os.path.getsize(scaled.name) / 1024.0 ** 2
+            for mode, function in (("dom", dom_decode),
+                                   ("stream", stream_decode),
+                                   ("release", release_decode)):
+                elapsed, peak = measure(function, scaled.name)
+                print(row.format(os.path.basename(fixture)[:-4], entries,
+                                 "{:.1f}".format(size), mode,
+                                 "{:.3f}".format(elapsed),
+                                 "{:.1f}".format(peak / 1024.0 ** 2)))
+    exit()
+# End of script
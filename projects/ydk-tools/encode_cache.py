@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Cache codec payloads by a structural hash of the encoded YDK object.
+
+usage: encode_cache.py [-h] [-r ROUNDS] [-m MAXSIZE] [-d] [-c CACHE_DIR]
+                       [-s]
+                       [pattern]
+
+positional arguments:
+  pattern               sample app file pattern (default:
+                        cd-encode-*-ydk.py)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -r ROUNDS, --rounds ROUNDS
+                        encodes of each sample object
+  -m MAXSIZE, --maxsize MAXSIZE
+                        payloads kept in memory
+  -d, --disk            keep payloads on disk as well
+  -c CACHE_DIR, --cache-dir CACHE_DIR
+                        disk cache directory
+  -s, --shards          encode top-level children separately
+
+The main program benchmarks the cache: the objects built by the config_*
+functions of the codec sample apps are encoded ROUNDS times, directly
+and through the cache, and hit rate and time saved are reported.
+
+The cache key is a hash of the class, leaf values and children of the
+object, so equal objects built separately share one payload.  With
+--shards, each populated top-level child (e.g. the peer-vrfs of Ntp) is
+encoded and cached on its own and the payloads are joined, so a child
+shared by different objects is encoded once.  Sharding needs the model
+meta information of YDK-Py for the order of the children.
+"""
+
+from argparse import ArgumentParser
+import collections
+import enum
+import hashlib
+import os
+import time
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+from ydk.types import Decimal64, Empty, FixedBitsDict
+
+from samplelib import (SAMPLES_DIR, find_samples, load_sample, sample_class,
+                       sample_function)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "cache", "encode")
+
+
+def is_entity(value):
+    """Return True if value is a YDK container or list entry object."""
+    return hasattr(value, "__dict__") and hasattr(value, "parent")
+
+
+def _token(value, memo):
+    """Return hash input for attribute value, None if value is unset."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        tokens = [_token(item, memo) for item in value]
+        tokens = [token for token in tokens if token is not None]
+        return b"[" + b",".join(tokens) + b"]" if tokens else None
+    if is_entity(value):
+        return structural_hash(value, memo)
+    if isinstance(value, enum.Enum) or (hasattr(value, "name") and
+                                        hasattr(type(value), "__members__")):
+        return "{}.{}".format(type(value).__name__, value.name).encode()
+    if isinstance(value, Empty):
+        return b"Empty"
+    if hasattr(value, "_meta_info"):
+        # identity, its class is its value
+        return "{}.{}".format(type(value).__module__,
+                              type(value).__qualname__).encode()
+    if isinstance(value, (Decimal64, FixedBitsDict)):
+        # no value-based repr, the default one holds the object address
+        return "{}:{}".format(type(value).__name__, value).encode()
+    if isinstance(value, (str, int, float)):
+        return "{}:{!r}".format(type(value).__name__, value).encode()
+    raise TypeError("cannot hash leaf value of type {}".format(
+        type(value).__name__))
+
+
+def structural_hash(entity, memo=None):
+    """Return digest of YDK object class, leaf values and children.
+
+    Subtree digests are memoized by object in memo, so a subtree shared
+    by several objects is walked once per memo.
+    """
+    memo = {} if memo is None else memo
+    key = id(entity)
+    if key not in memo:
+        digest = hashlib.sha256()
+        digest.update("{}.{}".format(type(entity).__module__,
+                                     type(entity).__qualname__).encode())
+        for name in sorted(vars(entity)):
+            if name == "parent" or name.startswith("_"):
+                continue
+            token = _token(getattr(entity, name), memo)
+            if token is not None:
+                digest.update(name.encode() + b"=" + token + b";")
+        memo[key] = digest.digest()
+    return memo[key]
+
+
+def child_names(entity):
+    """Return attribute names of top-level children in encode order."""
+    try:
+        members = entity._meta_info().meta_info_class_members
+    except Exception:
+        return None
+    return [member.presentation_name for member in members]
+
+
+class EncodeCache(object):
+    """LRU cache of codec payloads with an optional disk tier.
+
+    Payloads are stored under payload_format, which must be the format
+    encoded by provider.
+    """
+
+    def __init__(self, codec=None, provider=None, maxsize=1024,
+                 directory=None, shards=False, payload_format="xml"):
+        self.codec = codec or CodecService()
+        self.provider = provider or CodecServiceProvider(type=payload_format)
+        self.maxsize = maxsize
+        self.directory = directory
+        self.shards = shards
+        self.counters = collections.Counter()
+        self._payloads = collections.OrderedDict()
+        self._format = payload_format
+
+    @property
+    def hit_rate(self):
+        lookups = (self.counters["hits"] + self.counters["disk_hits"] +
+                   self.counters["misses"])
+        if not lookups:
+            return 0.0
+        return (self.counters["hits"] + self.counters["disk_hits"]) / \
+            float(lookups)
+
+    def encode(self, entity):
+        """Return payload for YDK object, encoding it on a cache miss."""
+        memo = dict()
+        if self.shards:
+            names = child_names(entity)
+            if names is not None:
+                return self._encode_shards(entity, names, memo)
+        return self._lookup(structural_hash(entity, memo),
+                            lambda: self.codec.encode(self.provider, entity))
+
+    def _lookup(self, digest, encode):
+        """Return cached payload for digest or store result of encode()."""
+        key = "{}-{}".format(self._format, digest.hex())
+        payload = self._payloads.get(key)
+        if payload is not None:
+            self._payloads.move_to_end(key)
+            self.counters["hits"] += 1
+            return payload
+        payload = self._read(key)
+        if payload is not None:
+            self.counters["disk_hits"] += 1
+        else:
+            self.counters["misses"] += 1
+            start = time.time()
+            payload = encode()
+            self.counters["encode_time"] += time.time() - start
+            self._write(key, payload)
+        self._payloads[key] = payload
+        if len(self._payloads) > self.maxsize:
+            self._payloads.popitem(last=False)
+            self.counters["evictions"] += 1
+        return payload
+
+    def _encode_shards(self, entity, names, memo):
+        """Encode populated top-level children separately and join them."""
+        fragments = []
+        head = tail = None
+        for name in names:
+            value = getattr(entity, name, None)
+            if _token(value, memo) is None or (is_entity(value) and
+                                               not _has_data(value)):
+                continue
+            digest = hashlib.sha256("{}.{}.{}=".format(
+                type(entity).__module__, type(entity).__qualname__,
+                name).encode() + _token(value, memo)).digest()
+            payload = self._lookup(
+                digest, lambda: self._encode_shard(entity, name, value))
+            payload = payload.strip()
+            open_end = payload.index(">") + 1
+            close_start = payload.rindex("</")
+            if head is None:
+                head, tail = payload[:open_end], payload[close_start:]
+            fragments.append(payload[open_end:close_start].rstrip())
+        if head is None:
+            return self._lookup(structural_hash(entity, memo),
+                                lambda: self.codec.encode(self.provider,
+                                                          entity))
+        return head + "".join(fragments) + "\n" + tail
+
+    def _encode_shard(self, entity, name, value):
+        """Encode new top-level object holding only child name of entity."""
+        shard = type(entity)()
+        if isinstance(value, list):
+            getattr(shard, name).extend(value)
+            children = value
+        else:
+            setattr(shard, name, value)
+            children = [value]
+        try:
+            return self.codec.encode(self.provider, shard)
+        finally:
+            # children stay attached to entity
+            for child in children:
+                if is_entity(child):
+                    child.parent = entity
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[-2:], key + ".payload")
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key)) as payload:
+                return payload.read()
+        except IOError:
+            return None
+
+    def _write(self, key, payload):
+        if not self.directory:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as cached:
+            cached.write(payload)
+        os.replace(path + ".tmp", path)
+
+    def clear(self):
+        self._payloads.clear()
+        self.counters.clear()
+
+
+def _has_data(entity):
+    """Return True if YDK object has any leaf or list entry set."""
+    if hasattr(entity, "_has_data"):
+        return entity._has_data()
+    return _token(entity, {}) is not None
+
+
+def sample_objects(pattern):
+    """Return (name, class, config function) of codec sample apps."""
+    objects = []
+    for sample in find_samples(pattern, os.path.join(SAMPLES_DIR, "codec")):
+        if not sample.endswith(".py"):
+            continue
+        module = load_sample(sample)
+        try:
+            objects.append((os.path.basename(sample), sample_class(module),
+                            sample_function(module, "config_")))
+        except ValueError:
+            continue
+    return objects
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-r", "--rounds", type=int, default=100,
+                        help="encodes of each sample object")
+    parser.add_argument("-m", "--maxsize", type=int, default=1024,
+                        help="payloads kept in memory")
+    parser.add_argument("-d", "--disk", action="store_true",
+                        help="keep payloads on disk as well")
+    parser.add_argument("-c", "--cache-dir", default=CACHE_DIR,
+                        help="disk cache directory")
+    parser.add_argument("-s", "--shards", action="store_true",
+                        help="encode top-level children separately")
+    parser.add_argument("pattern", nargs="?", default="cd-encode-*-ydk.py",
+                        help="sample app file pattern (default: "
+                             "cd-encode-*-ydk.py)")
+    args = parser.parse_args()
+
+    objects = sample_objects(args.pattern)
+    codec = CodecService()
+    provider = CodecServiceProvider(type="xml")
+
+    start = time.time()
+    for _ in range(args.rounds):
+        for _, entity_class, config in objects:
+            entity = entity_class()
+            config(entity)
+            codec.encode(provider, entity)
+    direct = time.time() - start
+
+    cache = EncodeCache(codec, provider, args.maxsize,
+                        args.cache_dir if args.disk else None, args.shards)
+    start = time.time()
+    for _ in range(args.rounds):
+        for _, entity_class, config in objects:
+            entity = entity_class()
+            config(entity)
+            cache.encode(entity)
+    cached = time.time() - start
+
+    encodes = args.rounds * len(objects)
+    print("Objects: {}, rounds: {}, encodes: {}".format(
+        len(objects), args.rounds, encodes))
+    print("Direct: {:.3f}s ({:.1f}us per encode)".format(
+        direct, direct / encodes * 1e6))
+    print("Cached: {:.3f}s ({:.1f}us per encode)".format(
+        cached, cached / encodes * 1e6))
+    print("Hits: {hits}, disk hits: {disk_hits}, misses: {misses}, "
+          "evictions: {evictions}".format(**dict(
+              (name, cache.counters[name]) for name in
+              ("hits", "disk_hits", "misses", "evictions"))))
+    print("Encode time on misses: {:.3f}s".format(
+        cache.counters["encode_time"]))
+    print("Hit rate: {:.1%}, saved: {:.1%}".format(
+        cache.hit_rate, 1 - cached / direct if direct else 0.0))
+    exit()
+# End of script
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Run the read of an nc-read sample app across an inventory of devices.
+
+usage: fanout_read.py [-h] [-v] [-w WORKERS] [-p] [-t TIMEOUT] [-r ROUNDS]
+                      [-c] [-b] [-q]
+                      sample inventory
+
+positional arguments:
+  sample                nc-read sample app with a process_* function
+  inventory             file with one NETCONF device URL per line
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -w WORKERS, --workers WORKERS
+                        maximum number of concurrent reads
+  -p, --processes       use a process pool instead of a thread pool
+  -t TIMEOUT, --timeout TIMEOUT
+                        timeout in seconds for each device read
+  -r ROUNDS, --rounds ROUNDS
+                        number of reads per device
+  -c, --as-completed    print output as reads complete (default: in
+                        inventory order)
+  -b, --broker          use warm sessions from the session broker
+  -q, --quiet           print the latency summary only
+"""
+
+from argparse import ArgumentParser
+from concurrent import futures
+import collections
+import sys
+import time
+
+from samplelib import (call_with_timeout, device_key, enable_logging,
+                       load_sample, percentile, provider_args,
+                       sample_class, sample_function)
+
+Result = collections.namedtuple("Result",
+                                "index device elapsed output error")
+
+
+def read_inventory(path):
+    """Return device URLs in inventory file, skipping comments."""
+    devices = []
+    with open(path) as inventory:
+        for line in inventory:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                devices.append(line)
+    return devices
+
+
+def read_device(index, sample, device, timeout, broker=False):
+    """Read sample object from device and return processed Result."""
+    if broker:
+        from session_broker import CRUDService, NetconfServiceProvider
+    else:
+        from ydk.services import CRUDService
+        from ydk.providers import NetconfServiceProvider
+    # model modules are imported once per worker process
+    module = load_sample(sample)
+    entity_class = sample_class(module)
+    process = sample_function(module, "process_")
+
+    def read():
+        provider = NetconfServiceProvider(**provider_args(device))
+        try:
+            return CRUDService().read(provider, entity_class())
+        finally:
+            provider.close()
+
+    start = time.time()
+    try:
+        entity = call_with_timeout(read, timeout)
+        output, error = process(entity), None
+    except Exception as exc:
+        output, error = None, "{}: {}".format(type(exc).__name__, exc)
+    return Result(index, device, time.time() - start, output, error)
+
+
+def fanout(sample, devices, workers, timeout, rounds=1, processes=False,
+           broker=False, as_completed=False):
+    """Read sample object from all devices and yield Results.
+
+    Results are yielded in inventory order unless as_completed is set.
+    """
+    if processes:
+        executor = futures.ProcessPoolExecutor(workers)
+    else:
+        executor = futures.ThreadPoolExecutor(workers)
+    jobs = [(device, round_) for round_ in range(rounds)
+            for device in devices]
+    with executor:
+        pending = [executor.submit(read_device, index, sample, device,
+                                   timeout, broker)
+                   for index, (device, _) in enumerate(jobs)]
+        if as_completed:
+            for future in futures.as_completed(pending):
+                yield future.result()
+        else:
+            for future in pending:
+                yield future.result()
+
+
+def format_summary(results, elapsed):
+    """Return latency summary per device and for whole inventory."""
+    latencies = collections.OrderedDict()
+    errors = collections.Counter()
+    for result in sorted(results, key=lambda result: result.index):
+        key = device_key(result.device)
+        latencies.setdefault(key, []).append(result.elapsed)
+        if result.error:
+            errors[key] += 1
+
+    row = "{key:<40} {reads:>6} {errors:>6} {p50:>9} {p99:>9}"
+    lines = [row.format(key="Device", reads="Reads", errors="Errors",
+                        p50="p50(s)", p99="p99(s)")]
+    for key, values in latencies.items():
+        lines.append(row.format(key=key, reads=len(values),
+                                errors=errors[key],
+                                p50="{:.3f}".format(percentile(values, 50)),
+                                p99="{:.3f}".format(percentile(values, 99))))
+    values = [result.elapsed for result in results]
+    lines.append(row.format(key="Total", reads=len(values),
+                            errors=sum(errors.values()),
+                            p50="{:.3f}".format(percentile(values, 50)),
+                            p99="{:.3f}".format(percentile(values, 99))))
+    lines.append("Elapsed: {:.3f}s ({:.1f} reads/s)".format(
+        elapsed, len(values) / elapsed if elapsed else 0.0))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-w", "--workers", type=int, default=32,
+                        help="maximum number of concurrent reads")
+    parser.add_argument("-p", "--processes", action="store_true",
+                        help="use a process pool instead of a thread pool")
+    parser.add_argument("-t", "--timeout", type=float, default=60,
+                        help="timeout in seconds for each device read")
+    parser.add_argument("-r", "--rounds", type=int, default=1,
+                        help="number of reads per device")
+    parser.add_argument("-c", "--as-completed", action="store_true",
+                        help="print output as reads complete "
+                             "(default: in inventory order)")
+    parser.add_argument("-b", "--broker", action="store_true",
+                        help="use warm sessions from the session broker")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print the latency summary only")
+    parser.add_argument("sample",
+                        help="nc-read sample app with a process_* function")
+    parser.add_argument("inventory",
+                        help="file with one NETCONF device URL per line")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    devices = read_inventory(args.inventory)
+    results = []
+    start = time.time()
+    for result in fanout(args.sample, devices, args.workers, args.timeout,
+                         args.rounds, args.processes, args.broker,
+                         args.as_completed):
+        results.append(result)
+        if args.quiet:
+            continue
+        print("=== {} ({:.3f}s)".format(device_key(result.device),
+                                        result.elapsed))
+        if result.error:
+            print(result.error)
+        else:
+            print(result.output)
+        sys.stdout.flush()
+
+    print(format_summary(results, time.time() - start))
+    exit()
+# End of script
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Convert sample app objects to XML and JSON and check their .xml and .txt.
+
+usage: fixture_convert.py [-h] [-w WORKERS] [-o OUTPUT_DIR] [-r REPORT] [-q]
+                          [pattern]
+
+positional arguments:
+  pattern               sample app file pattern (default: *-ydk.py)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -w WORKERS, --workers WORKERS
+                        number of worker processes
+  -o OUTPUT_DIR, --output-dir OUTPUT_DIR
+                        write .xml and .json payloads under directory
+  -r REPORT, --report REPORT
+                        write per-sample results to CSV file
+  -q, --quiet           print problems and summary only
+
+Every sample app under samples/basic with a config_* function is
+imported in a worker process.  Its object is built once and encoded as
+XML (CodecService) and JSON (json_codec).  The XML is compared with the
+.xml file of the app independent of order and formatting (config_diff).
+
+The .txt file is checked line by line against the object: the CLI is
+split into stanzas by indentation and every list entry is matched to
+the lines holding all of its key values (e.g. "neighbor 10.0.0.1").  The
+string and number leaves of the entry and its children must then appear
+as whole words in those lines or their stanzas, so a value in the wrong
+stanza is reported.  There is no offline CLI renderer for the models,
+so this is not a round trip: enum, boolean, empty and identity leaves
+are rendered differently in the CLI and are not checked, the keywords
+of a line are not checked, and values the CLI leaves out (e.g. the
+default VRF) are reported as missing.
+"""
+
+from argparse import ArgumentParser
+from concurrent import futures
+import collections
+import csv
+import enum
+import io
+import os
+import re
+import sys
+import time
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+import config_diff
+import json_codec
+from samplelib import (SAMPLES_DIR, find_samples, load_sample, sample_class,
+                       sample_function)
+
+try:
+    from ydk.types import Decimal64
+except ImportError:
+    Decimal64 = None
+
+Result = collections.namedtuple("Result",
+                                "sample xml cli missing elapsed error")
+
+_codec = CodecService()
+_codec_provider = CodecServiceProvider(type="xml")
+
+
+def cli_value(value):
+    """Return CLI text of string or number leaf value, None otherwise."""
+    if isinstance(value, enum.Enum) or isinstance(value, bool):
+        return None
+    if isinstance(value, (str, int)):
+        return str(value)
+    if Decimal64 is not None and isinstance(value, Decimal64):
+        return str(value)
+    return None
+
+
+def key_values(entry):
+    """Return CLI texts of key leaves of list entry.
+
+    Keys come from the meta information; without it, the first leaf
+    with a CLI text is taken as key.
+    """
+    try:
+        members = entry._meta_info().meta_info_class_members
+        keys = [member.presentation_name for member in members
+                if getattr(member, "is_key", False)]
+    except Exception:
+        keys = []
+    values = [cli_value(getattr(entry, key, None)) for key in keys]
+    if not keys:
+        for attribute, _, _ in json_codec.members(entry):
+            value = getattr(entry, attribute, None)
+            if not isinstance(value, list) and not \
+                    json_codec.is_entity(value) and cli_value(value):
+                return [cli_value(value)]
+    return [value for value in values if value]
+
+
+def word(value):
+    """Return pattern matching value as whole word of a CLI line."""
+    return re.compile(r"(?<![\w.:-]){}(?![\w.:-])".format(re.escape(value)))
+
+
+class CliLines(object):
+    """Lines of a CLI file with the stanza of every line."""
+
+    def __init__(self, text):
+        self.lines = text.splitlines()
+        self.indents = [len(line) - len(line.lstrip())
+                        for line in self.lines]
+
+    def all(self):
+        return range(len(self.lines))
+
+    def stanza(self, index):
+        """Return indexes of line and the lines indented below it."""
+        end = index + 1
+        while end < len(self.lines) and (
+                not self.lines[end].strip() or
+                self.indents[end] > self.indents[index]):
+            end += 1
+        return range(index, end)
+
+    def find(self, values, scope):
+        """Return indexes in scope of lines holding all values."""
+        patterns = [word(value) for value in values]
+        return [index for index in scope
+                if all(pattern.search(self.lines[index])
+                       for pattern in patterns)]
+
+
+def check_entity(entity, cli, scope, missing):
+    """Append leaf values of entity not found in scope lines to missing."""
+    for attribute, _, _ in json_codec.members(entity):
+        value = getattr(entity, attribute, None)
+        if isinstance(value, list):
+            items = value
+        else:
+            items = [value]
+        for item in items:
+            if json_codec.is_entity(item):
+                item_scope = scope
+                keys = key_values(item) if isinstance(value, list) else []
+                found = cli.find(keys, scope) if keys else []
+                if found:
+                    # entry lives in the stanzas of its key lines
+                    lines = set()
+                    for index in found:
+                        lines.update(cli.stanza(index))
+                    item_scope = sorted(lines.intersection(scope))
+                check_entity(item, cli, item_scope, missing)
+                continue
+            text = cli_value(item)
+            if text is not None and not cli.find([text], scope):
+                missing.append(text)
+
+
+def compare_xml(payload, path):
+    """Return ok, differs, unreadable or none for .xml file at path."""
+    if not os.path.exists(path):
+        return "none"
+    try:
+        expected, _ = config_diff.parse(path)
+    except Exception:
+        return "unreadable"
+    encoded, _ = config_diff.parse(io.BytesIO(payload.encode("utf-8")))
+    return "ok" if encoded.digest == expected.digest else "differs"
+
+
+def check_cli(entity, path):
+    """Return (ok, missing or none, leaf values missing in .txt file)."""
+    if not os.path.exists(path):
+        return "none", []
+    with open(path) as cli_file:
+        cli = CliLines(cli_file.read())
+    missing = []
+    check_entity(entity, cli, list(cli.all()), missing)
+    return ("missing" if missing else "ok"), missing
+
+
+def convert(sample, output_dir=None):
+    """Build object of sample app once, encode and check it."""
+    start = time.time()
+    try:
+        module = load_sample(sample)
+        entity = sample_class(module)()
+        sample_function(module, "config_")(entity)
+        xml_payload = _codec.encode(_codec_provider, entity)
+        json_payload = json_codec.encode(entity)
+        if output_dir:
+            base = os.path.join(output_dir, os.path.relpath(
+                sample, SAMPLES_DIR))[:-3]
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+            for suffix, payload in ((".xml", xml_payload),
+                                    (".json", json_payload)):
+                with open(base + suffix, "w") as output:
+                    output.write(payload + "\n")
+        xml = compare_xml(xml_payload, sample[:-3] + ".xml")
+        cli, missing = check_cli(entity, sample[:-3] + ".txt")
+        return Result(sample, xml, cli, missing, time.time() - start, None)
+    except Exception as error:
+        return Result(sample, "-", "-", [], time.time() - start,
+                      "{}: {}".format(type(error).__name__, error))
+
+
+def has_config(sample):
+    """Return True if sample app defines a config_* function."""
+    with open(sample) as source:
+        return "\ndef config_" in source.read()
+
+
+def write_report(path, results):
+    with open(path, "w") as output:
+        writer = csv.writer(output)
+        writer.writerow(("sample", "xml", "cli", "missing", "elapsed",
+                         "error"))
+        for result in results:
+            writer.writerow((os.path.relpath(result.sample, SAMPLES_DIR),
+                             result.xml, result.cli,
+                             " ".join(result.missing),
+                             "{:.6f}".format(result.elapsed),
+                             result.error or ""))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("-o", "--output-dir",
+                        help="write .xml and .json payloads under directory")
+    parser.add_argument("-r", "--report",
+                        help="write per-sample results to CSV file")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print problems and summary only")
+    parser.add_argument("pattern", nargs="?", default="*-ydk.py",
+                        help="sample app file pattern (default: *-ydk.py)")
+    args = parser.parse_args()
+
+    samples = [sample for sample in find_samples(args.pattern)
+               if sample.endswith(".py") and has_config(sample)]
+    output_dir = os.path.abspath(args.output_dir) if args.output_dir \
+        else None
+
+    results = []
+    counts = collections.Counter()
+    start = time.time()
+    with futures.ProcessPoolExecutor(args.workers) as executor:
+        for result in executor.map(convert, samples,
+                                   [output_dir] * len(samples),
+                                   chunksize=8):
+            results.append(result)
+            counts["xml " + result.xml] += 1
+            counts["cli " + result.cli] += 1
+            problem = result.error or result.xml in ("differs",
+                                                     "unreadable") or \
+                result.cli == "missing"
+            if args.quiet and not problem:
+                continue
+            print("{:<52} xml {:<10} cli {:<7} {}".format(
+                os.path.basename(result.sample), result.xml, result.cli,
+                result.error or " ".join(result.missing)))
+    elapsed = time.time() - start
+
+    if args.report:
+        write_report(args.report, results)
+    errors = len([result for result in results if result.error])
+    print("Samples: {}, errors: {}, {:.3f}s ({:.1f} samples/s)".format(
+        len(results), errors, elapsed,
+        len(results) / elapsed if elapsed else 0.0))
+    print("XML files: {} ok, {} differ, {} unreadable, {} missing".format(
+        counts["xml ok"], counts["xml differs"], counts["xml unreadable"],
+        counts["xml none"]))
+    print("CLI files: {} ok, {} with missing values, {} missing".format(
+        counts["cli ok"], counts["cli missing"], counts["cli none"]))
+    if errors or counts["xml differs"]:
+        sys.exit(1)
+    exit()
+# End of script
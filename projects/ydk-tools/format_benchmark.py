@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare XML and JSON encode time and payload size per model.
+
+usage: format_benchmark.py [-h] [-r RUNS] [-t] [pattern]
+
+positional arguments:
+  pattern               sample app file pattern (default:
+                        cd-encode-*-ydk.py)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -r RUNS, --runs RUNS  encodes per sample app and format
+  -t, --tools-json      encode JSON with json_codec even if
+                        CodecServiceProvider supports JSON
+
+The objects built by the config_* functions of the codec sample apps
+are encoded RUNS times as XML with CodecService and as JSON, and the
+median encode time and payload size are summed per model.  JSON is
+encoded by CodecServiceProvider(type="json") when the installed YDK-Py
+supports it, and by json_codec otherwise.
+"""
+
+from argparse import ArgumentParser
+import collections
+import functools
+import time
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+import json_codec
+from encode_cache import sample_objects
+from samplelib import percentile
+
+Totals = collections.namedtuple("Totals",
+                                "samples xml_time json_time xml_size "
+                                "json_size")
+
+
+def json_provider():
+    """Return CodecServiceProvider for JSON, None if not supported."""
+    try:
+        return CodecServiceProvider(type="json")
+    except Exception:
+        return None
+
+
+def median_time(function, entity_class, config, runs):
+    """Return (median seconds, payload) of encoding new objects."""
+    latencies = []
+    for _ in range(runs):
+        entity = entity_class()
+        config(entity)
+        start = time.time()
+        payload = function(entity)
+        latencies.append(time.time() - start)
+    return percentile(latencies, 50), payload
+
+
+def model_name(sample):
+    """Return model of sample app (e.g. xr-ip-ntp-cfg)."""
+    return sample[len("cd-encode-"):].rsplit("-", 2)[0]
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-r", "--runs", type=int, default=20,
+                        help="encodes per sample app and format")
+    parser.add_argument("-t", "--tools-json", action="store_true",
+                        help="encode JSON with json_codec even if "
+                             "CodecServiceProvider supports JSON")
+    parser.add_argument("pattern", nargs="?", default="cd-encode-*-ydk.py",
+                        help="sample app file pattern (default: "
+                             "cd-encode-*-ydk.py)")
+    args = parser.parse_args()
+
+    codec = CodecService()
+    xml_provider = CodecServiceProvider(type="xml")
+    provider = None if args.tools_json else json_provider()
+    if provider is None:
+        json_encode = json_codec.encode
+        print("JSON encoder: json_codec")
+    else:
+        json_encode = functools.partial(codec.encode, provider)
+        print("JSON encoder: CodecServiceProvider")
+
+    models = collections.OrderedDict()
+    for sample, entity_class, config in sample_objects(args.pattern):
+        xml_time, xml_payload = median_time(
+            functools.partial(codec.encode, xml_provider), entity_class,
+            config, args.runs)
+        json_time, json_payload = median_time(json_encode, entity_class,
+                                              config, args.runs)
+        totals = models.get(model_name(sample), Totals(0, 0, 0, 0, 0))
+        models[model_name(sample)] = Totals(
+            totals.samples + 1, totals.xml_time + xml_time,
+            totals.json_time + json_time,
+            totals.xml_size + len(xml_payload.encode()),
+            totals.json_size + len(json_payload.encode()))
+
+    row = "{:<36} {:>7} {:>9} {:>9} {:>8} {:>8} {:>6}"
+    print(row.format("Model", "Samples", "XML(us)", "JSON(us)", "XML(B)",
+                     "JSON(B)", "Size"))
+    total = Totals(0, 0, 0, 0, 0)
+    for totals in models.values():
+        total = Totals(*[a + b for a, b in zip(total, totals)])
+    for name, totals in list(models.items()) + [("total", total)]:
+        print(row.format(
+            name, totals.samples, "{:.1f}".format(totals.xml_time * 1e6),
+            "{:.1f}".format(totals.json_time * 1e6), totals.xml_size,
+            totals.json_size, "{:.0%}".format(
+                totals.json_size / float(totals.xml_size))
+            if totals.xml_size else "-"))
+    xml_provider.close()
+    exit()
+# End of script
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark process_isis of the IS-IS read apps against isis_report.py.
+
+usage: isis_benchmark.py [-h] [-a] [-i INSTANCES] [count]
+
+positional arguments:
+  count                 number of synthetic neighbors or adjacencies
+                        (default: 100000)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -a, --adjacencies     benchmark adjacency report (app 22) instead of
+                        neighbor report (app 20)
+  -i INSTANCES, --instances INSTANCES
+                        number of IS-IS instances
+
+Both formatters run on the same synthetic Isis data.  The benchmark
+reports time and peak memory of each and checks that their output is
+identical.
+"""
+
+from argparse import ArgumentParser
+import io
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from isis_report import adjacency_lines, neighbor_lines, write_lines
+from samplelib import SAMPLES_DIR, load_sample
+
+SAMPLE = os.path.join(SAMPLES_DIR, "crud", "models", "cisco-ios-xr",
+                      "Cisco-IOS-XR-clns-isis-oper",
+                      "nc-read-xr-clns-isis-oper-{}-ydk.py")
+
+INTERFACES = ("GigabitEthernet0/0/0/{}", "TenGigE0/1/0/{}",
+              "Bundle-Ether{}", "HundredGigE0/2/0/{}")
+
+
+def enum(value):
+    return SimpleNamespace(value=value)
+
+
+def system_id(index):
+    return "{:04x}.{:04x}.{:04x}".format(index >> 32 & 0xffff,
+                                         index >> 16 & 0xffff,
+                                         index & 0xffff)
+
+
+def synthetic_isis(count, instances=1):
+    """Return Isis-like object with count neighbors and adjacencies."""
+    isis = SimpleNamespace(instances=SimpleNamespace(instance=[]))
+    per_instance = count // instances
+    for number in range(instances):
+        neighbors = []
+        adjacencies = {1: [], 2: []}
+        host_names = []
+        for index in range(per_instance):
+            sys_id = system_id(number * per_instance + index + 1)
+            host_names.append(SimpleNamespace(
+                system_id=sys_id, host_name="rr{}-{}".format(number, index)))
+            interface = INTERFACES[index % len(INTERFACES)].format(
+                index % 512)
+            snpa = "*PtoP*" if index % 2 else "0011.2233.{:04x}".format(
+                index & 0xffff)
+            neighbors.append(SimpleNamespace(
+                system_id=sys_id, interface_name=interface,
+                neighbor_snpa=snpa, neighbor_state=enum(index % 3),
+                neighbor_holdtime=index % 30,
+                neighbor_circuit_type=enum(index % 4),
+                neighbor_ietf_nsf_capable_flag=bool(index % 2)))
+            adjacencies[index % 2 + 1].append(SimpleNamespace(
+                adjacency_system_id=sys_id, adjacency_interface=interface,
+                adjacency_snpa=snpa, adjacency_state=enum(index % 3),
+                adjacency_holdtime=index % 30, adjacency_uptime=index,
+                adjacency_ietf_nsf_capable_flag=bool(index % 2),
+                adjacency_bfd_state=enum(index % 4),
+                adjacency_ipv6bfd_state=enum(index % 4)))
+        levels = [SimpleNamespace(
+            level=enum(level),
+            adjacencies=SimpleNamespace(adjacency=adjacencies[level]))
+            for level in (1, 2)]
+        isis.instances.instance.append(SimpleNamespace(
+            instance_name="RR{}".format(number),
+            host_names=SimpleNamespace(host_name=host_names),
+            neighbors=SimpleNamespace(neighbor=neighbors),
+            levels=SimpleNamespace(level=levels)))
+    return isis
+
+
+def measure(function, *args):
+    """Return (result, seconds, peak bytes) of function call."""
+    tracemalloc.start()
+    start = time.time()
+    result = function(*args)
+    elapsed = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def concatenated(process, isis):
+    return process(isis) + "\n"
+
+
+def streamed(lines, isis):
+    stream = io.StringIO()
+    write_lines(lines(isis), stream)
+    return stream.getvalue()
+
+
+def discarded(lines, isis):
+    with open(os.devnull, "w") as stream:
+        return write_lines(lines(isis), stream)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-a", "--adjacencies", action="store_true",
+                        help="benchmark adjacency report (app 22) instead of "
+                             "neighbor report (app 20)")
+    parser.add_argument("-i", "--instances", type=int, default=1,
+                        help="number of IS-IS instances")
+    parser.add_argument("count", type=int, nargs="?", default=100000,
+                        help="number of synthetic neighbors or adjacencies "
+                             "(default: 100000)")
+    args = parser.parse_args()
+
+    app = "22" if args.adjacencies else "20"
+    process = load_sample(SAMPLE.format(app)).process_isis
+    lines = adjacency_lines if args.adjacencies else neighbor_lines
+    isis = synthetic_isis(args.count, args.instances)
+
+    expected, elapsed, peak = measure(concatenated, process, isis)
+    print("process_isis (app {}): {:.3f}s, peak {:.1f} MiB".format(
+        app, elapsed, peak / 1024.0 ** 2))
+    output, elapsed, peak = measure(streamed, lines, isis)
+    print("isis_report to memory: {:.3f}s, peak {:.1f} MiB".format(
+        elapsed, peak / 1024.0 ** 2))
+    _, elapsed, peak = measure(discarded, lines, isis)
+    print("isis_report to {}: {:.3f}s, peak {:.1f} MiB".format(
+        os.devnull, elapsed, peak / 1024.0 ** 2))
+    print("Output identical: {}".format("yes" if output == expected
+                                        else "NO"))
+    exit()
+# End of script
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode YDK objects as YANG JSON (RFC 7951) and decode them back.
+
+usage: json_codec.py [-h] [-c] sample
+
+positional arguments:
+  sample         codec sample app (cd-encode-*-ydk.py)
+
+optional arguments:
+  -h, --help     show this help message and exit
+  -c, --compact  print JSON without indentation
+
+The CodecServiceProvider of YDK-Py 0.5.0 only supports XML.  This
+module walks the YDK object once and builds the JSON document directly,
+without an intermediate XML payload.  Member names, modules and enum
+literals are taken from the model meta information of YDK-Py.  Bits
+leaves are encoded as the names of their set bits, in schema order.
+decode() builds the YDK object of a JSON document with the leaf
+conversions of streaming_decode.  The main program prints the object
+built by the config_* function of a codec sample app.
+"""
+
+from argparse import ArgumentParser
+import collections
+import enum
+import json
+
+from samplelib import load_sample, sample_class, sample_function
+
+import streaming_decode
+
+try:
+    from ydk.types import Empty, Decimal64, FixedBitsDict
+except ImportError:
+    Empty = Decimal64 = FixedBitsDict = None
+
+_meta_members = dict()
+_meta_ptypes = dict()
+
+# YDK-Py gives int64 and uint64 leaves this ptype; RFC 7951 encodes
+# their values as strings
+QUOTED_PTYPES = ("long",)
+
+
+def module_name(entity_class):
+    """Return YANG module name of YDK class.
+
+    ydk.models.cisco_ios_xr.Cisco_IOS_XR_ip_ntp_cfg gives
+    Cisco-IOS-XR-ip-ntp-cfg.
+    """
+    meta = _meta_info(entity_class)
+    if meta is not None and getattr(meta, "module_name", None):
+        return meta.module_name
+    return entity_class.__module__.rsplit(".", 1)[-1].replace("_", "-")
+
+
+def yang_name(attribute):
+    """Return YANG name for Python attribute name (as_ -> as)."""
+    return attribute.rstrip("_").replace("_", "-")
+
+
+def _meta_info(value):
+    try:
+        return value._meta_info()
+    except Exception:
+        return None
+
+
+def members(entity):
+    """Return (attribute, YANG name, module) of YDK object members.
+
+    Members are in model order when meta information is available and
+    in attribute order otherwise.  Module is None if unknown.
+    """
+    entity_class = type(entity)
+    if entity_class not in _meta_members:
+        meta = _meta_info(entity)
+        if meta is not None:
+            _meta_members[entity_class] = [
+                (member.presentation_name, member.name,
+                 getattr(member, "module_name", None))
+                for member in meta.meta_info_class_members]
+        else:
+            _meta_members[entity_class] = [
+                (name, yang_name(name), None) for name in vars(entity)
+                if name != "parent" and not name.startswith("_")]
+    return _meta_members[entity_class]
+
+
+def member_ptypes(entity):
+    """Return {attribute: ptype} of YDK object members (empty if unknown)."""
+    entity_class = type(entity)
+    if entity_class not in _meta_ptypes:
+        meta = _meta_info(entity)
+        _meta_ptypes[entity_class] = dict(
+            (member.presentation_name, getattr(member, "ptype", None))
+            for member in meta.meta_info_class_members) if meta else dict()
+    return _meta_ptypes[entity_class]
+
+
+def leaf_value(value, ptype=None):
+    """Return JSON value of YDK leaf value with meta ptype."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and ptype in QUOTED_PTYPES:
+        return str(value)
+    if isinstance(value, (int, float, str)):
+        return value
+    if Empty is not None and isinstance(value, Empty):
+        return [None]
+    if Decimal64 is not None and isinstance(value, Decimal64):
+        return value.s
+    if FixedBitsDict is not None and isinstance(value, FixedBitsDict):
+        return bits_names(value)
+    if isinstance(value, enum.Enum):
+        meta = _meta_info(type(value))
+        for literal, name in getattr(meta, "literal_map", {}).items():
+            if name == value.name:
+                return literal
+        return yang_name(value.name)
+    meta = _meta_info(value)
+    if meta is not None and getattr(meta, "yang_name", None):
+        # identity
+        return "{}:{}".format(meta.module_name, meta.yang_name)
+    return str(value)
+
+
+def bits_names(bits):
+    """Return names of the set bits of bits object, in schema order."""
+    positions = getattr(bits, "_pos_map", None) or dict()
+    names = [name for name, flag in bits._dictionary.items() if flag]
+    return " ".join(sorted(names, key=lambda name: positions.get(name, 0)))
+
+
+def is_entity(value):
+    """Return True if value is a YDK container or list entry object."""
+    return hasattr(value, "__dict__") and hasattr(value, "parent")
+
+
+def entity_node(entity, module):
+    """Return JSON object of YDK object in module, None if it has no data."""
+    node = collections.OrderedDict()
+    ptypes = member_ptypes(entity)
+    for attribute, name, member_module in members(entity):
+        value = getattr(entity, attribute, None)
+        if value is None:
+            continue
+        ptype = ptypes.get(attribute)
+        child_module = module
+        if member_module and member_module != module:
+            # augmented node
+            name = "{}:{}".format(member_module, name)
+            child_module = member_module
+        if isinstance(value, list):
+            items = [entity_node(item, child_module) if is_entity(item)
+                     else leaf_value(item, ptype) for item in value]
+            items = [item for item in items if item is not None]
+            if items:
+                node[name] = items
+        elif is_entity(value):
+            child = entity_node(value, child_module)
+            if child is not None:
+                node[name] = child
+        else:
+            node[name] = leaf_value(value, ptype)
+    return node or None
+
+
+def top_name(entity):
+    """Return YANG name of top-level YDK object (Ntp -> ntp)."""
+    meta = _meta_info(entity)
+    if meta is not None and getattr(meta, "yang_name", None):
+        return meta.yang_name
+    name = type(entity).__name__
+    return "".join("-" + char.lower() if char.isupper() and index else
+                   char.lower() for index, char in enumerate(name))
+
+
+def encode(entity, indent=2):
+    """Return RFC 7951 JSON payload of top-level YDK object."""
+    module = module_name(type(entity))
+    document = collections.OrderedDict()
+    document["{}:{}".format(module, top_name(entity))] = \
+        entity_node(entity, module) or collections.OrderedDict()
+    separators = (",", ": ") if indent else (",", ":")
+    return json.dumps(document, indent=indent, separators=separators)
+
+
+def json_leaf(member, value):
+    """Return Python value of JSON leaf value for meta member."""
+    if isinstance(value, bool):
+        text = "true" if value else "false"
+    elif value == [None]:
+        text = ""
+    else:
+        text = str(value)
+    # identityref values are prefixed with their module name
+    prefix = text.rpartition(":")[0]
+    return streaming_decode.leaf_value(member, text, {prefix: prefix})
+
+
+def decode_node(entity, node):
+    """Set members of YDK object from JSON object node."""
+    members = streaming_decode.meta_members(entity)
+    for name, value in node.items():
+        name = name.rpartition(":")[2]
+        member = members.get(name)
+        if member is None:
+            raise ValueError("unknown node {} in {}".format(
+                name, type(entity).__name__))
+        attribute = member.presentation_name
+        if member.mtype == streaming_decode.REFERENCE_CLASS:
+            child = getattr(entity, attribute, None)
+            if child is None:
+                # presence container
+                child = streaming_decode.member_class(member)()
+                child.parent = entity
+                setattr(entity, attribute, child)
+            decode_node(child, value)
+        elif member.mtype == streaming_decode.REFERENCE_LIST:
+            for item in value:
+                child = streaming_decode.member_class(member)()
+                child.parent = entity
+                decode_node(child, item)
+                getattr(entity, attribute).append(child)
+        elif member.mtype == streaming_decode.REFERENCE_LEAFLIST:
+            for item in value:
+                getattr(entity, attribute).append(json_leaf(member, item))
+        else:
+            setattr(entity, attribute, json_leaf(member, value))
+
+
+def decode(payload):
+    """Return top-level YDK object of RFC 7951 JSON payload."""
+    document = json.loads(payload)
+    if len(document) != 1:
+        raise ValueError("expected one top-level object")
+    qualified_name, node = next(iter(document.items()))
+    module, _, name = qualified_name.partition(":")
+    entity = streaming_decode.model_class(module, name)()
+    decode_node(entity, node)
+    return entity
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-c", "--compact", action="store_true",
+                        help="print JSON without indentation")
+    parser.add_argument("sample",
+                        help="codec sample app (cd-encode-*-ydk.py)")
+    args = parser.parse_args()
+
+    module = load_sample(args.sample)
+    entity = sample_class(module)()  # create object
+    sample_function(module, "config_")(entity)  # add object configuration
+
+    # encode and print object
+    print(encode(entity, None if args.compact else 2))
+    exit()
+# End of script
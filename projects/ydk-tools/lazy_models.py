@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Run a sample app with lazy imports of YDK model modules.
+
+usage: lazy_models.py [-h] [-e] [-r] sample ...
+
+positional arguments:
+  sample        sample app
+  args          sample app arguments
+
+optional arguments:
+  -h, --help    show this help message and exit
+  -e, --eager   import model modules when the app imports them
+  -r, --report  print deferred and loaded model modules on exit
+
+The generated model modules (ydk.models.*) take most of the startup time
+of a sample app.  With LazyModelFinder installed, an import such as
+
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_ipv4_bgp_cfg
+
+returns a module object without executing the module.  The module is
+executed on first attribute access (e.g. Cisco_IOS_XR_ipv4_bgp_cfg.Bgp),
+so an app that exits early (-h, a bad argument, an unreachable device)
+never loads its models.  Model packages are imported as usual.
+"""
+
+from argparse import ArgumentParser, REMAINDER
+import atexit
+import importlib.abc
+import importlib.util
+import runpy
+import sys
+import types
+
+import samplelib  # noqa: F401 (urlparse for the sample apps)
+
+LAZY_PREFIXES = ("ydk.models.",)
+
+
+class LazyModelFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder deferring execution of model modules."""
+
+    def __init__(self, prefixes=LAZY_PREFIXES):
+        self.prefixes = prefixes
+        self.deferred = []
+
+    def find_spec(self, name, path, target=None):
+        if not name.startswith(self.prefixes):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if (spec.submodule_search_locations is not None or
+                not hasattr(spec.loader, "exec_module")):
+            # packages and built-in modules load as usual
+            return spec
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        self.deferred.append(name)
+        return spec
+
+    def loaded(self):
+        """Return deferred modules executed so far."""
+        # deferred modules have a LazyLoader, which leaves a subclass of
+        # ModuleType in place until first access; type() and isinstance()
+        # do not trigger loading
+        return [name for name in self.deferred
+                if isinstance(sys.modules.get(name), types.ModuleType) and
+                type(sys.modules[name]) is types.ModuleType]
+
+
+_finder = None
+
+
+def install(prefixes=LAZY_PREFIXES):
+    """Defer execution of modules whose names start with prefixes."""
+    global _finder
+    if _finder is None:
+        _finder = LazyModelFinder(prefixes)
+        sys.meta_path.insert(0, _finder)
+    return _finder
+
+
+def uninstall():
+    global _finder
+    if _finder is not None:
+        sys.meta_path.remove(_finder)
+        _finder = None
+
+
+def print_report(finder):
+    loaded = finder.loaded()
+    print("Model modules deferred: {}, loaded: {}".format(
+        len(finder.deferred), len(loaded)), file=sys.stderr)
+    for name in finder.deferred:
+        print("  {} {}".format("loaded  " if name in loaded else "deferred",
+                               name), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-e", "--eager", action="store_true",
+                        help="import model modules when the app imports "
+                             "them")
+    parser.add_argument("-r", "--report", action="store_true",
+                        help="print deferred and loaded model modules on "
+                             "exit")
+    parser.add_argument("sample",
+                        help="sample app")
+    parser.add_argument("args", nargs=REMAINDER,
+                        help="sample app arguments")
+    args = parser.parse_args()
+
+    if not args.eager:
+        finder = install()
+        if args.report:
+            atexit.register(print_report, finder)
+
+    # run sample app as main program
+    sys.argv = [args.sample] + args.args
+    runpy.run_path(args.sample, run_name="__main__")
+    exit()
+# End of script
@@ -0,0 +1,139 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+NETCONF sessions for payloads that span several YDK objects.
+
+YDK services send one object per operation.  The tools here encode YDK
+objects with the codec service and combine them into a single payload,
+which is sent over an ncclient session (ncclient is installed with
+YDK-Py).
+"""
+
+import re
+
+from ncclient import manager
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from samplelib import NETCONF_PORT, provider_args
+
+BASE_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+_codec = CodecService()
+_codec_provider = CodecServiceProvider(type="xml")
+
+
+def connect(device, timeout=60):
+    """Return ncclient manager for device URL."""
+    args = provider_args(device)
+    return manager.connect(host=args["address"],
+                           port=args["port"] or NETCONF_PORT,
+                           username=args["username"],
+                           password=args["password"],
+                           timeout=timeout,
+                           hostkey_verify=False,
+                           look_for_keys=False,
+                           allow_agent=False)
+
+
+def encode(entity):
+    """Return XML payload for YDK object."""
+    return _codec.encode(_codec_provider, entity).strip()
+
+
+def set_operation(payload, operation):
+    """Return XML payload with NETCONF operation on its root element."""
+    return re.sub(r"^<([\w.:-]+)",
+                  r'<\1 xmlns:xc="{ns}" xc:operation="{operation}"'.format(
+                      ns=BASE_NS, operation=operation),
+                  payload, count=1)
+
+
+def config_payload(payloads):
+    """Return <config> element text wrapping XML payloads."""
+    return "<config xmlns=\"{ns}\">{payloads}</config>".format(
+        ns=BASE_NS, payloads="".join(payloads))
+
+
+class CandidateTransaction(object):
+    """Edits in the locked candidate datastore, committed once.
+
+    Used as a context manager, the transaction discards all of its
+    edits if the block raises before commit.  A confirmed commit must
+    be confirmed (or cancelled) before the block ends, otherwise the
+    device rolls it back when the session closes.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.committed = False
+        self._payloads = []
+
+    def __enter__(self):
+        self.session.lock(target="candidate")
+        # start from a clean candidate
+        self.session.discard_changes()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if not self.committed:
+                self.session.discard_changes()
+        finally:
+            self.session.unlock(target="candidate")
+        return False
+
+    def add(self, entity, operation=None):
+        """Add YDK object with optional NETCONF operation (e.g. delete)."""
+        payload = encode(entity)
+        if operation:
+            payload = set_operation(payload, operation)
+        self.add_payload(payload)
+
+    def add_payload(self, payload):
+        """Add XML payload to the transaction."""
+        self._payloads.append(payload)
+
+    def edit(self):
+        """Send pending objects to the candidate in one <edit-config>."""
+        if self._payloads:
+            self.session.edit_config(target="candidate",
+                                     config=config_payload(self._payloads))
+            self._payloads = []
+
+    def commit(self, confirm_timeout=None):
+        """Send pending objects and commit the candidate.
+
+        With confirm_timeout (seconds), issue a confirmed commit that
+        the device rolls back unless confirm() follows in time.
+        """
+        self.edit()
+        if confirm_timeout:
+            self.session.commit(confirmed=True,
+                                timeout=str(int(confirm_timeout)))
+        else:
+            self.session.commit()
+            self.committed = True
+
+    def confirm(self):
+        """Confirm pending confirmed commit."""
+        self.session.commit()
+        self.committed = True
+
+    def cancel(self):
+        """Cancel pending confirmed commit and restore configuration."""
+        self.session.cancel_commit()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Roll back the configuration of a fleet in waves and verify it.
+
+usage: rollback_fleet.py [-h] [-v] [-d SNAPSHOT_DIR] [-c COUNT]
+                         [-i COMMIT_ID] [-f] [-l LABEL] [-m COMMENT]
+                         [-s FIRST] [-w WAVE_SIZE] [-p PARALLEL]
+                         [-x MAX_FAILURES] [-t TIMEOUT] [-n]
+                         {snapshot,rollback} inventory
+
+positional arguments:
+  {snapshot,rollback}   save running configuration of devices or roll them
+                        back and verify against the snapshots
+  inventory             file with one NETCONF device URL per line
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -d SNAPSHOT_DIR, --snapshot-dir SNAPSHOT_DIR
+                        snapshot directory
+  -c COUNT, --count COUNT
+                        roll back the last COUNT commits
+  -i COMMIT_ID, --commit-id COMMIT_ID
+                        roll back to commit COMMIT_ID instead
+  -f, --force           force rollback
+  -l LABEL, --label LABEL
+                        label of rollback commit
+  -m COMMENT, --comment COMMENT
+                        comment of rollback commit
+  -s FIRST, --first FIRST
+                        devices in first wave
+  -w WAVE_SIZE, --wave-size WAVE_SIZE
+                        maximum devices per wave
+  -p PARALLEL, --parallel PARALLEL
+                        maximum devices rolled back at a time
+  -x MAX_FAILURES, --max-failures MAX_FAILURES
+                        halt when more than this percentage of devices failed
+  -t TIMEOUT, --timeout TIMEOUT
+                        timeout in seconds for each NETCONF operation
+  -n, --dry-run         print waves and rollback RPC without connecting
+
+Before a change, snapshot saves the running configuration of every
+device.  rollback sends RollBackConfigurationLastRpc (or
+RollBackConfigurationToRpc with --commit-id) to the devices in waves:
+the first wave has FIRST devices and every later wave twice as many,
+up to WAVE_SIZE.  After its RPC, the running configuration of each
+device is compared with its snapshot (config_diff).  A device fails if
+the RPC fails, its snapshot is missing or its configuration differs.
+No further wave starts once more than MAX_FAILURES percent of the
+devices rolled back so far failed.  The exit status is 1 if any device
+failed or was not rolled back.
+"""
+
+from argparse import ArgumentParser
+from concurrent import futures
+import collections
+import io
+import os
+import sys
+import time
+
+from ncclient.xml_ import to_ele
+from ydk.models.cisco_ios_xr import Cisco_IOS_XR_cfgmgr_rollback_act \
+    as xr_cfgmgr_rollback_act
+
+import config_diff
+from fanout_read import read_inventory
+from ncsession import connect
+from rpc_pipeline import rpc_payload
+from samplelib import NETCONF_PORT, device_key, enable_logging, provider_args
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "cache", "snapshots")
+
+# differences kept per device for the report
+SHOWN_DIFFERENCES = 5
+
+Result = collections.namedtuple("Result",
+                                "device elapsed differences shown error")
+
+
+def snapshot_path(snapshot_dir, device):
+    """Return snapshot file of device (host_port.xml)."""
+    args = provider_args(device)
+    return os.path.join(snapshot_dir, "{}_{}.xml".format(
+        args["address"], args["port"] or NETCONF_PORT))
+
+
+def running_config(session):
+    """Return running configuration of ncclient session as XML text."""
+    return session.get_config(source="running").data_xml
+
+
+def save_snapshot(device, snapshot_dir, timeout):
+    """Save running configuration of device, return Result."""
+    start = time.time()
+    try:
+        with connect(device, timeout) as session:
+            data = running_config(session)
+        path = snapshot_path(snapshot_dir, device)
+        with open(path + ".tmp", "w") as snapshot:
+            snapshot.write(data)
+        os.replace(path + ".tmp", path)
+    except Exception as error:
+        return Result(device, time.time() - start, 0, [],
+                      "{}: {}".format(type(error).__name__, error))
+    return Result(device, time.time() - start, 0, [], None)
+
+
+def rollback_rpc(count=1, commit_id=None, force=False, label=None,
+                 comment=None):
+    """Return RollBackConfigurationLastRpc or RollBackConfigurationToRpc."""
+    if commit_id:
+        rpc = xr_cfgmgr_rollback_act.RollBackConfigurationToRpc()
+        rpc.input.commit_id = commit_id
+    else:
+        rpc = xr_cfgmgr_rollback_act.RollBackConfigurationLastRpc()
+        rpc.input.count = count
+    if force:
+        rpc.input.force = True
+    if label:
+        rpc.input.label = label
+    if comment:
+        rpc.input.comment = comment
+    return rpc
+
+
+def rollback_device(device, payload, snapshot_dir, timeout):
+    """Send rollback payload to device, verify it, return Result."""
+    start = time.time()
+    try:
+        # a device without snapshot cannot be verified, leave it alone
+        expected, _ = config_diff.parse(snapshot_path(snapshot_dir, device))
+        with connect(device, timeout) as session:
+            session.dispatch(to_ele(payload))
+            data = running_config(session)
+        running, _ = config_diff.parse(io.BytesIO(data.encode("utf-8")))
+        differences = 0
+        shown = []
+        for sign, path, old, new in config_diff.TreeDiff().diff(expected,
+                                                                running):
+            differences += 1
+            if len(shown) < SHOWN_DIFFERENCES:
+                shown.append("{} {}".format(sign, path) if sign != "~" else
+                             "~ {}: {} -> {}".format(path, old, new))
+    except Exception as error:
+        return Result(device, time.time() - start, 0, [],
+                      "{}: {}".format(type(error).__name__, error))
+    error = "differs from snapshot" if differences else None
+    return Result(device, time.time() - start, differences, shown, error)
+
+
+def waves(devices, first=1, size=50):
+    """Yield device lists: first devices, then twice as many up to size."""
+    start = 0
+    count = max(first, 1)
+    while start < len(devices):
+        yield devices[start:start + count]
+        start += count
+        count = min(count * 2, size)
+
+
+class RollbackOrchestrator(object):
+    """Roll back devices wave by wave, halting on too many failures."""
+
+    def __init__(self, payload, snapshot_dir=SNAPSHOT_DIR, parallel=20,
+                 max_failures=5.0, timeout=60):
+        self.payload = payload
+        self.snapshot_dir = snapshot_dir
+        self.parallel = parallel
+        self.max_failures = max_failures
+        self.timeout = timeout
+        self.done = 0
+        self.failed = 0
+
+    def halted(self):
+        """Return True if failures exceed max_failures percent."""
+        return bool(self.done) and \
+            100.0 * self.failed / self.done > self.max_failures
+
+    def run_wave(self, devices):
+        """Roll back devices at most parallel at a time, return Results."""
+        workers = max(1, min(self.parallel, len(devices)))
+        with futures.ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(
+                lambda device: rollback_device(device, self.payload,
+                                               self.snapshot_dir,
+                                               self.timeout), devices))
+        self.done += len(results)
+        self.failed += len([result for result in results if result.error])
+        return results
+
+    def run(self, devices, first=1, size=50):
+        """Yield (wave devices, Results, seconds) until done or halted."""
+        for wave in waves(devices, first, size):
+            if self.halted():
+                return
+            start = time.time()
+            results = self.run_wave(wave)
+            yield wave, results, time.time() - start
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-d", "--snapshot-dir", default=SNAPSHOT_DIR,
+                        help="snapshot directory")
+    parser.add_argument("-c", "--count", type=int, default=1,
+                        help="roll back the last COUNT commits")
+    parser.add_argument("-i", "--commit-id",
+                        help="roll back to commit COMMIT_ID instead")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="force rollback")
+    parser.add_argument("-l", "--label",
+                        help="label of rollback commit")
+    parser.add_argument("-m", "--comment",
+                        help="comment of rollback commit")
+    parser.add_argument("-s", "--first", type=int, default=1,
+                        help="devices in first wave")
+    parser.add_argument("-w", "--wave-size", type=int, default=50,
+                        help="maximum devices per wave")
+    parser.add_argument("-p", "--parallel", type=int, default=20,
+                        help="maximum devices rolled back at a time")
+    parser.add_argument("-x", "--max-failures", type=float, default=5.0,
+                        help="halt when more than this percentage of "
+                             "devices failed")
+    parser.add_argument("-t", "--timeout", type=float, default=60,
+                        help="timeout in seconds for each NETCONF operation")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="print waves and rollback RPC without "
+                             "connecting")
+    parser.add_argument("command", choices=["snapshot", "rollback"],
+                        help="save running configuration of devices or roll "
+                             "them back and verify against the snapshots")
+    parser.add_argument("inventory",
+                        help="file with one NETCONF device URL per line")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    devices = read_inventory(args.inventory)
+    os.makedirs(args.snapshot_dir, exist_ok=True)
+    start = time.time()
+
+    if args.command == "snapshot":
+        with futures.ThreadPoolExecutor(max(1, args.parallel)) as executor:
+            results = list(executor.map(
+                lambda device: save_snapshot(device, args.snapshot_dir,
+                                             args.timeout), devices))
+        for result in results:
+            if result.error:
+                print("{:<40} failed: {}".format(device_key(result.device),
+                                                 result.error))
+        failed = len([result for result in results if result.error])
+        print("Snapshots: {} saved, {} failed, {:.3f}s".format(
+            len(results) - failed, failed, time.time() - start))
+        if failed:
+            sys.exit(1)
+        exit()
+
+    payload = rpc_payload(rollback_rpc(args.count, args.commit_id,
+                                       args.force, args.label, args.comment))
+    if args.dry_run:
+        print(payload)
+        for index, wave in enumerate(waves(devices, args.first,
+                                           args.wave_size), 1):
+            print("Wave {}: {}".format(index, " ".join(
+                device_key(device) for device in wave)))
+        exit()
+
+    orchestrator = RollbackOrchestrator(payload, args.snapshot_dir,
+                                        args.parallel, args.max_failures,
+                                        args.timeout)
+    row = "{:>4} {:>7} {:>6} {:>9} {:>9}"
+    timings = [row.format("Wave", "Devices", "Failed", "Time(s)",
+                          "Slowest")]
+    for index, (wave, results, elapsed) in enumerate(
+            orchestrator.run(devices, args.first, args.wave_size), 1):
+        failed = [result for result in results if result.error]
+        for result in failed:
+            print("Wave {} {:<40} {} ({:.3f}s)".format(
+                index, device_key(result.device), result.error,
+                result.elapsed))
+            for line in result.shown:
+                print("    " + line)
+        timings.append(row.format(
+            index, len(wave), len(failed), "{:.3f}".format(elapsed),
+            "{:.3f}".format(max(result.elapsed for result in results))))
+        print("Wave {}: {} devices, {} failed, {:.3f}s".format(
+            index, len(wave), len(failed), elapsed))
+        sys.stdout.flush()
+
+    skipped = len(devices) - orchestrator.done
+    print("\n".join(timings))
+    print("Devices: {} rolled back, {} failed, {} not rolled back{}".format(
+        orchestrator.done - orchestrator.failed, orchestrator.failed,
+        skipped, " (halted)" if skipped else ""))
+    print("Elapsed: {:.3f}s".format(time.time() - start))
+    if orchestrator.failed or skipped:
+        sys.exit(1)
+    exit()
+# End of script
@@ -0,0 +1,210 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Helpers shared by the YDK-Py tools.
+
+The tools drive the basic sample apps under samples/basic without
+modifying them.  They import a sample as a module and reuse its
+config_*, prepare_* and process_* functions.
+"""
+
+import bisect
+import fnmatch
+import importlib.machinery
+import importlib.util
+import inspect
+import itertools
+import logging
+import math
+import os
+import random
+import re
+import sys
+import threading
+
+try:
+    from urllib.parse import unquote, urlparse
+except ImportError:
+    from urllib import unquote
+    from urlparse import urlparse
+
+# the sample apps import urlparse directly (Python 2)
+if "urlparse" not in sys.modules:
+    try:
+        importlib.import_module("urlparse")
+    except ImportError:
+        sys.modules["urlparse"] = sys.modules["urllib.parse"]
+
+SAMPLES_DIR = os.path.normpath(os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), os.pardir, os.pardir, "samples", "basic"))
+
+NETCONF_PORT = 830
+
+# object creation line in main program of every sample app
+CREATE_OBJECT = re.compile(r"^\s*\w+ = (\w+)\.(\w+)\(\)  # create object",
+                           re.MULTILINE)
+
+_samples = {}
+
+
+def device_key(device):
+    """Return session key (ssh://user@host:port) for device URL."""
+    device = urlparse(device)
+    return "{scheme}://{user}@{host}:{port}".format(
+        scheme=device.scheme, user=device.username, host=device.hostname,
+        port=device.port or NETCONF_PORT)
+
+
+def provider_args(device):
+    """Return NetconfServiceProvider arguments for device URL.
+
+    User name and password may be percent-encoded (e.g. %40 for @).
+    """
+    device = urlparse(device)
+    return dict(address=device.hostname,
+                port=device.port,
+                username=_unquote(device.username),
+                password=_unquote(device.password),
+                protocol=device.scheme)
+
+
+def _unquote(value):
+    return unquote(value) if value is not None else None
+
+
+def server_capabilities(provider):
+    """Return capabilities the device advertised in its hello message."""
+    if hasattr(provider, "get_capabilities"):
+        return list(provider.get_capabilities())
+    if hasattr(provider, "_get_capabilities"):
+        return list(provider._get_capabilities())
+    # YDK 0.5 keeps the ncclient manager in its service provider plugin
+    return list(provider.sp_instance._nc_manager.server_capabilities)
+
+
+def enable_logging(verbose, name="ydk"):
+    """Log debug messages for logger name if verbose is set."""
+    if verbose:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(("%(asctime)s - %(name)s - "
+                                      "%(levelname)s - %(message)s"))
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+
+def percentile(values, pct):
+    """Return pct percentile of values (nearest rank)."""
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(values))) - 1
+    return values[max(rank, 0)]
+
+
+def parse_weights(items, value_type=str):
+    """Return [(value, weight)] for VALUE[=WEIGHT] items (weight 1)."""
+    weights = []
+    for item in items:
+        value, _, weight = item.strip().partition("=")
+        weight = float(weight or 1)
+        if weight <= 0:
+            raise ValueError("weight of {} must be positive".format(value))
+        weights.append((value_type(value), weight))
+    return weights
+
+
+class WeightedChoice(object):
+    """Weighted random choice of values from [(value, weight)]."""
+
+    def __init__(self, weights, seed=None):
+        self.values = [value for value, _ in weights]
+        self.cumulative = list(itertools.accumulate(
+            weight for _, weight in weights))
+        self._random = random.Random(seed)
+
+    def choose(self):
+        """Return next value."""
+        index = bisect.bisect(self.cumulative,
+                              self._random.random() * self.cumulative[-1])
+        return self.values[min(index, len(self.values) - 1)]
+
+
+def find_samples(pattern, root=SAMPLES_DIR):
+    """Return sorted paths of sample apps under root matching pattern."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in fnmatch.filter(filenames, pattern):
+            paths.append(os.path.join(dirpath, filename))
+    return sorted(paths)
+
+
+def load_sample(path):
+    """Import sample app at path as module (once per process)."""
+    path = os.path.abspath(path)
+    if path not in _samples:
+        name = os.path.basename(path)[:-3].replace("-", "_")
+        loader = importlib.machinery.SourceFileLoader(name, path)
+        spec = importlib.util.spec_from_loader(name, loader)
+        module = importlib.util.module_from_spec(spec)
+        loader.exec_module(module)
+        _samples[path] = module
+    return _samples[path]
+
+
+def sample_function(module, prefix):
+    """Return function in sample module whose name starts with prefix."""
+    for name, function in inspect.getmembers(module, inspect.isfunction):
+        if name.startswith(prefix) and function.__module__ == module.__name__:
+            return function
+    raise ValueError("no {}* function in {}".format(prefix, module.__file__))
+
+
+def sample_class(module):
+    """Return class of the top-level object the sample app creates."""
+    with open(module.__file__) as sample:
+        match = CREATE_OBJECT.search(sample.read())
+    if match is None:
+        raise ValueError("no object creation in {}".format(module.__file__))
+    alias, name = match.groups()
+    return getattr(getattr(module, alias), name)
+
+
+def call_with_timeout(function, timeout, *args):
+    """Call function and raise TimeoutError if it runs past timeout.
+
+    The call keeps running in a daemon thread after a timeout, so a
+    hung NETCONF session does not block the caller.
+    """
+    result = dict()
+
+    def target():
+        try:
+            result["value"] = function(*args)
+        except Exception as error:
+            result["error"] = error
+
+    thread = threading.Thread(target=target)
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError("timed out after {}s".format(timeout))
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Mirror the YANG schemas of a fleet of devices into a local store.
+
+usage: schema_mirror.py [-h] [-v] [-d STORE_DIR] [-s SESSIONS] [-w WORKERS]
+                        [-t TIMEOUT] [-r] [-q]
+                        inventory
+
+positional arguments:
+  inventory             file with one NETCONF device URL per line
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -d STORE_DIR, --store-dir STORE_DIR
+                        schema store directory
+  -s SESSIONS, --sessions SESSIONS
+                        NETCONF sessions per device for downloads
+  -w WORKERS, --workers WORKERS
+                        devices listed at a time
+  -t TIMEOUT, --timeout TIMEOUT
+                        timeout in seconds for each NETCONF operation
+  -r, --refresh         download all listed schemas again and report
+                        changed content
+  -q, --quiet           print summary only
+
+The schemas of every device are listed from netconf-state/schemas
+(ietf-netconf-monitoring).  A schema is identified by its identifier,
+version and format; every identifier@version.format that is not in the
+store yet is downloaded once with <get-schema>, from one of the devices
+that list it, over up to SESSIONS sessions per device.  A fleet of
+identical images costs one download per unique module.
+
+The store is content addressed:
+
+    objects/<sha256[:2]>/<sha256>  schema text
+    index.json                     identifier@version.format to sha256
+                                   and device key to its schemas
+"""
+
+from argparse import ArgumentParser
+from concurrent import futures
+import collections
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+from ydk.services import CRUDService, ExecutorService
+from ydk.providers import NetconfServiceProvider
+from ydk.models.ietf import ietf_netconf_monitoring
+
+from fanout_read import read_inventory
+from samplelib import (call_with_timeout, device_key, enable_logging,
+                       provider_args)
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "cache", "schemas")
+
+logger = logging.getLogger("ydk.mirror")
+
+Download = collections.namedtuple("Download",
+                                  "key device size changed elapsed error")
+
+
+def format_name(schema_format):
+    """Return name of schema format identity (yang, yin, xsd, ...)."""
+    name = type(schema_format).__name__
+    if name.endswith("_Identity"):
+        name = name[:-len("_Identity")]
+    return name.lower()
+
+
+def schema_key(identifier, version, schema_format):
+    """Return store key identifier@version.format of a schema."""
+    return "{}@{}.{}".format(identifier, version or "", schema_format)
+
+
+class SchemaStore(object):
+    """Content-addressed schema texts with an index of schema keys.
+
+    Objects are written before the index refers to them, so an
+    interrupted mirror leaves no dangling index entries.
+    """
+
+    def __init__(self, path=STORE_DIR):
+        self.path = path
+        self._index_path = os.path.join(path, "index.json")
+        self._lock = threading.Lock()
+        try:
+            with open(self._index_path) as index:
+                index = json.load(index)
+        except (IOError, ValueError):
+            index = dict()
+        self.schemas = index.get("schemas", dict())
+        self.devices = index.get("devices", dict())
+
+    def object_path(self, digest):
+        return os.path.join(self.path, "objects", digest[:2], digest)
+
+    def has(self, key):
+        """Return True if schema key is stored."""
+        digest = self.schemas.get(key)
+        return digest is not None and os.path.exists(
+            self.object_path(digest))
+
+    def read(self, key):
+        """Return stored text of schema key."""
+        with open(self.object_path(self.schemas[key])) as schema:
+            return schema.read()
+
+    def add(self, key, text):
+        """Store text of schema key, return True if its content changed."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = "{}.{}.tmp".format(path, threading.get_ident())
+            with open(temp_path, "wb") as schema:
+                schema.write(data)
+            os.replace(temp_path, path)
+        with self._lock:
+            previous = self.schemas.get(key)
+            self.schemas[key] = digest
+        return previous is not None and previous != digest
+
+    def set_device(self, device, keys):
+        """Record schema keys listed by device."""
+        with self._lock:
+            self.devices[device_key(device)] = sorted(keys)
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock:
+            index = dict(schemas=self.schemas, devices=self.devices)
+            temp_path = self._index_path + ".tmp"
+            with open(temp_path, "w") as index_file:
+                json.dump(index, index_file, indent=2, sort_keys=True)
+            os.replace(temp_path, self._index_path)
+
+    def objects(self):
+        """Return number of distinct schema texts referenced by index."""
+        return len(set(self.schemas.values()))
+
+
+def list_schemas(device, timeout):
+    """Return {schema key: get-schema input} listed by device."""
+    def read():
+        provider = NetconfServiceProvider(**provider_args(device))
+        try:
+            return CRUDService().read(provider,
+                                      ietf_netconf_monitoring.NetconfState())
+        finally:
+            provider.close()
+
+    netconf_state = call_with_timeout(read, timeout)
+    schemas = collections.OrderedDict()
+    for schema in netconf_state.schemas.schema:
+        key = schema_key(schema.identifier, schema.version,
+                         format_name(schema.format))
+        schemas[key] = (schema.identifier, schema.version, schema.format)
+    return schemas
+
+
+def assign(listings, store, refresh=False):
+    """Return {device: [schema keys]} with one device per needed key.
+
+    A key goes to the device listing it that has the fewest keys
+    assigned so far, which spreads the downloads over the fleet.
+    """
+    assigned = collections.OrderedDict((device, []) for device in listings)
+    owners = collections.OrderedDict()
+    for device, schemas in listings.items():
+        for key in schemas:
+            owners.setdefault(key, []).append(device)
+    for key, devices in owners.items():
+        if refresh or not store.has(key):
+            device = min(devices, key=lambda device: len(assigned[device]))
+            assigned[device].append(key)
+    return assigned
+
+
+class Mirror(object):
+    """Download schemas of devices over a few sessions per device."""
+
+    def __init__(self, store, sessions=4, timeout=60):
+        self.store = store
+        self.sessions = sessions
+        self.timeout = timeout
+
+    def _session(self, device, schemas, keys):
+        """Download keys from work queue over one session of device."""
+        downloads = []
+        try:
+            provider = call_with_timeout(
+                lambda: NetconfServiceProvider(**provider_args(device)),
+                self.timeout)
+        except Exception as error:
+            message = "{}: {}".format(type(error).__name__, error)
+            while True:
+                try:
+                    key = keys.get_nowait()
+                except queue.Empty:
+                    return downloads
+                downloads.append(Download(key, device, 0, False, 0.0,
+                                          message))
+        executor = ExecutorService()
+        try:
+            while True:
+                try:
+                    key = keys.get_nowait()
+                except queue.Empty:
+                    return downloads
+                downloads.append(self._download(executor, provider, device,
+                                                key, schemas[key]))
+        finally:
+            provider.close()
+
+    def _download(self, executor, provider, device, key, schema):
+        identifier, version, schema_format = schema
+        get_schema_rpc = ietf_netconf_monitoring.GetSchemaRpc()
+        get_schema_rpc.input.identifier = identifier
+        if version:
+            get_schema_rpc.input.version = version
+        get_schema_rpc.input.format = schema_format
+        start = time.time()
+        try:
+            text = str(call_with_timeout(executor.execute_rpc, self.timeout,
+                                         provider, get_schema_rpc))
+            changed = self.store.add(key, text)
+        except Exception as error:
+            logger.debug("schema %s unavailable", key, exc_info=True)
+            return Download(key, device, 0, False, time.time() - start,
+                            "{}: {}".format(type(error).__name__, error))
+        return Download(key, device, len(text), changed,
+                        time.time() - start, None)
+
+    def download(self, listings, assigned):
+        """Download assigned keys of all devices, yield Downloads."""
+        jobs = []
+        for device, keys in assigned.items():
+            work = queue.Queue()
+            for key in keys:
+                work.put(key)
+            for _ in range(min(self.sessions, len(keys))):
+                jobs.append((device, listings[device], work))
+        if not jobs:
+            return
+        with futures.ThreadPoolExecutor(len(jobs)) as executor:
+            pending = [executor.submit(self._session, *job) for job in jobs]
+            for future in futures.as_completed(pending):
+                for download in future.result():
+                    yield download
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-d", "--store-dir", default=STORE_DIR,
+                        help="schema store directory")
+    parser.add_argument("-s", "--sessions", type=int, default=4,
+                        help="NETCONF sessions per device for downloads")
+    parser.add_argument("-w", "--workers", type=int, default=16,
+                        help="devices listed at a time")
+    parser.add_argument("-t", "--timeout", type=float, default=60,
+                        help="timeout in seconds for each NETCONF operation")
+    parser.add_argument("-r", "--refresh", action="store_true",
+                        help="download all listed schemas again and report "
+                             "changed content")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print summary only")
+    parser.add_argument("inventory",
+                        help="file with one NETCONF device URL per line")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    store = SchemaStore(args.store_dir)
+    devices = read_inventory(args.inventory)
+    start = time.time()
+
+    listings = collections.OrderedDict()
+    failed = 0
+    with futures.ThreadPoolExecutor(args.workers) as executor:
+        pending = [executor.submit(list_schemas, device, args.timeout)
+                   for device in devices]
+        for device, future in zip(devices, pending):
+            try:
+                listings[device] = future.result()
+            except Exception as error:
+                failed += 1
+                print("{:<40} listing failed: {}: {}".format(
+                    device_key(device), type(error).__name__, error))
+                continue
+            store.set_device(device, listings[device])
+    listed = time.time()
+
+    assigned = assign(listings, store, args.refresh)
+    mirror = Mirror(store, args.sessions, args.timeout)
+    counts = collections.Counter()
+    size = 0
+    try:
+        for download in mirror.download(listings, assigned):
+            if download.error:
+                counts["errors"] += 1
+            else:
+                counts["downloads"] += 1
+                counts["changed"] += download.changed
+                size += download.size
+            if args.quiet and not download.error and not download.changed:
+                continue
+            print("{:<48} {:<32} {:>8} {:.3f}s {}".format(
+                download.key, device_key(download.device), download.size,
+                download.elapsed, download.error or
+                ("changed" if download.changed else "ok")))
+    finally:
+        store.save()
+    elapsed = time.time() - start
+
+    references = sum(len(schemas) for schemas in listings.values())
+    unique = len(set(key for schemas in listings.values() for key in schemas))
+    print("Devices: {} listed, {} failed; schemas: {} listed, {} unique"
+          .format(len(listings), failed, references, unique))
+    print("Downloads: {} ({} bytes, {} changed, {} errors), store: {} "
+          "schemas, {} objects".format(counts["downloads"], size,
+                                       counts["changed"], counts["errors"],
+                                       len(store.schemas), store.objects()))
+    print("Elapsed: {:.3f}s (list {:.3f}s, download {:.3f}s)".format(
+        elapsed, listed - start, elapsed - (listed - start)))
+    if failed or counts["errors"]:
+        sys.exit(1)
+    exit()
+# End of script
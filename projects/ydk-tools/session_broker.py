@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Keep warm NETCONF sessions for the sample apps in a local broker process.
+
+usage: session_broker.py [-h] [-v] [-b BROKER] [-i IDLE_TIMEOUT]
+                         {serve,stats,flush}
+
+positional arguments:
+  {serve,stats,flush}   run broker, print session counters or close all
+                        sessions
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -b BROKER, --broker BROKER
+                        broker address (host:port)
+  -i IDLE_TIMEOUT, --idle-timeout IDLE_TIMEOUT
+                        close sessions idle for this many seconds
+
+Sessions are keyed by ssh://user@host:port and password, so a request
+with other credentials never gets the session of another user.
+Counters are kept by ssh://user@host:port.  A sample app uses the
+broker by importing the provider and services from this module instead
+of ydk:
+
+    from session_broker import CRUDService, NetconfServiceProvider
+
+When no broker is running, the same imports fall back to a direct
+NETCONF session.
+
+The broker exchanges pickled objects, so only clients holding its key
+may connect.  The broker generates a random key at startup and writes
+it to a file only readable by its user (~/.ydk_broker_key), where the
+sample apps of that user read it.  YDK_BROKER_AUTHKEY sets the key
+instead.
+"""
+
+from argparse import ArgumentParser
+from multiprocessing.managers import BaseManager
+from multiprocessing import AuthenticationError
+import binascii
+import collections
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+from ydk.services import CRUDService as _CRUDService
+from ydk.services import ExecutorService as _ExecutorService
+from ydk.providers import NetconfServiceProvider as _NetconfServiceProvider
+
+from samplelib import device_key, enable_logging, provider_args
+
+BROKER = os.environ.get("YDK_BROKER", "127.0.0.1:50830")
+KEY_FILE = os.environ.get("YDK_BROKER_KEY_FILE",
+                          os.path.expanduser("~/.ydk_broker_key"))
+
+logger = logging.getLogger("ydk.broker")
+
+
+def broker_address(broker):
+    """Return (host, port) tuple for broker string host:port."""
+    host, _, port = broker.rpartition(":")
+    return (host, int(port))
+
+
+def create_authkey(key_file=KEY_FILE):
+    """Return broker key, random unless set in YDK_BROKER_AUTHKEY.
+
+    A random key is written to key_file, readable by the user only.
+    """
+    if os.environ.get("YDK_BROKER_AUTHKEY"):
+        return os.environ["YDK_BROKER_AUTHKEY"].encode()
+    authkey = binascii.hexlify(os.urandom(32))
+    if os.path.exists(key_file):
+        os.remove(key_file)
+    descriptor = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                         0o600)
+    with os.fdopen(descriptor, "wb") as key:
+        key.write(authkey)
+    return authkey
+
+
+def read_authkey(key_file=KEY_FILE):
+    """Return broker key or None if no key is available."""
+    if os.environ.get("YDK_BROKER_AUTHKEY"):
+        return os.environ["YDK_BROKER_AUTHKEY"].encode()
+    try:
+        with open(key_file, "rb") as key:
+            return key.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def session_key(device):
+    """Return pool key of device: (ssh://user@host:port, password digest)."""
+    password = provider_args(device)["password"] or ""
+    return (device_key(device),
+            hashlib.sha256(password.encode("utf-8")).hexdigest())
+
+
+class SessionPool(object):
+    """Pool of NETCONF providers keyed by device and password."""
+
+    def __init__(self, idle_timeout=None):
+        self.idle_timeout = idle_timeout
+        self._providers = {}
+        self._locks = collections.defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._counters = collections.defaultdict(
+            lambda: dict(hits=0, misses=0, errors=0, setup_time=0.0))
+        self._crud = _CRUDService()
+        self._executor = _ExecutorService()
+
+    def _provider(self, device):
+        """Return warm provider for device, connecting on a miss."""
+        key = session_key(device)
+        provider = self._providers.get(key)
+        if provider is not None:
+            self._count(key, "hits")
+            return provider
+
+        self._count(key, "misses")
+        start = time.time()
+        provider = _NetconfServiceProvider(**provider_args(device))
+        self._count(key, "setup_time", time.time() - start)
+        with self._lock:
+            self._providers[key] = provider
+        logger.debug("new session %s (%.3fs)", key[0], time.time() - start)
+        return provider
+
+    def _count(self, key, name, value=1):
+        """Add value to counter name of device of key."""
+        # manager threads of several clients update the same counters
+        with self._lock:
+            self._counters[key[0]][name] += value
+
+    def _call(self, device, function, *args):
+        """Run function with warm provider for device."""
+        key = session_key(device)
+        with self._lock:
+            lock = self._locks[key]
+        # a NETCONF session serves one operation at a time
+        with lock:
+            provider = self._provider(device)
+            try:
+                return function(provider, *args)
+            except Exception:
+                # drop the session, it may no longer be usable
+                self._count(key, "errors")
+                self._close(key)
+                raise
+            finally:
+                with self._lock:
+                    self._last_used[key] = time.time()
+
+    def _close(self, key):
+        """Close provider for key if present."""
+        with self._lock:
+            provider = self._providers.pop(key, None)
+            self._last_used.pop(key, None)
+        if provider is not None:
+            try:
+                provider.close()
+            except Exception:
+                logger.debug("error closing session %s", key[0],
+                             exc_info=True)
+
+    def crud(self, device, operation, entity, *args):
+        """Run CRUD operation (create, read, update, delete) on device."""
+        return self._call(device, getattr(self._crud, operation), entity,
+                          *args)
+
+    def execute_rpc(self, device, rpc):
+        """Execute rpc on device."""
+        return self._call(device, self._executor.execute_rpc, rpc)
+
+    def expire(self):
+        """Close sessions idle for longer than idle timeout."""
+        if not self.idle_timeout:
+            return
+        now = time.time()
+        with self._lock:
+            last_used_keys = list(self._last_used.items())
+        for key, last_used in last_used_keys:
+            if now - last_used > self.idle_timeout:
+                with self._locks[key]:
+                    logger.debug("idle session %s", key[0])
+                    self._close(key)
+
+    def flush(self):
+        """Close all sessions."""
+        with self._lock:
+            keys = list(self._providers)
+        for key in keys:
+            with self._locks[key]:
+                self._close(key)
+
+    def stats(self):
+        """Return session counters per device."""
+        with self._lock:
+            open_keys = set(key for key, _ in self._providers)
+            stats = dict()
+            for key, counters in self._counters.items():
+                stats[key] = dict(counters, open=key in open_keys)
+        return stats
+
+
+class BrokerManager(BaseManager):
+    """Manager serving one SessionPool to the sample apps."""
+    pass
+
+
+BrokerManager.register("pool")
+
+
+def connect_broker(broker=BROKER):
+    """Return SessionPool proxy for broker or None if it is not running."""
+    authkey = read_authkey()
+    if authkey is None:
+        return None
+    manager = BrokerManager(address=broker_address(broker), authkey=authkey)
+    try:
+        manager.connect()
+    except (socket.error, EOFError):
+        return None
+    except AuthenticationError:
+        logger.warning("broker %s rejected the key, not using it", broker)
+        return None
+    return manager.pool()
+
+
+class BrokeredProvider(object):
+    """Provider that runs operations over a warm session in the broker."""
+
+    def __init__(self, pool, device):
+        self.pool = pool
+        self.device = device
+
+    def close(self):
+        """Leave session open in broker."""
+        pass
+
+
+def NetconfServiceProvider(address, port=None, username=None, password=None,
+                           protocol="ssh", broker=BROKER):
+    """Return brokered provider or direct provider if no broker runs."""
+    pool = connect_broker(broker)
+    if pool is None:
+        return _NetconfServiceProvider(address=address, port=port,
+                                       username=username, password=password,
+                                       protocol=protocol)
+    device = "{protocol}://{username}:{password}@{address}".format(
+        protocol=protocol, username=quote(username or "", safe=""),
+        password=quote(password or "", safe=""), address=address)
+    if port:
+        device += ":{port}".format(port=port)
+    return BrokeredProvider(pool, device)
+
+
+class CRUDService(_CRUDService):
+    """CRUD service that accepts brokered providers."""
+
+    def create(self, provider, entity):
+        if isinstance(provider, BrokeredProvider):
+            return provider.pool.crud(provider.device, "create", entity)
+        return super(CRUDService, self).create(provider, entity)
+
+    def read(self, provider, read_filter, only_config=False):
+        if isinstance(provider, BrokeredProvider):
+            return provider.pool.crud(provider.device, "read", read_filter,
+                                      only_config)
+        return super(CRUDService, self).read(provider, read_filter,
+                                             only_config)
+
+    def update(self, provider, entity):
+        if isinstance(provider, BrokeredProvider):
+            return provider.pool.crud(provider.device, "update", entity)
+        return super(CRUDService, self).update(provider, entity)
+
+    def delete(self, provider, entity):
+        if isinstance(provider, BrokeredProvider):
+            return provider.pool.crud(provider.device, "delete", entity)
+        return super(CRUDService, self).delete(provider, entity)
+
+
+class ExecutorService(_ExecutorService):
+    """Executor service that accepts brokered providers."""
+
+    def execute_rpc(self, provider, rpc):
+        if isinstance(provider, BrokeredProvider):
+            return provider.pool.execute_rpc(provider.device, rpc)
+        return super(ExecutorService, self).execute_rpc(provider, rpc)
+
+
+def serve(broker, idle_timeout):
+    """Run broker until interrupted."""
+    pool = SessionPool(idle_timeout)
+    BrokerManager.register("pool", callable=lambda: pool)
+    manager = BrokerManager(address=broker_address(broker),
+                            authkey=create_authkey())
+    server = manager.get_server()
+
+    def expire():
+        while True:
+            time.sleep(max(idle_timeout / 2.0, 1))
+            pool.expire()
+
+    if idle_timeout:
+        reaper = threading.Thread(target=expire)
+        reaper.daemon = True
+        reaper.start()
+    print("Broker listening on {}".format(broker))
+    try:
+        server.serve_forever()
+    finally:
+        pool.flush()
+
+
+def format_stats(stats):
+    """Return session counters as printable table."""
+    row = ("{key:<40} {open:<5} {hits:>7} {misses:>7} {errors:>7} "
+           "{setup:>9} {saved:>9}")
+    lines = [row.format(key="Session", open="Open", hits="Hits",
+                        misses="Misses", errors="Errors", setup="Setup(s)",
+                        saved="Saved(s)")]
+    for key in sorted(stats):
+        counters = stats[key]
+        # hits skip the handshake, estimate saving from mean setup time
+        mean_setup = counters["setup_time"] / max(counters["misses"], 1)
+        lines.append(row.format(key=key,
+                                open="Yes" if counters["open"] else "No",
+                                hits=counters["hits"],
+                                misses=counters["misses"],
+                                errors=counters["errors"],
+                                setup="{:.3f}".format(counters["setup_time"]),
+                                saved="{:.3f}".format(mean_setup *
+                                                      counters["hits"])))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-b", "--broker", default=BROKER,
+                        help="broker address (host:port)")
+    parser.add_argument("-i", "--idle-timeout", type=float, default=300,
+                        help="close sessions idle for this many seconds")
+    parser.add_argument("command", choices=["serve", "stats", "flush"],
+                        help="run broker, print session counters or close "
+                             "all sessions")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    if args.command == "serve":
+        serve(args.broker, args.idle_timeout)
+    else:
+        pool = connect_broker(args.broker)
+        if pool is None:
+            parser.exit(1, "no broker running on {}\n".format(args.broker))
+        if args.command == "stats":
+            print(format_stats(pool.stats()))
+        else:
+            pool.flush()
+    exit()
+# End of script
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark sample app startup with eager and lazy model imports.
+
+usage: startup_benchmark.py [-h] [-n RUNS] [-t TOP] [-a ARGS]
+                            [pattern [pattern ...]]
+
+positional arguments:
+  pattern               sample app file pattern (default: BGP, IS-IS and
+                        telemetry codec apps)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -n RUNS, --runs RUNS  runs per sample app and mode
+  -t TOP, --top TOP     slowest imports listed per sample app
+  -a ARGS, --args ARGS  sample app arguments (default: none)
+
+Each sample app is started RUNS times through lazy_models.py with eager
+imports (before) and with lazy model imports (after), and the median
+wall time of each mode is reported.  By default the codec apps encode
+their object, a full run without a device; pass -a -h to time an app
+that exits early.  One more run of each mode uses
+python -X importtime; its report gives the total import time, the share
+of the ydk.models modules and the slowest imports of the app.
+"""
+
+from argparse import ArgumentParser
+import collections
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+from samplelib import find_samples, percentile
+
+LAZY_MODELS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "lazy_models.py")
+DEFAULT_PATTERNS = ("cd-encode-xr-ipv4-bgp-cfg-40-ydk.py",
+                    "cd-encode-xr-clns-isis-cfg-20-ydk.py",
+                    "cd-encode-xr-telemetry-model-driven-cfg-20-ydk.py")
+
+Import = collections.namedtuple("Import", "module self_time cumulative")
+
+
+def command(sample, sample_args, eager, importtime=False):
+    """Return command line starting sample app."""
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    args.append(LAZY_MODELS)
+    if eager:
+        args.append("--eager")
+    return args + [sample] + sample_args
+
+
+def startup_time(args):
+    """Return seconds from start to exit of command."""
+    start = time.time()
+    subprocess.call(args, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL)
+    return time.time() - start
+
+
+def import_times(args):
+    """Return Imports parsed from python -X importtime report of command.
+
+    Times are in seconds.
+    """
+    process = subprocess.run(args, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # header line
+            continue
+        imports.append(Import(fields[2].strip(), int(fields[0]) / 1e6,
+                              int(fields[1]) / 1e6))
+    return imports
+
+
+def summary(imports):
+    """Return (total import seconds, ydk.models seconds, model modules)."""
+    models = [item for item in imports
+              if item.module.startswith("ydk.models.")]
+    return (sum(item.self_time for item in imports),
+            sum(item.self_time for item in models), len(models))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-n", "--runs", type=int, default=10,
+                        help="runs per sample app and mode")
+    parser.add_argument("-t", "--top", type=int, default=5,
+                        help="slowest imports listed per sample app")
+    parser.add_argument("-a", "--args", default="",
+                        help="sample app arguments (default: none)")
+    parser.add_argument("pattern", nargs="*",
+                        default=list(DEFAULT_PATTERNS),
+                        help="sample app file pattern (default: BGP, "
+                             "IS-IS and telemetry codec apps)")
+    args = parser.parse_args()
+
+    sample_args = shlex.split(args.args)
+    samples = [sample for pattern in args.pattern
+               for sample in find_samples(pattern) if sample.endswith(".py")]
+    medians = dict(eager=[], lazy=[])
+    for sample in samples:
+        print(os.path.basename(sample))
+        for mode in ("eager", "lazy"):
+            eager = mode == "eager"
+            median = percentile([
+                startup_time(command(sample, sample_args, eager))
+                for _ in range(args.runs)], 50)
+            medians[mode].append(median)
+            imports = import_times(command(sample, sample_args, eager,
+                                           importtime=True))
+            total, models, count = summary(imports)
+            print("  {:<5} median {:7.1f}ms, imports {:7.1f}ms "
+                  "(ydk.models {:.1f}ms in {} modules)".format(
+                      mode, median * 1e3, total * 1e3, models * 1e3, count))
+            if eager:
+                for item in sorted(imports, key=lambda item: item.self_time,
+                                   reverse=True)[:args.top]:
+                    print("        {:7.1f}ms {}".format(item.self_time * 1e3,
+                                                        item.module))
+
+    if samples:
+        eager, lazy = sum(medians["eager"]), sum(medians["lazy"])
+        print("Samples: {}, eager: {:.1f}ms, lazy: {:.1f}ms, "
+              "saved: {:.1%}".format(len(samples), eager * 1e3, lazy * 1e3,
+                                     1 - lazy / eager if eager else 0.0))
+    exit()
+# End of script
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Decode an XML payload into a YDK object while it is parsed.
+
+usage: streaming_decode.py [-h] [-v] [-q] payload
+
+positional arguments:
+  payload        XML file (e.g. a cd-encode .xml file or a saved
+                 <get-config> reply)
+
+optional arguments:
+  -h, --help     show this help message and exit
+  -v, --verbose  print debugging messages
+  -q, --quiet    print decode statistics instead of the encoded object
+
+The model class is found from the namespace of the top-level element
+(e.g. Cisco_IOS_XR_ipv4_bgp_cfg.Bgp).  Elements are read with iterparse
+and turned into YDK objects as they end, and each element is released
+once its object is built, so the XML tree is never held in memory.
+Leaf values are converted with the model meta information of YDK-Py;
+identityref values become objects of their identity class, found from
+the namespace of their prefix or the module of the base identity,
+decimal64 values become Decimal64 objects and bits values objects of
+the bits class of their leaf with the named bits set.
+"""
+
+from argparse import ArgumentParser
+import importlib
+import keyword
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from samplelib import enable_logging
+
+try:
+    from ydk.types import Decimal64, Empty
+except ImportError:
+    Decimal64 = Empty = None
+
+try:
+    from ydk._core._dm_meta_info import (REFERENCE_BITS, REFERENCE_CLASS,
+                                         REFERENCE_ENUM_CLASS,
+                                         REFERENCE_IDENTITY_CLASS,
+                                         REFERENCE_LEAFLIST, REFERENCE_LIST)
+except ImportError:
+    # no meta information, structure is found from the objects
+    REFERENCE_BITS, REFERENCE_CLASS = object(), object()
+    REFERENCE_ENUM_CLASS, REFERENCE_IDENTITY_CLASS = object(), object()
+    REFERENCE_LEAFLIST, REFERENCE_LIST = object(), object()
+
+RPC_REPLY_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+_meta_members = dict()
+
+
+def split_tag(tag):
+    """Return (namespace, local name) of element tag."""
+    if tag.startswith("{"):
+        namespace, name = tag[1:].split("}", 1)
+        return namespace, name
+    return None, tag
+
+
+def attribute_name(name):
+    """Return Python attribute name for YANG node name."""
+    name = re.sub(r"[-.]", "_", name)
+    return name + "_" if keyword.iskeyword(name) else name
+
+
+def class_name(name):
+    """Return YDK class name for YANG node name (peer-vrf -> PeerVrf)."""
+    return "".join(part[:1].upper() + part[1:]
+                   for part in re.split(r"[-._]", name))
+
+
+def model_module(namespace):
+    """Return YDK model module of namespace or YANG module name."""
+    module = namespace.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    if module.startswith("Cisco-IOS-XR-"):
+        package = "ydk.models.cisco_ios_xr"
+    elif module.startswith("openconfig-"):
+        package = "ydk.models.openconfig"
+    elif namespace.startswith("http://openconfig.net/"):
+        package = "ydk.models.openconfig"
+        module = "openconfig-" + module
+    else:
+        package = "ydk.models.ietf"
+    return importlib.import_module("{}.{}".format(
+        package, module.replace("-", "_")))
+
+
+def model_class(namespace, name):
+    """Return YDK class of top-level element in namespace."""
+    return getattr(model_module(namespace), class_name(name))
+
+
+def identity_class_names(name):
+    """Return candidate YDK class names of identity name.
+
+    IPV4-UNICAST gives Ipv4UnicastIdentity.
+    """
+    return ["".join(part[:1].upper() + part[1:].lower()
+                    for part in re.split(pattern, name)) + "Identity"
+            for pattern in (r"[-.]", r"[-._]")]
+
+
+def identity_value(member, text, namespaces):
+    """Return identity object of identityref text (prefix:name)."""
+    prefix, _, name = text.rpartition(":")
+    modules = []
+    if prefix and prefix in namespaces:
+        try:
+            modules.append(model_module(namespaces[prefix]))
+        except ImportError:
+            pass
+    # the base identity is often defined with the derived ones
+    modules.append(importlib.import_module(member.pmodule_name))
+    for module in modules:
+        for candidate in identity_class_names(name):
+            identity = getattr(module, candidate, None)
+            if isinstance(identity, type):
+                return identity()
+    raise ValueError("unknown identity {}".format(text))
+
+
+def member_class(member):
+    """Return YDK class of meta member (container, list or bits class)."""
+    value = importlib.import_module(member.pmodule_name)
+    for name in member.clazz_name.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def bits_value(member, text):
+    """Return bits object of meta member with the bits named in text set."""
+    bits = member_class(member)()
+    for name in text.split():
+        bits[name] = True
+    return bits
+
+
+def meta_members(entity):
+    """Return {YANG name: meta member} of YDK class (empty if unknown)."""
+    entity_class = type(entity)
+    if entity_class not in _meta_members:
+        members = dict()
+        try:
+            meta = entity._meta_info()
+            for member in meta.meta_info_class_members:
+                members[member.name] = member
+        except Exception:
+            pass
+        _meta_members[entity_class] = members
+    return _meta_members[entity_class]
+
+
+def leaf_value(member, text, namespaces=None):
+    """Return Python value of leaf text for meta member.
+
+    namespaces maps prefixes to namespaces for identityref values.
+    """
+    text = (text or "").strip()
+    if member is None:
+        return Empty() if not text and Empty is not None else text
+    ptype = getattr(member, "ptype", None)
+    if member.mtype == REFERENCE_IDENTITY_CLASS:
+        return identity_value(member, text, namespaces or {})
+    if member.mtype == REFERENCE_ENUM_CLASS:
+        module = importlib.import_module(member.pmodule_name)
+        enum = getattr(module, ptype)
+        return getattr(enum, attribute_name(text))
+    if member.mtype == REFERENCE_BITS:
+        return bits_value(member, text)
+    if ptype in ("int", "long"):
+        return int(text)
+    if ptype == "bool":
+        return text == "true"
+    if ptype == "Empty" and Empty is not None:
+        return Empty()
+    if ptype == "Decimal64" and Decimal64 is not None:
+        return Decimal64(text)
+    return text
+
+
+class Frame(object):
+    """Object being built for an open element."""
+
+    __slots__ = ("entity", "kind", "member", "attribute")
+
+    def __init__(self, entity, kind, member=None, attribute=None):
+        self.entity = entity
+        self.kind = kind
+        self.member = member
+        self.attribute = attribute
+
+
+class StreamingDecoder(object):
+    """Build a YDK object from XML elements as they are parsed.
+
+    entry_callback(path, entry) is called with each completed list
+    entry.  If it returns True the entry is not added to its list, so
+    large lists can be processed without keeping them in memory.
+    """
+
+    def __init__(self, entry_callback=None):
+        self.entry_callback = entry_callback
+        self.counters = dict(containers=0, entries=0, leaves=0)
+        self.namespaces = dict()
+
+    def decode(self, source):
+        """Return first YDK object in XML file name or file object."""
+        return self.decode_events(ET.iterparse(source, ("start", "end",
+                                                        "start-ns")))
+
+    def decode_events(self, events):
+        """Return first YDK object for (event, element) start/end pairs.
+
+        start-ns events record the prefixes of identityref values.
+        """
+        frames = []
+        elements = []
+        root = None
+        for event, element in events:
+            if event == "start-ns":
+                prefix, namespace = element
+                self.namespaces[prefix] = namespace
+            elif event == "start":
+                namespace, name = split_tag(element.tag)
+                if not frames:
+                    if namespace in (RPC_REPLY_NS, None):
+                        # skip <rpc-reply>, <data> and <config> wrappers
+                        continue
+                    if root is None:
+                        root = model_class(namespace, name)()
+                        frames.append(Frame(root, "container"))
+                    else:
+                        # only the first top-level object is decoded
+                        frames.append(Frame(None, "ignore"))
+                else:
+                    frames.append(self._start(frames[-1], name))
+                elements.append(element)
+            elif elements and elements[-1] is element:
+                frame = frames.pop()
+                elements.pop()
+                self._end(frame, element, frames[-1] if frames else None)
+                # release parsed subtree
+                element.clear()
+                if elements:
+                    elements[-1].remove(element)
+        if root is None:
+            raise ValueError("no model data in payload")
+        return root
+
+    def _start(self, parent, name):
+        if parent.kind != "container" and parent.kind != "entry":
+            return Frame(None, "ignore")
+        entity = parent.entity
+        attribute = attribute_name(name)
+        member = meta_members(entity).get(name)
+        value = getattr(entity, attribute, None)
+        nested = getattr(type(entity), class_name(name), None)
+        if member is not None:
+            kind = {REFERENCE_CLASS: "container",
+                    REFERENCE_LIST: "entry",
+                    REFERENCE_LEAFLIST: "leaf-list"}.get(member.mtype, "leaf")
+        elif isinstance(value, list):
+            kind = "entry" if nested is not None else "leaf-list"
+        elif value is not None and hasattr(value, "parent"):
+            kind = "container"
+        else:
+            kind = "container" if isinstance(nested, type) else "leaf"
+
+        if kind == "container":
+            child = value
+            if child is None:
+                # presence container
+                child = nested()
+                child.parent = entity
+                setattr(entity, attribute, child)
+            self.counters["containers"] += 1
+            return Frame(child, kind, member, attribute)
+        if kind == "entry":
+            child = nested()
+            child.parent = entity
+            return Frame(child, kind, member, attribute)
+        return Frame(entity, kind, member, attribute)
+
+    def _end(self, frame, element, parent):
+        if frame.kind == "leaf":
+            setattr(frame.entity, frame.attribute,
+                    leaf_value(frame.member, element.text, self.namespaces))
+            self.counters["leaves"] += 1
+        elif frame.kind == "leaf-list":
+            getattr(frame.entity, frame.attribute).append(
+                leaf_value(frame.member, element.text, self.namespaces))
+            self.counters["leaves"] += 1
+        elif frame.kind == "entry":
+            self.counters["entries"] += 1
+            if (self.entry_callback is not None and
+                    self.entry_callback(element.tag, frame.entity)):
+                return
+            getattr(parent.entity, frame.attribute).append(frame.entity)
+
+
+def decode(source, entry_callback=None):
+    """Return YDK object decoded from XML file name or file object."""
+    return StreamingDecoder(entry_callback).decode(source)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print decode statistics instead of the "
+                             "encoded object")
+    parser.add_argument("payload",
+                        help="XML file (e.g. a cd-encode .xml file or a "
+                             "saved <get-config> reply)")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    decoder = StreamingDecoder()
+    start = time.time()
+    try:
+        entity = decoder.decode(args.payload)
+    except (ET.ParseError, ValueError, ImportError, AttributeError) as error:
+        print("Decode failed: {}".format(error))
+        sys.exit(1)
+    elapsed = time.time() - start
+
+    if args.quiet:
+        print("Decoded {} in {:.3f}s ({containers} containers, {entries} "
+              "list entries, {leaves} leaves)".format(
+                  type(entity).__name__, elapsed, **decoder.counters))
+    else:
+        # create codec provider
+        provider = CodecServiceProvider(type="xml")
+
+        # create codec service
+        codec = CodecService()
+
+        # encode and print object
+        print(codec.encode(provider, entity))
+
+        provider.close()
+    exit()
+# End of script
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Make devices log syslog messages with LogmsgRpc at a target rate.
+
+usage: syslog_load.py [-h] [-v] [-r RATE] [-d DURATION] [-b BURST]
+                      [-s SESSIONS] [-e SEVERITIES] [-z SIZES] [-f FAILED]
+                      inventory
+
+positional arguments:
+  inventory             file with one NETCONF device URL per line
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -r RATE, --rate RATE  target messages per second (all devices)
+  -d DURATION, --duration DURATION
+                        seconds to send messages
+  -b BURST, --burst BURST
+                        messages sent at once after an idle period
+  -s SESSIONS, --sessions SESSIONS
+                        NETCONF sessions per device
+  -e SEVERITIES, --severities SEVERITIES
+                        severity distribution (default: info=80,warning=15,
+                        error=4,critical=1)
+  -z SIZES, --sizes SIZES
+                        message size distribution in bytes (default:
+                        80=60,256=30,1024=10)
+  -f FAILED, --failed FAILED
+                        write sequence numbers of failed sends to file
+
+Every session has one worker, which takes a token from a token bucket
+shared by all devices (see trap_storm.py), picks a severity and a
+message size by weight and sends a LogmsgRpc (as built by the
+nc-execute-xr-syslog-act apps) with ExecutorService.execute_rpc.  The
+message starts with
+
+    ydkload run=<run ID> seq=<sequence number> ts=<send time>
+
+and is padded to its size (sizes shorter than this tag are rejected),
+so syslog_sink.py can measure delivery latency and loss at the
+collector.  A sequence number is used once, by one send.  Sends whose
+RPC failed are reported separately and their sequence numbers can be
+written to a file, which syslog_sink.py excludes from the loss count.
+"""
+
+from argparse import ArgumentParser
+import collections
+import itertools
+import threading
+import time
+import uuid
+
+from ydk.services import ExecutorService
+from ydk.providers import NetconfServiceProvider
+from ydk.models.cisco_ios_xr import Cisco_IOS_XR_syslog_act \
+    as xr_syslog_act
+from ydk.models.ietf import ietf_syslog_types
+
+from fanout_read import read_inventory
+from samplelib import (WeightedChoice, device_key, enable_logging,
+                       parse_weights, percentile, provider_args)
+from syslog_sink import MESSAGE
+from trap_storm import TokenBucket
+
+
+def parse_distribution(text, value_type=str):
+    """Return [(value, weight)] for VALUE=WEIGHT,... text."""
+    return parse_weights(text.split(","), value_type)
+
+
+def severity_enum(name):
+    """Return SeverityEnum member of severity name (e.g. warning)."""
+    try:
+        return getattr(ietf_syslog_types.SeverityEnum, name)
+    except AttributeError:
+        raise ValueError("unknown severity {}".format(name))
+
+
+def tag_length(seq):
+    """Return length of the message tag with sequence number seq."""
+    # run IDs have 8 characters
+    return len(MESSAGE.format(run="0" * 8, seq=seq, ts=time.time()))
+
+
+def message_text(run, seq, size):
+    """Return tagged message padded to size characters.
+
+    The message is longer than size if the tag is (see tag_length).
+    """
+    text = MESSAGE.format(run=run, seq=seq, ts=time.time())
+    return text + "x" * (size - len(text))
+
+
+class SyslogLoad(object):
+    """Send tagged LogmsgRpc messages to devices at a paced rate."""
+
+    def __init__(self, devices, severities, sizes, rate, burst=10,
+                 sessions=1):
+        self.devices = devices
+        self.severities = severities
+        self.sizes = sizes
+        self.sessions = sessions
+        self.bucket = TokenBucket(rate, burst)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.latencies = []
+        self.sent = collections.Counter()
+        self.errors = collections.Counter()
+        self.failed = []
+        self.sequences = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _worker(self, device, deadline):
+        try:
+            provider = NetconfServiceProvider(**provider_args(device))
+        except Exception as error:
+            with self._lock:
+                self.errors["{} {}".format(device_key(device),
+                                           type(error).__name__)] += 1
+            return
+        executor = ExecutorService()
+        try:
+            while self.bucket.take(deadline):
+                with self._lock:
+                    seq = next(self._seq)
+                    self.sequences += 1
+                    severity = self.severities.choose()
+                    size = self.sizes.choose()
+                logmsg_rpc = xr_syslog_act.LogmsgRpc()
+                logmsg_rpc.input.severity = severity_enum(severity)
+                logmsg_rpc.input.message = message_text(self.run_id, seq,
+                                                        size)
+                start = time.time()
+                try:
+                    executor.execute_rpc(provider, logmsg_rpc)
+                    error = None
+                except Exception as exc:
+                    error = type(exc).__name__
+                elapsed = time.time() - start
+                with self._lock:
+                    if error:
+                        self.failed.append(seq)
+                        self.errors["{} {}".format(device_key(device),
+                                                   error)] += 1
+                    else:
+                        self.latencies.append(elapsed)
+                        self.sent[severity] += 1
+        finally:
+            provider.close()
+
+    def run(self, duration):
+        """Send messages for duration seconds, return elapsed seconds."""
+        deadline = time.monotonic() + duration
+        workers = [threading.Thread(target=self._worker,
+                                    args=(device, deadline))
+                   for device in self.devices
+                   for _ in range(self.sessions)]
+        start = time.time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return time.time() - start
+
+    def format_report(self, rate, elapsed):
+        """Return run ID, rate, RPC latency and error summary."""
+        sent = sum(self.sent.values())
+        achieved = sent / elapsed if elapsed else 0.0
+        values = self.latencies
+        lines = ["Run {}: {} messages sent, {} failed, {:.3f}s".format(
+                     self.run_id, sent, len(self.failed), elapsed),
+                 "Sequence numbers: {} (0-{}), {} of failed sends".format(
+                     self.sequences, self.sequences - 1, len(self.failed)),
+                 "Rate: {:.1f}/s, target {:.1f}/s ({:.0f}%)".format(
+                     achieved, rate, 100.0 * achieved / rate if rate
+                     else 0.0),
+                 "RPC latency: p50 {:.4f}s, p99 {:.4f}s".format(
+                     percentile(values, 50), percentile(values, 99)),
+                 "Severities: " + ", ".join(
+                     "{} {}".format(name, count)
+                     for name, count in self.sent.most_common())]
+        for error, count in self.errors.most_common():
+            lines.append("  error {:<46} {:>8}".format(error, count))
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-r", "--rate", type=float, default=50,
+                        help="target messages per second (all devices)")
+    parser.add_argument("-d", "--duration", type=float, default=60,
+                        help="seconds to send messages")
+    parser.add_argument("-b", "--burst", type=int, default=10,
+                        help="messages sent at once after an idle period")
+    parser.add_argument("-s", "--sessions", type=int, default=1,
+                        help="NETCONF sessions per device")
+    parser.add_argument("-e", "--severities",
+                        default="info=80,warning=15,error=4,critical=1",
+                        help="severity distribution (default: info=80,"
+                             "warning=15,error=4,critical=1)")
+    parser.add_argument("-z", "--sizes", default="80=60,256=30,1024=10",
+                        help="message size distribution in bytes (default: "
+                             "80=60,256=30,1024=10)")
+    parser.add_argument("-f", "--failed",
+                        help="write sequence numbers of failed sends to "
+                             "file")
+    parser.add_argument("inventory",
+                        help="file with one NETCONF device URL per line")
+    args = parser.parse_args()
+
+    # log debug messages if verbose argument specified
+    enable_logging(args.verbose)
+
+    try:
+        severities = parse_distribution(args.severities)
+        for name, _ in severities:
+            severity_enum(name)
+        sizes = parse_distribution(args.sizes, int)
+    except ValueError as error:
+        parser.error(str(error))
+    # the tag grows with the sequence numbers
+    min_size = tag_length(int(args.rate * args.duration) + args.burst)
+    if min(size for size, _ in sizes) < min_size:
+        parser.error("message sizes must be at least {} bytes, the length "
+                     "of the message tag".format(min_size))
+
+    load = SyslogLoad(read_inventory(args.inventory),
+                      WeightedChoice(severities), WeightedChoice(sizes),
+                      args.rate, args.burst, args.sessions)
+    print("Run {}: {} devices, {:.1f} messages/s for {:g}s".format(
+        load.run_id, len(load.devices), args.rate, args.duration))
+    elapsed = load.run(args.duration)
+    print(load.format_report(args.rate, elapsed))
+    if args.failed:
+        with open(args.failed, "w") as failed:
+            failed.writelines("{}\n".format(seq)
+                              for seq in sorted(load.failed))
+    exit()
+# End of script
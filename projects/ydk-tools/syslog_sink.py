@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Receive syslog messages of syslog_load.py and measure latency and loss.
+
+usage: syslog_sink.py [-h] [-a ADDRESS] [-p PORT] [-r RUN] [-e EXPECTED]
+                      [-f FAILED] [-d DURATION] [-i IDLE] [-o OUTPUT]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -a ADDRESS, --address ADDRESS
+                        listen address (default: 0.0.0.0)
+  -p PORT, --port PORT  UDP listen port (default: 5514)
+  -r RUN, --run RUN     count messages of this run only
+  -e EXPECTED, --expected EXPECTED
+                        sequence numbers used in the run (count loss at the
+                        end of the run)
+  -f FAILED, --failed FAILED
+                        file with sequence numbers of failed sends (not
+                        counted as lost)
+  -d DURATION, --duration DURATION
+                        stop after this many seconds
+  -i IDLE, --idle IDLE  stop when no message arrived for this many seconds
+                        after the first one
+  -o OUTPUT, --output OUTPUT
+                        write received messages to CSV file
+
+Configure the devices to log to this host (logging <host> vrf default
+port 5514).  Every message of syslog_load.py carries its run ID,
+sequence number and send timestamp; the delivery latency is the time
+from the LogmsgRpc being sent to the message arriving here, so run the
+sink on the generator host or one with a synchronized clock.  Loss
+counts the sequence numbers missing up to the highest one received (or
+up to EXPECTED), except those of sends whose RPC failed (FAILED, as
+written by syslog_load.py -f).
+"""
+
+from argparse import ArgumentParser
+import collections
+import csv
+import re
+import socket
+import time
+
+from samplelib import percentile
+
+# message text of syslog_load.py, found anywhere in a syslog message
+MESSAGE = "ydkload run={run} seq={seq} ts={ts:.6f} "
+MESSAGE_PATTERN = re.compile(r"ydkload run=(\w+) seq=(\d+) ts=([\d.]+)")
+PRI_PATTERN = re.compile(r"^<(\d{1,3})>")
+
+# RFC 5424 severity names by value
+SEVERITIES = ("emergency", "alert", "critical", "error", "warning",
+              "notice", "info", "debug")
+
+
+class RunStats(object):
+    """Messages received for one load generator run."""
+
+    def __init__(self, run):
+        self.run = run
+        self.sequences = set()
+        self.duplicates = 0
+        self.reordered = 0
+        self.highest = -1
+        self.latencies = []
+        self.severities = collections.Counter()
+        self.sources = collections.Counter()
+
+    def add(self, seq, latency, severity, source):
+        if seq in self.sequences:
+            self.duplicates += 1
+            return
+        if seq < self.highest:
+            self.reordered += 1
+        self.highest = max(self.highest, seq)
+        self.sequences.add(seq)
+        self.latencies.append(latency)
+        self.severities[severity] += 1
+        self.sources[source] += 1
+
+    def lost(self, expected=None, failed=()):
+        """Return number of sequence numbers not received.
+
+        Sequence numbers in failed were never sent and are not lost.
+        """
+        sent = expected if expected is not None else self.highest + 1
+        not_sent = len([seq for seq in set(failed)
+                        if seq < sent and seq not in self.sequences])
+        return max(0, sent - len(self.sequences) - not_sent)
+
+    def format(self, expected=None, failed=()):
+        """Return summary lines of run."""
+        received = len(self.sequences)
+        lost = self.lost(expected, failed)
+        total = received + lost
+        values = self.latencies
+        lines = ["Run {}: {} received, {} lost ({:.2f}%), {} duplicates, "
+                 "{} out of order".format(
+                     self.run, received, lost,
+                     100.0 * lost / total if total else 0.0,
+                     self.duplicates, self.reordered),
+                 "Latency: p50 {:.4f}s, p90 {:.4f}s, p99 {:.4f}s, "
+                 "max {:.4f}s".format(percentile(values, 50),
+                                      percentile(values, 90),
+                                      percentile(values, 99),
+                                      max(values) if values
+                                      else float("nan"))]
+        lines.append("Severities: " + ", ".join(
+            "{} {}".format(name, count)
+            for name, count in self.severities.most_common()))
+        lines.append("Sources: " + ", ".join(
+            "{} {}".format(source, count)
+            for source, count in self.sources.most_common()))
+        return lines
+
+
+def parse_message(data):
+    """Return (run, seq, send time, severity) of message or None."""
+    text = data.decode("utf-8", "replace")
+    match = MESSAGE_PATTERN.search(text)
+    if match is None:
+        return None
+    severity = "-"
+    pri = PRI_PATTERN.match(text)
+    if pri is not None:
+        severity = SEVERITIES[int(pri.group(1)) % 8]
+    return match.group(1), int(match.group(2)), float(match.group(3)), \
+        severity
+
+
+def receive(listener, runs, run=None, duration=None, idle=None,
+            writer=None):
+    """Receive messages into {run: RunStats} until duration or idle."""
+    listener.settimeout(0.5)
+    start = time.time()
+    last = None
+    while True:
+        now = time.time()
+        if duration is not None and now - start > duration:
+            return
+        if idle is not None and last is not None and now - last > idle:
+            return
+        try:
+            data, (source, _) = listener.recvfrom(65536)
+        except socket.timeout:
+            continue
+        received = time.time()
+        message = parse_message(data)
+        if message is None:
+            continue
+        message_run, seq, sent, severity = message
+        if run is not None and message_run != run:
+            continue
+        last = received
+        if message_run not in runs:
+            runs[message_run] = RunStats(message_run)
+        runs[message_run].add(seq, received - sent, severity, source)
+        if writer is not None:
+            writer.writerow((message_run, seq, source, severity,
+                             "{:.6f}".format(sent),
+                             "{:.6f}".format(received)))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-a", "--address", default="0.0.0.0",
+                        help="listen address (default: 0.0.0.0)")
+    parser.add_argument("-p", "--port", type=int, default=5514,
+                        help="UDP listen port (default: 5514)")
+    parser.add_argument("-r", "--run",
+                        help="count messages of this run only")
+    parser.add_argument("-e", "--expected", type=int,
+                        help="sequence numbers used in the run (count loss "
+                             "at the end of the run)")
+    parser.add_argument("-f", "--failed",
+                        help="file with sequence numbers of failed sends "
+                             "(not counted as lost)")
+    parser.add_argument("-d", "--duration", type=float,
+                        help="stop after this many seconds")
+    parser.add_argument("-i", "--idle", type=float,
+                        help="stop when no message arrived for this many "
+                             "seconds after the first one")
+    parser.add_argument("-o", "--output",
+                        help="write received messages to CSV file")
+    args = parser.parse_args()
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # bursts of messages must not overflow the default socket buffer
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 ** 2)
+    listener.bind((args.address, args.port))
+    print("Listening on {}:{}/udp".format(args.address, args.port))
+
+    runs = collections.OrderedDict()
+    output = open(args.output, "w") if args.output else None
+    try:
+        writer = None
+        if output is not None:
+            writer = csv.writer(output)
+            writer.writerow(("run", "seq", "source", "severity", "sent",
+                             "received"))
+        receive(listener, runs, args.run, args.duration, args.idle, writer)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not None:
+            output.close()
+        listener.close()
+
+    failed = []
+    if args.failed:
+        with open(args.failed) as failed_file:
+            failed = [int(line) for line in failed_file if line.strip()]
+    for stats in runs.values():
+        single = args.run or len(runs) == 1
+        print("\n".join(stats.format(args.expected if single else None,
+                                     failed if single else ())))
+    if not runs:
+        print("No messages received")
+    exit()
+# End of script
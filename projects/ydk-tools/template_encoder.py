@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode rows of leaf values with a template compiled from a codec file.
+
+usage: template_encoder.py [-h] [-l] [-r] [-c] [-b] [-q] [-o OUTPUT]
+                           golden [rows]
+
+positional arguments:
+  golden                codec sample .xml file (or its .py app)
+  rows                  CSV file, one column per varying leaf
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -l, --leaves          print the leaf paths of the template and exit
+  -r, --repeat          encode all rows as entries of one list
+  -c, --check           decode each payload and compare it with the
+                        CodecService encoding of the decoded object
+  -b, --benchmark       compare throughput with the config_* function of
+                        the sample app and CodecService
+  -q, --quiet           print throughput only
+  -o OUTPUT, --output OUTPUT
+                        write payloads to file
+
+The .xml file of a codec sample app is the payload CodecService
+produces for the app.  Its leaves become template slots, and the text
+between the slots is kept as is.  A CSV column fills every leaf whose
+path ends with the column name (e.g. vrf-name or four-byte-as/as); the
+other leaves keep the values of the file.  Each row gives one payload,
+or with --repeat one entry of the innermost list holding all columns.
+Filling a template joins strings only, no YDK objects are built.
+"""
+
+from argparse import ArgumentParser
+import csv
+import io
+import sys
+import time
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+from ydk.services import CodecService
+from ydk.providers import CodecServiceProvider
+
+from codec_golden import canonicalize
+from samplelib import load_sample, sample_class, sample_function
+from streaming_decode import decode
+
+
+class Node(object):
+    """Element of a template document with its byte offsets."""
+
+    __slots__ = ("name", "path", "parent", "children", "start",
+                 "content_start", "content_end", "end")
+
+    def __init__(self, name, path, parent, start):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.children = []
+        self.start = start
+        self.content_start = self.content_end = self.end = None
+
+    def is_leaf(self):
+        return not self.children
+
+    def is_list_entry(self):
+        """Return True if element looks like a list entry (no schema)."""
+        if self.parent is None:
+            return False
+        if self.parent.name in (self.name + "s", self.name + "es",
+                                self.name[:-1] + "ies"):
+            return True
+        return len([child for child in self.parent.children
+                    if child.name == self.name]) > 1
+
+
+def parse_nodes(document):
+    """Return root Node of XML document (bytes) with element offsets."""
+    parser = expat.ParserCreate()
+    stack = []
+    nodes = []
+
+    def start(tag, attributes):
+        name = tag.rsplit(":", 1)[-1]
+        parent = stack[-1] if stack else None
+        path = parent.path + "/" + name if parent else name
+        node = Node(name, path, parent, parser.CurrentByteIndex)
+        node.content_start = document.index(b">", node.start) + 1
+        if parent is not None:
+            parent.children.append(node)
+        stack.append(node)
+        nodes.append(node)
+
+    def end(tag):
+        node = stack.pop()
+        index = parser.CurrentByteIndex
+        if document[node.content_start - 2:node.content_start] == b"/>":
+            # empty element tag
+            node.content_end = node.end = node.content_start
+        else:
+            node.content_end = index
+            node.end = document.index(b">", index) + 1
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.Parse(document, True)
+    return nodes[0]
+
+
+def walk(node):
+    yield node
+    for child in node.children:
+        for descendant in walk(child):
+            yield descendant
+
+
+def leaves(root):
+    """Return leaf Nodes of document with text, in document order."""
+    return [node for node in walk(root)
+            if node.is_leaf() and node.content_end > node.content_start]
+
+
+def matches(path, column):
+    return path == column or path.endswith("/" + column)
+
+
+class Template(object):
+    """Payload template compiled from a codec .xml file.
+
+    fill(row) returns the payload for a dict of column values and
+    fill_all(rows) the payload of all rows as entries of one list.
+    """
+
+    def __init__(self, golden, columns):
+        with open(golden, "rb") as payload:
+            document = payload.read().strip()
+        root = parse_nodes(document)
+        self.columns = list(columns)
+        slots = []
+        for node in leaves(root):
+            for index, column in enumerate(self.columns):
+                if matches(node.path, column):
+                    slots.append((node, index))
+                    break
+        for column in self.columns:
+            if not any(self.columns[index] == column for _, index in slots):
+                raise ValueError("no leaf matches column {}".format(column))
+
+        self._root = root
+        self._document = document
+        self._fragments, self._indexes = self._compile(
+            0, len(document), slots)
+        self.entry = self._entry(slots)
+        if self.entry is not None:
+            self._entry_fragments, self._entry_indexes = self._compile(
+                self.entry.start, self.entry.end, slots)
+
+    def _compile(self, start, end, slots):
+        """Return (text fragments, column indexes) of document[start:end]."""
+        fragments = []
+        indexes = []
+        position = start
+        for node, index in slots:
+            if node.start < start or node.end > end:
+                continue
+            fragments.append(self._document[position:node.content_start]
+                             .decode("utf-8"))
+            indexes.append(index)
+            position = node.content_end
+        fragments.append(self._document[position:end].decode("utf-8"))
+        return fragments, indexes
+
+    def _entry(self, slots):
+        """Return innermost list entry Node holding all slots or None."""
+        if not slots:
+            return None
+        ancestor = slots[0][0].parent
+        while ancestor is not None:
+            if (all(ancestor.start <= node.start and node.end <= ancestor.end
+                    for node, _ in slots) and ancestor.is_list_entry()):
+                return ancestor
+            ancestor = ancestor.parent
+        return None
+
+    def leaf_paths(self):
+        return [node.path for node in leaves(self._root)]
+
+    def fill(self, row):
+        """Return payload with column values of row (dict or sequence)."""
+        return self._join(self._fragments, self._indexes, row)
+
+    def fill_all(self, rows):
+        """Return one payload with one list entry per row."""
+        if self.entry is None:
+            raise ValueError("columns are not inside one list entry")
+        line_start = self._document.rfind(b"\n", 0, self.entry.start) + 1
+        separator = "\n" + self._document[line_start:self.entry.start] \
+            .decode("utf-8")
+        return (self._document[:self.entry.start].decode("utf-8") +
+                separator.join(self._join(self._entry_fragments,
+                                          self._entry_indexes, row)
+                               for row in rows) +
+                self._document[self.entry.end:].decode("utf-8"))
+
+    def _join(self, fragments, indexes, row):
+        if isinstance(row, dict):
+            row = [row[column] for column in self.columns]
+        parts = [None] * (2 * len(indexes) + 1)
+        parts[::2] = fragments
+        parts[1::2] = [escape(str(row[index])) for index in indexes]
+        return "".join(parts)
+
+
+def read_rows(path):
+    """Return (columns, rows) of CSV file."""
+    with open(path) as rows:
+        reader = csv.reader(rows)
+        columns = next(reader)
+        return columns, [row for row in reader if row]
+
+
+def check(payload, codec, provider):
+    """Return None if payload decodes and encodes back unchanged, or the
+    reason it does not."""
+    try:
+        encoded = codec.encode(provider, decode(io.BytesIO(
+            payload.encode("utf-8"))))
+    except Exception as error:
+        return "{}: {}".format(type(error).__name__, error)
+    if canonicalize(encoded) != canonicalize(payload):
+        return "payload differs from CodecService encoding"
+    return None
+
+
+def sample_rate(sample, count):
+    """Return rows per second of config_* function and CodecService."""
+    module = load_sample(sample)
+    entity_class = sample_class(module)
+    config = sample_function(module, "config_")
+    codec = CodecService()
+    provider = CodecServiceProvider(type="xml")
+    start = time.time()
+    for _ in range(count):
+        entity = entity_class()
+        config(entity)
+        codec.encode(provider, entity)
+    elapsed = time.time() - start
+    provider.close()
+    return count / elapsed if elapsed else float("inf")
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-l", "--leaves", action="store_true",
+                        help="print the leaf paths of the template and exit")
+    parser.add_argument("-r", "--repeat", action="store_true",
+                        help="encode all rows as entries of one list")
+    parser.add_argument("-c", "--check", action="store_true",
+                        help="decode each payload and compare it with the "
+                             "CodecService encoding of the decoded object")
+    parser.add_argument("-b", "--benchmark", action="store_true",
+                        help="compare throughput with the config_* function "
+                             "of the sample app and CodecService")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print throughput only")
+    parser.add_argument("-o", "--output",
+                        help="write payloads to file")
+    parser.add_argument("golden",
+                        help="codec sample .xml file (or its .py app)")
+    parser.add_argument("rows", nargs="?",
+                        help="CSV file, one column per varying leaf")
+    args = parser.parse_args()
+
+    golden = args.golden[:-3] + ".xml" if args.golden.endswith(".py") \
+        else args.golden
+    if args.leaves or not args.rows:
+        for path in Template(golden, []).leaf_paths():
+            print(path)
+        exit()
+
+    columns, rows = read_rows(args.rows)
+    try:
+        template = Template(golden, columns)
+        start = time.time()
+        if args.repeat:
+            payloads = [template.fill_all(rows)]
+        else:
+            payloads = [template.fill(row) for row in rows]
+        elapsed = time.time() - start
+    except (ValueError, IndexError) as error:
+        print("Template failed: {}".format(error))
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write("\n".join(payloads) + "\n")
+    elif not args.quiet:
+        print("\n".join(payloads))
+
+    rate = len(rows) / elapsed if elapsed else float("inf")
+    print("Rows: {}, payloads: {}, {:.3f}s ({:.0f} rows/s)".format(
+        len(rows), len(payloads), elapsed, rate), file=sys.stderr)
+    if args.benchmark:
+        sample = golden[:-4] + ".py"
+        baseline = sample_rate(sample, min(len(rows), 1000))
+        print("Sample app and CodecService: {:.0f} rows/s (template {:.1f}x)"
+              .format(baseline, rate / baseline), file=sys.stderr)
+    if args.check:
+        codec = CodecService()
+        provider = CodecServiceProvider(type="xml")
+        failed = 0
+        for number, payload in enumerate(payloads, 1):
+            error = check(payload, codec, provider)
+            if error is not None:
+                failed += 1
+                print("Payload {}: {}".format(number, error),
+                      file=sys.stderr)
+        provider.close()
+        print("Checked: {}, failed: {}".format(len(payloads), failed),
+              file=sys.stderr)
+        if failed:
+            sys.exit(1)
+    exit()
+# End of script
@@ -0,0 +1,52 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Test setup.  The tools import each other as top-level modules, so their
+directory is put on the module search path.  Sample apps used by the
+tests build objects of the stub model in stub_models.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+SAMPLE = '''
+import stub_models as model
+
+
+{functions}
+
+if __name__ == "__main__":
+    top = model.Top()  # create object
+{main}
+'''
+
+
+@pytest.fixture
+def sample_app(tmpdir):
+    """Return function writing a sample app for stub_models.Top."""
+    def write(name, functions="", main="    pass"):
+        path = tmpdir.join(name)
+        path.write(SAMPLE.format(functions=functions, main=main))
+        return str(path)
+    return write
@@ -0,0 +1,146 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Small YDK-Py 0.5 style model with meta information for the tests.
+
+module stub-model {
+  container top {
+    leaf name { type string; }
+    leaf counter { type int64; }
+    leaf ratio { type decimal64 { fraction-digits 2; } }
+    leaf flags { type bits { bit first; bit second; bit third; } }
+    leaf enabled { type empty; }
+    leaf proto { type identityref { base proto; } }
+    leaf-list tag { type string; }
+    container settings { leaf mtu { type uint32; } }
+    list item { key id; leaf id { type uint32; } leaf value { ... } }
+  }
+}
+"""
+
+from ydk.types import FixedBitsDict
+
+from streaming_decode import (REFERENCE_BITS, REFERENCE_CLASS,
+                              REFERENCE_IDENTITY_CLASS, REFERENCE_LEAFLIST,
+                              REFERENCE_LIST)
+
+MODULE = "stub-model"
+ATTRIBUTE = "ATTRIBUTE"
+
+
+class Member(object):
+    """Meta member as generated in the _meta modules."""
+
+    def __init__(self, name, mtype=ATTRIBUTE, ptype="str", clazz_name=None,
+                 is_key=False):
+        self.name = name
+        self.presentation_name = name.replace("-", "_")
+        self.mtype = mtype
+        self.ptype = ptype
+        self.pmodule_name = __name__
+        self.clazz_name = clazz_name or ptype
+        self.module_name = MODULE
+        self.is_key = is_key
+        self.prange = []
+
+
+class Meta(object):
+    """Meta information of a YDK class."""
+
+    def __init__(self, yang_name, members=()):
+        self.yang_name = yang_name
+        self.module_name = MODULE
+        self.meta_info_class_members = list(members)
+
+
+class ProtoIdentity(object):
+    """Base identity proto."""
+
+    @staticmethod
+    def _meta_info():
+        return Meta("proto")
+
+
+class StaticIdentity(ProtoIdentity):
+    """Identity static derived from proto."""
+
+    @staticmethod
+    def _meta_info():
+        return Meta("static")
+
+
+class Top(object):
+    """Container top."""
+
+    def __init__(self):
+        self.parent = None
+        self.name = None
+        self.counter = None
+        self.ratio = None
+        self.flags = Top.FlagsBits()
+        self.enabled = None
+        self.proto = None
+        self.tag = []
+        self.settings = Top.Settings()
+        self.settings.parent = self
+        self.item = []
+
+    class FlagsBits(FixedBitsDict):
+        """Bits of leaf flags."""
+
+        def __init__(self):
+            # dictionary order differs from the schema order on purpose
+            dictionary = {"third": False, "second": False, "first": False}
+            pos_map = {"first": 0, "second": 1, "third": 2}
+            super(Top.FlagsBits, self).__init__(dictionary, pos_map)
+
+    class Settings(object):
+        """Container settings."""
+
+        def __init__(self):
+            self.parent = None
+            self.mtu = None
+
+        @staticmethod
+        def _meta_info():
+            return Meta("settings", [Member("mtu", ptype="int")])
+
+    class Item(object):
+        """List item, keyed by id."""
+
+        def __init__(self):
+            self.parent = None
+            self.id = None
+            self.value = None
+
+        @staticmethod
+        def _meta_info():
+            return Meta("item", [Member("id", ptype="int", is_key=True),
+                                 Member("value")])
+
+    @staticmethod
+    def _meta_info():
+        return Meta("top", [
+            Member("name"),
+            Member("counter", ptype="long"),
+            Member("ratio", ptype="Decimal64"),
+            Member("flags", REFERENCE_BITS, "FlagsBits", "Top.FlagsBits"),
+            Member("enabled", ptype="Empty"),
+            Member("proto", REFERENCE_IDENTITY_CLASS, "ProtoIdentity"),
+            Member("tag", REFERENCE_LEAFLIST),
+            Member("settings", REFERENCE_CLASS, "Settings", "Top.Settings"),
+            Member("item", REFERENCE_LIST, "Item", "Top.Item")])
@@ -0,0 +1,68 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of acl_generator."""
+
+import acl_generator
+from acl_generator import RuleTable, parse_prefix
+
+RULES = """sequence,grant,source,destination,dscp,log,counter,remark
+10,permit,10.1.1.0/24,any,,log-input,,web
+20,deny,10.1.2.7,172.16.0.0/16,af11,,acl-counter,
+"""
+
+
+def test_parse_prefix():
+    assert parse_prefix("10.1.1.5/24") == (0x0a010100, 24)
+    assert parse_prefix("10.1.1.5") == (0x0a010105, 32)
+    assert parse_prefix("any") == (0, -1)
+    assert parse_prefix(None) == (0, -1)
+
+
+def test_rules_round_trip(tmpdir):
+    path = tmpdir.join("rules.csv")
+    path.write(RULES)
+    table = acl_generator.read_rules(str(path))
+    assert len(table) == 2
+    assert table.rule(0) == dict(sequence=10, grant="permit",
+                                 source=("10.1.1.0", 24), dscp=None,
+                                 log="log-input", counter=None,
+                                 remark="web")
+    assert table.rule(1)["destination"] == ("172.16.0.0", 16)
+    assert table.rule(1)["counter"] == "acl-counter"
+
+
+def test_strings_are_stored_once():
+    table = acl_generator.generate_rules(1000)
+    assert len(table) == 1000
+    assert len(table._strings) == 4
+    assert table.rule(999)["sequence"] == 10000
+    assert table.nbytes() < 100 * len(table)
+
+
+def test_state_file(tmpdir):
+    path = str(tmpdir.join("rules.csv.acl1.state"))
+    assert acl_generator.load_state(path) == 0
+    acl_generator.save_state(path, 5000)
+    assert acl_generator.load_state(path) == 5000
+    assert acl_generator.state_path("rules.csv", "acl1") == \
+        "rules.csv.acl1.state"
+
+
+def test_empty_table():
+    assert len(RuleTable()) == 0
+    assert RuleTable().nbytes() == 0
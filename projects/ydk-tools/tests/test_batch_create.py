@@ -0,0 +1,36 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of batch_create."""
+
+import batch_create
+import stub_models
+
+CONFIG = '''def config_top(top):
+    """Add config data to top object."""
+    top.{} = {!r}
+'''
+
+
+def test_objects_of_one_class_are_merged(sample_app):
+    samples = [sample_app("nc-create-stub-model-10-ydk.py",
+                          CONFIG.format("name", "edge")),
+               sample_app("nc-create-stub-model-20-ydk.py",
+                          CONFIG.format("counter", 7))]
+    entity, = batch_create.build_entities(samples)
+    assert isinstance(entity, stub_models.Top)
+    assert (entity.name, entity.counter) == ("edge", 7)
@@ -0,0 +1,79 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of chunked_encode."""
+
+import io
+
+import stub_models
+from chunked_encode import ChunkedEncoder
+
+
+class XmlCodec(object):
+    """Codec service encoding stub_models.Top like YDK-Py."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def encode(self, provider, top):
+        self.sizes.append(len(top.item))
+        lines = ['<top xmlns="urn:stub-model">',
+                 "  <name>{}</name>".format(top.name)]
+        for item in top.item:
+            lines.extend(["  <item>", "    <id>{}</id>".format(item.id),
+                          "  </item>"])
+        lines.extend(["  <settings>", "    <mtu>1500</mtu>", "  </settings>",
+                      "</top>"])
+        return "\n".join(lines)
+
+
+def items(start, stop):
+    for index in range(start, stop):
+        item = stub_models.Top.Item()
+        item.id = index
+        yield item
+
+
+def top(count):
+    entity = stub_models.Top()
+    entity.name = "edge"
+    entity.item.extend(items(0, count))
+    return entity
+
+
+def test_chunks_join_to_full_payload():
+    codec = XmlCodec()
+    entity = top(2)
+    payload = "".join(ChunkedEncoder(codec, None, chunk_size=3).encode(
+        entity, "item", items(2, 10)))
+    assert payload == XmlCodec().encode(None, top(10))
+    # skeleton, first entry, then chunks of at most 3 entries
+    assert max(codec.sizes) == 3
+    assert [item.id for item in entity.item] == [0, 1]
+
+
+def test_write_returns_length():
+    stream = io.StringIO()
+    size = ChunkedEncoder(XmlCodec(), None).write(top(0), "item",
+                                                  items(0, 5), stream)
+    assert size == len(stream.getvalue())
+    assert stream.getvalue() == XmlCodec().encode(None, top(5))
+
+
+def test_empty_list():
+    assert "".join(ChunkedEncoder(XmlCodec(), None).encode(
+        top(0), "item", [])) == XmlCodec().encode(None, top(0))
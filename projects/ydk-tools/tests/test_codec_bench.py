@@ -0,0 +1,50 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of codec_bench."""
+
+import codec_bench
+from codec_bench import PHASES, Phases
+import stub_models
+
+
+class Codec(object):
+
+    def encode(self, provider, entity):
+        return "<top><name>{}</name></top>".format(entity.name)
+
+
+def config_top(top):
+    top.name = "edge"
+
+
+def test_time_phases():
+    validated = []
+    phases = Phases(stub_models.Top, config_top, Codec(), None,
+                    validated.append)
+    latencies, payload = codec_bench.time_phases(phases, 3)
+    assert sorted(latencies) == sorted(PHASES)
+    assert all(latency >= 0 for latency in latencies.values())
+    assert payload == "<top><name>edge</name></top>"
+    assert len(validated) == 3
+
+
+def test_trace_phases():
+    phases = Phases(stub_models.Top, config_top, Codec(), None, None)
+    allocations = codec_bench.trace_phases(phases)
+    assert sorted(allocations) == sorted(PHASES)
+    assert allocations["construct"]["blocks"] > 0
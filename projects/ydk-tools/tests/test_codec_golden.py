@@ -0,0 +1,41 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of codec_golden."""
+
+from codec_golden import canonicalize, golden_path
+
+
+def test_canonical_form_ignores_formatting():
+    assert canonicalize('<a xmlns="urn:a">\n  <b y="2" x="1"> v </b>\n'
+                        '</a>\n') == \
+        canonicalize('<ns:a xmlns:ns="urn:a"><ns:b x="1" y="2">v</ns:b>'
+                     '</ns:a>')
+
+
+def test_canonical_form_keeps_values_and_order():
+    assert canonicalize("<a><b>1</b><c/></a>") != \
+        canonicalize("<a><b>2</b><c/></a>")
+    assert canonicalize("<a><b/><c/></a>") != \
+        canonicalize("<a><c/><b/></a>")
+    assert canonicalize('<a xmlns="urn:a"/>') != \
+        canonicalize('<a xmlns="urn:b"/>')
+
+
+def test_golden_path():
+    assert golden_path("cd-encode-xr-ip-ntp-cfg-10-ydk.py") == \
+        "cd-encode-xr-ip-ntp-cfg-10-ydk.xml"
@@ -0,0 +1,90 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of config_diff."""
+
+import io
+
+import config_diff
+
+OLD = b"""<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <data>
+    <ntp xmlns="urn:ntp">
+      <peer><address>10.0.0.1</address><prefer/></peer>
+      <peer><address>10.0.0.2</address></peer>
+      <source>Loopback0</source>
+    </ntp>
+  </data>
+</rpc-reply>
+"""
+
+
+def parse(text):
+    root, _ = config_diff.parse(io.BytesIO(text))
+    return root
+
+
+def differences(old, new, subset=False):
+    return list(config_diff.TreeDiff(subset).diff(parse(old), parse(new)))
+
+
+def test_parse_drops_wrappers_and_counts_elements():
+    root, count = config_diff.parse(io.BytesIO(OLD))
+    assert [child.tag for child in root.children] == ["{urn:ntp}ntp"]
+    assert count == 7
+
+
+def test_order_and_formatting_are_ignored():
+    new = (b'<ntp xmlns="urn:ntp"><source>Loopback0</source>'
+           b'<peer><address>10.0.0.2</address></peer>'
+           b'<peer><address>10.0.0.1</address><prefer></prefer></peer>'
+           b'</ntp>')
+    tree_diff = config_diff.TreeDiff()
+    assert list(tree_diff.diff(parse(OLD), parse(new))) == []
+    assert tree_diff.skipped == 1
+
+
+def test_changed_leaf_and_list_entries():
+    new = (b'<ntp xmlns="urn:ntp"><source>Loopback1</source>'
+           b'<peer><address>10.0.0.1</address><prefer/></peer>'
+           b'<peer><address>10.0.0.3</address></peer></ntp>')
+    assert differences(OLD, new) == [
+        ("-", "/ntp/peer[address=10.0.0.2]", None, None),
+        ("+", "/ntp/peer[address=10.0.0.3]", None, None),
+        ("~", "/ntp/source", "Loopback0", "Loopback1")]
+
+
+def test_subset_ignores_added_elements():
+    new = (b'<ntp xmlns="urn:ntp"><source>Loopback0</source>'
+           b'<peer><address>10.0.0.1</address><prefer/></peer>'
+           b'<peer><address>10.0.0.2</address></peer>'
+           b'<peer><address>10.0.0.3</address></peer></ntp>')
+    assert differences(OLD, new, subset=True) == []
+    assert len(differences(OLD, new)) == 1
+
+
+def test_identity_values_compare_by_namespace():
+    old = b'<a xmlns="urn:a" xmlns:x="urn:x"><t>x:static</t></a>'
+    new = b'<a xmlns="urn:a" xmlns:y="urn:x"><t>y:static</t></a>'
+    assert differences(old, new) == []
+
+
+def test_write_canonical():
+    stream = io.StringIO()
+    config_diff.write_canonical(parse(OLD).children[0], stream)
+    assert stream.getvalue().splitlines()[0] == '<ntp xmlns="urn:ntp">'
+    assert "    <prefer/>" in stream.getvalue().splitlines()
@@ -0,0 +1,40 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of decode_benchmark."""
+
+import decode_benchmark
+import stub_models
+import streaming_decode
+
+MEMBERS = dict((member.name, member) for member in
+               stub_models.Top._meta_info().meta_info_class_members)
+
+
+def test_leaf_types_match_decimal64_and_bits():
+    matches = dict((leaf_type, [name for name, member in MEMBERS.items()
+                                if match(member)])
+                   for leaf_type, match in decode_benchmark.LEAF_TYPES)
+    assert matches == dict(Decimal64=["ratio"], Bits=["flags"])
+
+
+def test_leaf_samples_decode():
+    for name in ("ratio", "flags"):
+        text = decode_benchmark.leaf_sample(MEMBERS[name])
+        assert streaming_decode.leaf_value(MEMBERS[name], text) is not None
+    assert decode_benchmark.leaf_sample(MEMBERS["flags"]) == "first"
+    assert decode_benchmark.leaf_sample(MEMBERS["ratio"]) == "1.5"
@@ -0,0 +1,117 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of encode_cache."""
+
+import pytest
+from ydk.types import Decimal64, Empty
+
+import encode_cache
+import stub_models
+from encode_cache import EncodeCache, structural_hash
+
+
+class CountingCodec(object):
+    """Codec service recording the objects it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, provider, entity):
+        self.encoded.append(entity)
+        return "<top>{}</top>".format(len(self.encoded))
+
+
+def top(**leaves):
+    entity = stub_models.Top()
+    for name, value in leaves.items():
+        setattr(entity, name, value)
+    return entity
+
+
+def test_equal_objects_hash_equal():
+    assert structural_hash(top(name="a", counter=1)) == \
+        structural_hash(top(counter=1, name="a"))
+    assert structural_hash(top(name="a")) != structural_hash(top(name="b"))
+    assert structural_hash(top(counter=1)) != \
+        structural_hash(top(counter="1"))
+
+
+def test_empty_decimal64_and_bits_hash_by_value():
+    # regression: their default repr holds the object address
+    assert structural_hash(top(enabled=Empty())) == \
+        structural_hash(top(enabled=Empty()))
+    assert structural_hash(top(ratio=Decimal64("1.5"))) == \
+        structural_hash(top(ratio=Decimal64("1.5")))
+    assert structural_hash(top(ratio=Decimal64("1.5"))) != \
+        structural_hash(top(ratio=Decimal64("2.5")))
+    first, second = top(), top()
+    first.flags["first"] = True
+    second.flags["first"] = True
+    assert structural_hash(first) == structural_hash(second)
+    second.flags["second"] = True
+    assert structural_hash(first) != structural_hash(second)
+
+
+def test_identities_hash_by_class():
+    # regression: identity objects raised TypeError
+    assert structural_hash(top(proto=stub_models.StaticIdentity())) == \
+        structural_hash(top(proto=stub_models.StaticIdentity()))
+    assert structural_hash(top(proto=stub_models.StaticIdentity())) != \
+        structural_hash(top(proto=stub_models.ProtoIdentity()))
+
+
+def test_unknown_leaf_type_is_rejected():
+    with pytest.raises(TypeError):
+        structural_hash(top(name=object()))
+
+
+def test_list_entries_are_hashed():
+    first, second = top(), top()
+    for entity, value in ((first, "x"), (second, "y")):
+        item = stub_models.Top.Item()
+        item.parent = entity
+        item.id = 1
+        item.value = value
+        entity.item.append(item)
+    assert structural_hash(first) != structural_hash(second)
+    assert encode_cache._token([], {}) is None
+
+
+def test_cache_encodes_equal_objects_once(tmpdir):
+    codec = CountingCodec()
+    cache = EncodeCache(codec, object(), directory=str(tmpdir))
+    first = cache.encode(top(name="a"))
+    assert cache.encode(top(name="a")) == first
+    assert len(codec.encoded) == 1
+    assert cache.hit_rate == 0.5
+
+    # disk tier
+    cache = EncodeCache(codec, object(), directory=str(tmpdir))
+    assert cache.encode(top(name="a")) == first
+    assert cache.counters["disk_hits"] == 1
+    assert len(codec.encoded) == 1
+
+
+def test_cache_evicts_least_recently_used():
+    codec = CountingCodec()
+    cache = EncodeCache(codec, object(), maxsize=1)
+    cache.encode(top(name="a"))
+    cache.encode(top(name="b"))
+    cache.encode(top(name="a"))
+    assert len(codec.encoded) == 3
+    assert cache.counters["evictions"] == 2
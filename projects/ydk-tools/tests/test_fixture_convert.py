@@ -0,0 +1,88 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of fixture_convert."""
+
+import fixture_convert
+import stub_models
+from fixture_convert import CliLines, check_entity
+
+CLI = """top edge
+ settings
+  mtu 9000
+ item 1
+  value v1
+ item 2
+  value v2
+!
+"""
+
+
+def top(first="v1", second="v2"):
+    entity = stub_models.Top()
+    entity.name = "edge"
+    entity.settings.mtu = 9000
+    for index, value in ((1, first), (2, second)):
+        item = stub_models.Top.Item()
+        item.parent = entity
+        item.id = index
+        item.value = value
+        entity.item.append(item)
+    return entity
+
+
+def missing(entity, text):
+    cli = CliLines(text)
+    values = []
+    check_entity(entity, cli, list(cli.all()), values)
+    return values
+
+
+def test_stanza_holds_indented_lines():
+    cli = CliLines(CLI)
+    assert list(cli.stanza(0)) == [0, 1, 2, 3, 4, 5, 6]
+    assert list(cli.stanza(3)) == [3, 4]
+    assert cli.find(["item", "2"], cli.all()) == [5]
+
+
+def test_find_matches_whole_words():
+    cli = CliLines("value v10\nvalue 10.1\nvalue 1")
+    assert cli.find(["1"], cli.all()) == [2]
+    assert cli.find(["v1"], cli.all()) == []
+
+
+def test_all_values_found():
+    assert missing(top(), CLI) == []
+
+
+def test_values_are_checked_in_the_stanza_of_their_entry():
+    # regression: values of one entry were found in other entries
+    assert missing(top("v2", "v1"), CLI) == ["v2", "v1"]
+
+
+def test_missing_leaf():
+    assert missing(top(), CLI.replace("mtu 9000", "mtu 1500")) == ["9000"]
+
+
+def test_cli_value():
+    assert fixture_convert.cli_value(9000) == "9000"
+    assert fixture_convert.cli_value(True) is None
+    assert fixture_convert.cli_value(None) is None
+
+
+def test_key_values_from_meta_information():
+    assert fixture_convert.key_values(top().item[1]) == ["2"]
@@ -0,0 +1,66 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of isis_report."""
+
+import io
+from types import SimpleNamespace as Node
+
+import isis_report
+
+
+def state(value):
+    return Node(value=value)
+
+
+def isis(neighbors):
+    instance = Node(
+        instance_name="default",
+        host_names=Node(host_name=[Node(system_id="0000.0000.0001",
+                                        host_name="edge1")]),
+        neighbors=Node(neighbor=[Node(
+            system_id="0000.0000.0001",
+            interface_name="GigabitEthernet0/0/0/0",
+            neighbor_snpa="0800.2700.0001", neighbor_state=state(0),
+            neighbor_holdtime=27, neighbor_circuit_type=state(2),
+            neighbor_ietf_nsf_capable_flag=1)
+            for _ in range(neighbors)]))
+    return Node(instances=Node(instance=[instance]))
+
+
+def test_abbreviate_interface():
+    assert isis_report.abbreviate_interface("GigabitEthernet0/0/0/0") == \
+        "Gi0/0/0/0"
+    assert isis_report.abbreviate_interface("Bundle-Ether10") == "Bu10"
+
+
+def test_neighbor_lines():
+    lines = list(isis_report.neighbor_lines(isis(2)))
+    assert lines[-1] == "Total neighbor count: 2"
+    assert lines[-3].split() == ["edge1", "Gi0/0/0/0", "0800.2700.0001",
+                                 "Up", "27", "L2", "Y"]
+
+
+def test_no_instances():
+    assert list(isis_report.neighbor_lines(
+        Node(instances=Node(instance=[])))) == [isis_report.NO_INSTANCES]
+
+
+def test_write_lines():
+    stream = io.StringIO()
+    assert isis_report.write_lines(iter(["a", "b"]), stream) == 2
+    assert stream.getvalue() == "a\nb\n"
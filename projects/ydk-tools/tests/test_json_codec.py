@@ -0,0 +1,110 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of json_codec."""
+
+import json
+
+import pytest
+from ydk.types import Decimal64, Empty
+
+import json_codec
+import stub_models
+
+
+def sample_top():
+    top = stub_models.Top()
+    top.name = "edge"
+    top.counter = 2 ** 40
+    top.ratio = Decimal64("1.50")
+    top.flags["third"] = True
+    top.flags["first"] = True
+    top.enabled = Empty()
+    top.proto = stub_models.StaticIdentity()
+    top.tag.extend(["b", "a"])
+    top.settings.mtu = 9000
+    for index in (1, 2):
+        item = stub_models.Top.Item()
+        item.parent = top
+        item.id = index
+        item.value = "v{}".format(index)
+        top.item.append(item)
+    return top
+
+
+def test_leaf_value_quotes_64_bit_integers():
+    assert json_codec.leaf_value(2 ** 40, "long") == str(2 ** 40)
+    assert json_codec.leaf_value(5, "int") == 5
+    assert json_codec.leaf_value(True, "long") is True
+
+
+def test_leaf_value_of_empty_and_decimal64():
+    assert json_codec.leaf_value(Empty()) == [None]
+    assert json_codec.leaf_value(Decimal64("1.50")) == "1.50"
+
+
+def test_leaf_value_lists_set_bits_in_schema_order():
+    flags = stub_models.Top.FlagsBits()
+    flags["third"] = True
+    flags["first"] = True
+    assert json_codec.leaf_value(flags) == "first third"
+    assert json_codec.leaf_value(stub_models.Top.FlagsBits()) == ""
+
+
+def test_leaf_value_of_identity():
+    assert json_codec.leaf_value(stub_models.StaticIdentity()) == \
+        "stub-model:static"
+
+
+def test_encode():
+    document = json.loads(json_codec.encode(sample_top()))
+    top = document["stub-model:top"]
+    assert top["counter"] == str(2 ** 40)
+    assert top["ratio"] == "1.50"
+    assert top["flags"] == "first third"
+    assert top["enabled"] == [None]
+    assert top["proto"] == "stub-model:static"
+    assert top["tag"] == ["b", "a"]
+    assert top["settings"] == {"mtu": 9000}
+    assert top["item"] == [{"id": 1, "value": "v1"},
+                           {"id": 2, "value": "v2"}]
+
+
+def test_decode_node_reads_encoded_leaves_back():
+    payload = json_codec.encode(sample_top())
+    node = json.loads(payload)["stub-model:top"]
+    top = stub_models.Top()
+    json_codec.decode_node(top, node)
+    assert top.name == "edge"
+    assert top.counter == 2 ** 40
+    assert isinstance(top.ratio, Decimal64) and top.ratio.s == "1.50"
+    assert isinstance(top.flags, stub_models.Top.FlagsBits)
+    assert [name for name in ("first", "second", "third")
+            if top.flags[name]] == ["first", "third"]
+    assert isinstance(top.enabled, Empty)
+    assert isinstance(top.proto, stub_models.StaticIdentity)
+    assert top.tag == ["b", "a"]
+    assert top.settings.mtu == 9000
+    assert [(item.id, item.value) for item in top.item] == \
+        [(1, "v1"), (2, "v2")]
+    assert all(item.parent is top for item in top.item)
+    assert json_codec.encode(top) == payload
+
+
+def test_decode_node_rejects_unknown_nodes():
+    with pytest.raises(ValueError):
+        json_codec.decode_node(stub_models.Top(), {"unknown": 1})
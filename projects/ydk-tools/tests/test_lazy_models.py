@@ -0,0 +1,47 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of lazy_models."""
+
+import sys
+
+import lazy_models
+
+
+def test_model_modules_execute_on_first_access(tmpdir, monkeypatch):
+    package = tmpdir.mkdir("lazy_stub_models")
+    package.join("__init__.py").write("")
+    package.join("ntp.py").write("EXECUTED = True\n\n\nclass Ntp(object):\n"
+                                 "    pass\n")
+    monkeypatch.syspath_prepend(str(tmpdir))
+    finder = lazy_models.install(("lazy_stub_models.",))
+    try:
+        from lazy_stub_models import ntp
+        assert finder.deferred == ["lazy_stub_models.ntp"]
+        assert finder.loaded() == []
+        assert ntp.Ntp.__name__ == "Ntp"
+        assert finder.loaded() == ["lazy_stub_models.ntp"]
+    finally:
+        lazy_models.uninstall()
+        for name in ("lazy_stub_models", "lazy_stub_models.ntp"):
+            sys.modules.pop(name, None)
+    assert finder not in sys.meta_path
+
+
+def test_other_modules_load_as_usual():
+    finder = lazy_models.LazyModelFinder(("lazy_stub_models.",))
+    assert finder.find_spec("json", None) is None
@@ -0,0 +1,131 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of minimal_update.Differ."""
+
+import xml.etree.ElementTree as ET
+
+from minimal_update import OPERATION, Differ, local_name, subtree_filter
+
+
+def xml(text):
+    return ET.fromstring(text)
+
+
+def deletes(edit):
+    """Return (tag, key texts) of delete operations in edit."""
+    return [(local_name(element),
+             [child.text for child in element] or element.text)
+            for element in edit.iter()
+            if element.get(OPERATION) == "delete"]
+
+
+PADDING = "<description>{}</description>".format("x" * 200)
+
+
+def test_unchanged_tree_gives_no_edit():
+    desired = xml("<a><b>1</b><c><d>2</d></c></a>")
+    assert Differ({}).diff(desired, xml("<a><c><d>2</d></c><b>1</b></a>")) \
+        is None
+
+
+def test_missing_tree_is_merged():
+    desired = xml("<a><b>1</b></a>")
+    edit = Differ({}).diff(desired, None)
+    assert ET.tostring(edit) == ET.tostring(desired)
+
+
+def test_changed_leaf_only():
+    differ = Differ({})
+    edit = differ.diff(xml("<a><b>2</b><c><d>2</d></c></a>"),
+                       xml("<a><b>1</b><c><d>2</d></c></a>"))
+    assert ET.tostring(edit) == b"<a><b>2</b></a>"
+    assert differ.counters["merge"] == 1
+
+
+def test_list_entries_keep_their_keys():
+    keys = {("a", "e"): ["k"]}
+    edit = Differ(keys).diff(
+        xml("<a><e><k>1</k><v>x</v></e><e><k>2</k><v>y</v></e></a>"),
+        xml("<a><e><k>1</k><v>x</v></e><e><k>2</k><v>z</v></e></a>"))
+    assert ET.tostring(edit) == b"<a><e><k>2</k><v>y</v></e></a>"
+
+
+def test_prune_deletes_list_entries_by_key():
+    keys = {("a", "e"): ["k"]}
+    edit = Differ(keys, prune=True).diff(
+        xml("<a><e><k>1</k></e>" + PADDING + "</a>"),
+        xml("<a><e><k>1</k></e><e><k>2</k><v>y</v></e>" + PADDING +
+            "</a>"))
+    assert deletes(edit) == [("e", ["2"])]
+
+
+def test_prune_deletes_absent_list_by_key():
+    keys = {("a", "e"): ["k"]}
+    edit = Differ(keys, prune=True).diff(
+        xml("<a>" + PADDING + "</a>"),
+        xml("<a><e><k>1</k><v>x</v></e><e><k>2</k><v>y</v></e>" + PADDING +
+            "</a>"))
+    assert deletes(edit) == [("e", ["1"]), ("e", ["2"])]
+
+
+def test_prune_deletes_keyless_entries_once():
+    # regression: entries without key leaves gave one empty delete each
+    edit = Differ({}, prune=True).diff(
+        xml("<a>" + PADDING + "</a>"),
+        xml("<a><e/><e/><e/>" + PADDING + "</a>"))
+    assert deletes(edit) == [("e", None)]
+
+
+def test_prune_deletes_leaf_list_values():
+    differ = Differ({}, prune=True, leaf_list_paths={("a", "t")})
+    edit = differ.diff(xml("<a><t>x</t>" + PADDING + "</a>"),
+                       xml("<a><t>x</t><t>y</t>" + PADDING + "</a>"))
+    assert deletes(edit) == [("t", "y")]
+
+
+def test_prune_leaf_list_pruned_to_one_value():
+    # regression: a single desired value was taken for a leaf
+    differ = Differ({}, prune=True, leaf_list_paths={("a", "t")})
+    edit = differ.diff(xml("<a><t>x</t>" + PADDING + "</a>"),
+                       xml("<a><t>y</t><t>z</t>" + PADDING + "</a>"))
+    assert [element.text for element in edit.iter()
+            if local_name(element) == "t" and
+            element.get(OPERATION) is None] == ["x"]
+    assert deletes(edit) == [("t", "y"), ("t", "z")]
+
+
+def test_prune_leaf_is_not_deleted_on_change():
+    differ = Differ({}, prune=True, leaf_list_paths=set())
+    edit = differ.diff(xml("<a><b>2</b>" + PADDING + "</a>"),
+                       xml("<a><b>1</b>" + PADDING + "</a>"))
+    assert ET.tostring(edit) == b"<a><b>2</b></a>"
+
+
+def test_prune_replaces_small_node():
+    differ = Differ({}, prune=True)
+    edit = differ.diff(xml("<a><b>1</b></a>"),
+                       xml("<a><b>1</b><c>2</c></a>"))
+    assert edit.get(OPERATION) == "replace"
+    assert differ.counters["replace"] == 1
+
+
+def test_subtree_filter_selects_entries_by_key():
+    keys = {("a", "e"): ["k"]}
+    selection = subtree_filter(
+        xml("<a><e><k>1</k><v>x</v></e></a>"), keys)
+    assert ET.tostring(selection) == b"<a><e><k>1</k><v /></e></a>"
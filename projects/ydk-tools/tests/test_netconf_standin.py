@@ -0,0 +1,134 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of netconf_standin."""
+
+import xml.etree.ElementTree as ET
+
+from netconf_standin import BASE_NS, ROLLBACK_NS, Datastore, Session
+
+SYSLOG_NS = "http://cisco.com/ns/yang/Cisco-IOS-XR-syslog-act"
+NTP_NS = "http://cisco.com/ns/yang/Cisco-IOS-XR-ip-ntp-cfg"
+
+RPC = '<rpc xmlns="{}" message-id="{{}}">{{}}</rpc>'.format(BASE_NS)
+
+NTP = ('<ntp xmlns="{}"><peer-vrfs><peer-vrf><vrf-name>default</vrf-name>'
+       '<peer-ipv4s><peer-ipv4><address-ipv4>{{}}</address-ipv4>'
+       '</peer-ipv4></peer-ipv4s></peer-vrf></peer-vrfs>'
+       '</ntp>').format(NTP_NS)
+
+
+def session(actions=(SYSLOG_NS,)):
+    return Session(1, None, Datastore(), [], actions=actions)
+
+
+def call(standin, body, message_id=101):
+    reply, _ = standin.handle(ET.fromstring(RPC.format(message_id, body)))
+    return ET.fromstring(reply)
+
+
+def error_tag(reply):
+    return reply.findtext("{{{0}}}rpc-error/{{{0}}}error-tag".format(
+        BASE_NS))
+
+
+def is_ok(reply):
+    return reply.find("{{{}}}ok".format(BASE_NS)) is not None
+
+
+def test_reply_keeps_message_id():
+    assert call(session(), "<validate/>", 7).get("message-id") == "7"
+
+
+def test_get_schema_is_not_supported():
+    # regression: unknown RPCs were answered with <ok/>
+    reply = call(session(), '<get-schema xmlns="urn:ietf:params:xml:ns:'
+                 'yang:ietf-netconf-monitoring"><identifier>a</identifier>'
+                 '</get-schema>')
+    assert error_tag(reply) == "operation-not-supported"
+
+
+def test_unknown_rpcs_are_not_supported():
+    assert error_tag(call(session(), '<reboot xmlns="urn:x"/>')) == \
+        "operation-not-supported"
+    assert error_tag(call(session(), "<kill-session/>")) == \
+        "operation-not-supported"
+
+
+def test_action_rpcs_are_ok():
+    body = '<logmsg xmlns="{}"><message>x</message></logmsg>'.format(
+        SYSLOG_NS)
+    assert is_ok(call(session(), body))
+    assert error_tag(call(session(actions=()), body)) == \
+        "operation-not-supported"
+
+
+def test_close_session():
+    reply, close = session().handle(ET.fromstring(RPC.format(
+        1, "<close-session/>")))
+    assert close and b"<ok/>" in reply
+
+
+def edit(standin, config, target="candidate"):
+    return call(standin, "<edit-config><target><{}/></target><config>{}"
+                "</config></edit-config>".format(target, config))
+
+
+def get_config(standin, source="running"):
+    reply = call(standin, "<get-config><source><{}/></source></get-config>"
+                 .format(source))
+    return [element.text for element in reply.iter(
+        "{{{}}}address-ipv4".format(NTP_NS))]
+
+
+def test_candidate_commit_and_rollback():
+    standin = session()
+    assert is_ok(edit(standin, NTP.format("10.0.0.1")))
+    assert get_config(standin) == []
+    assert get_config(standin, "candidate") == ["10.0.0.1"]
+    assert is_ok(call(standin, "<commit/>"))
+    assert get_config(standin) == ["10.0.0.1"]
+    assert is_ok(edit(standin, NTP.format("10.0.0.2")))
+    assert is_ok(call(standin, "<commit/>"))
+    assert get_config(standin) == ["10.0.0.1", "10.0.0.2"]
+    assert is_ok(call(standin, '<roll-back-configuration-last xmlns="{}">'
+                      '<count>1</count></roll-back-configuration-last>'
+                      .format(ROLLBACK_NS)))
+    assert get_config(standin) == ["10.0.0.1"]
+
+
+def test_lock_held_by_other_session():
+    datastore = Datastore()
+    first = Session(1, None, datastore, [])
+    second = Session(2, None, datastore, [])
+    assert is_ok(call(first, "<lock><target><candidate/></target></lock>"))
+    assert error_tag(edit(second, NTP.format("10.0.0.1"))) == "in-use"
+    datastore.close_session(1)
+    assert is_ok(edit(second, NTP.format("10.0.0.1")))
+
+
+def test_get_with_subtree_filter():
+    standin = session()
+    edit(standin, NTP.format("10.0.0.1") + NTP.format("10.0.0.2"),
+         "running")
+    reply = call(standin, '<get><filter type="subtree"><ntp xmlns="{}">'
+                 '<peer-vrfs><peer-vrf><vrf-name>default</vrf-name>'
+                 '<peer-ipv4s><peer-ipv4><address-ipv4>10.0.0.2'
+                 '</address-ipv4></peer-ipv4></peer-ipv4s></peer-vrf>'
+                 '</peer-vrfs></ntp></filter></get>'.format(NTP_NS))
+    assert [element.text for element in reply.iter(
+        "{{{}}}address-ipv4".format(NTP_NS))] == ["10.0.0.2"]
@@ -0,0 +1,65 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of stage_commit."""
+
+import pytest
+
+import stage_commit
+from samplelib import load_sample
+
+CONFIG = '''def config_top(top):
+    """Add config data to top object."""
+    top.name = "edge"
+'''
+
+
+def test_deletes_object(sample_app):
+    deleting = sample_app("nc-delete-stub-model-10-ydk.py",
+                          main="    crud.delete(provider, top)")
+    commented = sample_app("nc-delete-stub-model-20-ydk.py",
+                           main="    # crud.delete(provider, top)")
+    assert stage_commit.deletes_object(load_sample(deleting))
+    assert not stage_commit.deletes_object(load_sample(commented))
+
+
+def test_build_stages(sample_app):
+    create = sample_app("nc-create-stub-model-10-ydk.py", CONFIG)
+    delete = sample_app("nc-delete-stub-model-11-ydk.py",
+                        main="    crud.delete(provider, top)")
+    stages = stage_commit.build_stages(["create:" + create,
+                                        "delete:" + delete])
+    assert [stage.operation for stage in stages] == ["create", "delete"]
+    assert stages[0].entity.name == "edge"
+    assert stages[1].entity.name is None
+
+
+def test_build_stages_rejects_apps_deleting_nothing(sample_app):
+    # regression: apps whose crud.delete is commented out were staged
+    commented = sample_app("nc-delete-stub-model-21-ydk.py",
+                           main="    # crud.delete(provider, top)")
+    with pytest.raises(ValueError):
+        stage_commit.build_stages(["delete:" + commented])
+
+
+def test_build_stages_rejects_subtree_deletes(sample_app):
+    subtree = sample_app("nc-delete-stub-model-30-ydk.py", CONFIG,
+                         "    crud.delete(provider, top.name)")
+    with pytest.raises(ValueError):
+        stage_commit.build_stages(["delete:" + subtree])
+    with pytest.raises(ValueError):
+        stage_commit.build_stages(["merge:" + subtree])
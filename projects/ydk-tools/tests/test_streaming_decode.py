@@ -0,0 +1,77 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of streaming_decode."""
+
+import pytest
+from ydk.types import Decimal64, Empty
+
+import streaming_decode
+import stub_models
+
+MEMBERS = dict((member.name, member) for member in
+               stub_models.Top._meta_info().meta_info_class_members)
+
+
+def test_leaf_value_of_numbers_and_strings():
+    assert streaming_decode.leaf_value(MEMBERS["counter"], " 42 ") == 42
+    assert streaming_decode.leaf_value(MEMBERS["name"], "edge") == "edge"
+
+
+def test_leaf_value_of_empty():
+    assert isinstance(streaming_decode.leaf_value(MEMBERS["enabled"], ""),
+                      Empty)
+    # leaf without meta information
+    assert isinstance(streaming_decode.leaf_value(None, ""), Empty)
+
+
+def test_leaf_value_of_decimal64():
+    ratio = streaming_decode.leaf_value(MEMBERS["ratio"], "1.50")
+    assert isinstance(ratio, Decimal64)
+    assert ratio.s == "1.50"
+
+
+def test_leaf_value_of_bits():
+    flags = streaming_decode.leaf_value(MEMBERS["flags"], "third first")
+    assert isinstance(flags, stub_models.Top.FlagsBits)
+    assert flags["first"] and flags["third"] and not flags["second"]
+
+
+def test_leaf_value_rejects_unknown_bit():
+    with pytest.raises(KeyError):
+        streaming_decode.leaf_value(MEMBERS["flags"], "fourth")
+
+
+def test_leaf_value_of_identity():
+    value = streaming_decode.leaf_value(MEMBERS["proto"], "sm:static",
+                                        {"sm": "urn:stub-model"})
+    assert isinstance(value, stub_models.StaticIdentity)
+    with pytest.raises(ValueError):
+        streaming_decode.leaf_value(MEMBERS["proto"], "sm:dynamic",
+                                    {"sm": "urn:stub-model"})
+
+
+def test_member_class_walks_nested_classes():
+    assert streaming_decode.member_class(MEMBERS["item"]) is \
+        stub_models.Top.Item
+
+
+def test_names():
+    assert streaming_decode.class_name("peer-vrf") == "PeerVrf"
+    assert streaming_decode.attribute_name("global") == "global_"
+    assert streaming_decode.identity_class_names("IPV4-UNICAST")[0] == \
+        "Ipv4UnicastIdentity"
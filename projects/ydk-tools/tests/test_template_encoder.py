@@ -0,0 +1,79 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of template_encoder."""
+
+import pytest
+
+from template_encoder import Template
+
+GOLDEN = """<ntp xmlns="http://cisco.com/ns/yang/Cisco-IOS-XR-ip-ntp-cfg">
+  <peer-vrfs>
+    <peer-vrf>
+      <vrf-name>default</vrf-name>
+      <peer-ipv4s>
+        <peer-ipv4>
+          <address-ipv4>10.0.0.1</address-ipv4>
+          <peer-type-ipv4>
+            <peer-type>peer</peer-type>
+            <prefer/>
+          </peer-type-ipv4>
+        </peer-ipv4>
+      </peer-ipv4s>
+    </peer-vrf>
+  </peer-vrfs>
+</ntp>
+"""
+
+
+@pytest.fixture
+def golden(tmpdir):
+    path = tmpdir.join("nc-create-xr-ip-ntp-cfg-99-ydk.xml")
+    path.write(GOLDEN)
+    return str(path)
+
+
+def test_fill_replaces_column_leaves(golden):
+    template = Template(golden, ["address-ipv4", "peer-type"])
+    payload = template.fill({"address-ipv4": "10.0.0.9",
+                             "peer-type": "server"})
+    assert payload == GOLDEN.strip().replace(
+        "10.0.0.1", "10.0.0.9").replace(">peer<", ">server<")
+    assert template.fill(["10.0.0.1", "peer"]) == GOLDEN.strip()
+
+
+def test_fill_escapes_values(golden):
+    template = Template(golden, ["vrf-name"])
+    assert "<vrf-name>a&lt;b&amp;c</vrf-name>" in template.fill(["a<b&c"])
+
+
+def test_fill_all_repeats_list_entry(golden):
+    template = Template(golden, ["address-ipv4"])
+    assert template.entry.name == "peer-ipv4"
+    payload = template.fill_all([["10.0.0.1"], ["10.0.0.2"],
+                                 ["10.0.0.3"]])
+    assert payload.count("<peer-ipv4>") == 3
+    assert payload.count("<peer-vrf>") == 1
+    assert "\n        <peer-ipv4>\n          <address-ipv4>10.0.0.2" in \
+        payload
+
+
+def test_columns_must_match_leaves(golden):
+    with pytest.raises(ValueError):
+        Template(golden, ["address-ipv6"])
+    template = Template(golden, ["peer-vrf/vrf-name"])
+    assert template.leaf_paths()[0] == "ntp/peer-vrfs/peer-vrf/vrf-name"
@@ -0,0 +1,82 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Tests of trap_storm."""
+
+import collections
+import time
+
+import pytest
+
+import trap_storm
+from trap_storm import Histogram, TokenBucket, TrapMix
+
+
+def test_token_bucket_stops_at_deadline_with_tokens_left():
+    # regression: workers kept firing past the end of the run
+    bucket = TokenBucket(1000, burst=10)
+    assert not bucket.take(time.monotonic() - 1)
+    assert bucket.take(time.monotonic() + 1)
+
+
+def test_token_bucket_does_not_wait_past_deadline():
+    bucket = TokenBucket(0.1, burst=1)
+    assert bucket.take()
+    start = time.monotonic()
+    assert not bucket.take(start + 0.05)
+    assert time.monotonic() - start < 1
+
+
+def test_token_bucket_paces_at_rate():
+    bucket = TokenBucket(200, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        assert bucket.take()
+    assert time.monotonic() - start >= 0.045
+
+
+def test_parse_mix():
+    rpcs = collections.OrderedDict((("ColdStartRpc", []),
+                                    ("WarmStartRpc", [])))
+    assert trap_storm.parse_mix([], rpcs) == [("ColdStartRpc", 1.0),
+                                              ("WarmStartRpc", 1.0)]
+    assert trap_storm.parse_mix(["WarmStartRpc=3"], rpcs) == \
+        [("WarmStartRpc", 3.0)]
+    with pytest.raises(ValueError):
+        trap_storm.parse_mix(["LinkUpRpc"], rpcs)
+
+
+def test_trap_mix_chooses_rpc_objects_of_name():
+    rpcs = dict(ColdStartRpc=["cold"], WarmStartRpc=["warm1", "warm2"])
+    trap_mix = TrapMix([("ColdStartRpc", 1), ("WarmStartRpc", 3)], rpcs,
+                       seed=1)
+    chosen = collections.Counter()
+    for _ in range(4000):
+        name, rpc = trap_mix.choose()
+        assert rpc in rpcs[name]
+        chosen[name] += 1
+    assert 2.5 < chosen["WarmStartRpc"] / float(chosen["ColdStartRpc"]) < 3.5
+
+
+def test_histogram():
+    histogram = Histogram()
+    for value in (0.0005, 0.0015, 0.0015, 10.0):
+        histogram.add(value)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[1] == 2
+    assert histogram.counts[-1] == 1
+    assert len(histogram.format()) == 3